@@ -1,7 +1,19 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import mysql.connector
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 from datetime import datetime, date
+from bookingEngine import BookingEngine
+from connectionPool import ConnectionPool
+from dbErrors import error_message
+from eventMetrics import EventMetrics, FUNCTION_METRICS, MONEY_METRICS
+from reportCache import ReportCache
+from reportSnapshots import ReportSnapshots, ReportSnapshotter, SNAPSHOT_REPORTS
+from reportStream import ReportStream, chunked, write_report
+from pagedTree import PagedTree
+from repository import Repository
+from taskRunner import TaskRunner
+
+# Rows of a report shown in the window; the rest are counted, and saved with "Save to File"
+REPORT_DISPLAY_ROWS = 5000
 
 class EventManagementAdminGUI:
     def __init__(self, root):
@@ -22,15 +34,26 @@ class EventManagementAdminGUI:
         
         self.root.configure(bg=self.bg_color)
         
-        # Database connection
-        self.conn = None
-        self.cursor = None
+        # Database connections, checked out per operation
+        self.pool = None
+        self.repo = None
+        self.booking_engine = None
+        self.event_metrics = None
+        self.report_cache = None
+        self.report_snapshots = None
+        self.report_snapshotter = None
+        self.current_report = None
+        self.report_stream = None
         
         # Configure styles
         self.setup_styles()
         
         # Setup UI
         self.setup_connection_frame()
+        self.setup_busy_bar()
+        
+        # Database calls run on worker threads so the window never freezes
+        self.tasks = TaskRunner(self.root, on_busy=self.show_busy)
         self.setup_main_interface()
         
     def setup_styles(self):
@@ -112,6 +135,25 @@ class EventManagementAdminGUI:
                                       font=("Arial", 10, "bold"))
         self.status_label.grid(row=0, column=9, padx=5)
         
+    def setup_busy_bar(self):
+        """Progress bar and Cancel button, shown while a database call is slow"""
+        self.busy_frame = ttk.Frame(self.root)
+        self.busy_bar = ttk.Progressbar(self.busy_frame, mode="indeterminate", length=200)
+        self.busy_bar.pack(side="left", padx=5)
+        self.busy_label = ttk.Label(self.busy_frame, text="")
+        self.busy_label.pack(side="left", padx=5)
+        ttk.Button(self.busy_frame, text="Cancel", command=lambda: self.tasks.cancel()).pack(side="left", padx=5)
+    
+    def show_busy(self, labels):
+        if labels:
+            self.busy_label.config(text="⏳ " + ", ".join(labels) + "...")
+            if not self.busy_frame.winfo_ismapped():
+                self.busy_frame.pack(side="bottom", fill="x", padx=10, pady=5)
+                self.busy_bar.start(15)
+        else:
+            self.busy_bar.stop()
+            self.busy_frame.pack_forget()
+    
     def setup_main_interface(self):
         """Main tabbed interface"""
         self.notebook = ttk.Notebook(self.root)
@@ -130,20 +172,39 @@ class EventManagementAdminGUI:
         
     def connect_db(self):
         """Connect to MySQL database"""
-        try:
-            self.conn = mysql.connector.connect(
-                host=self.host_entry.get(),
-                user=self.user_entry.get(),
-                password=self.pass_entry.get(),
-                database=self.db_entry.get()
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
+        connect_args = {
+            "host": self.host_entry.get(),
+            "user": self.user_entry.get(),
+            "password": self.pass_entry.get(),
+            "database": self.db_entry.get()
+        }
+        
+        def open_pool():
+            pool = ConnectionPool(connect_args)
+            with pool.connection():
+                # Open the first connection now so bad credentials fail here
+                pass
+            return pool
+        
+        def connected(pool):
+            if self.pool:
+                self.pool.close()
+            self.pool = pool
+            self.repo = Repository(self.pool)
+            self.booking_engine = BookingEngine(self.pool)
+            self.event_metrics = EventMetrics(self.pool)
+            self.report_cache = ReportCache(self.pool)
+            self.report_snapshots = ReportSnapshots(self.pool)
+            self.start_report_snapshotter()
             self.status_label.config(text="✓ Connected", foreground=self.secondary_color)
             messagebox.showinfo("Success", "Connected to database successfully!")
             self.load_dashboard_data()
-        except Exception as e:
-            messagebox.showerror("Connection Error", str(e))
+        
+        def failed(e):
             self.status_label.config(text="❌ Connection Failed", foreground=self.accent_color)
+        
+        self.status_label.config(text="Connecting...", foreground=self.dark_color)
+        self.tasks.submit("connect", open_pool, connected, "Connection failed", "Connecting", failed)
     
     def create_dashboard_tab(self):
         """Dashboard overview tab"""
@@ -199,43 +260,17 @@ class EventManagementAdminGUI:
     
     def load_dashboard_data(self):
         """Load dashboard statistics"""
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            # Count events
-            self.cursor.execute("SELECT COUNT(*) as count FROM Events")
-            self.dashboard_labels["events"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Count active events
-            self.cursor.execute("SELECT COUNT(*) as count FROM Events WHERE status='Planned'")
-            self.dashboard_labels["active_events"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Count venues
-            self.cursor.execute("SELECT COUNT(*) as count FROM Venue")
-            self.dashboard_labels["venues"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Count artists
-            self.cursor.execute("SELECT COUNT(*) as count FROM Artist")
-            self.dashboard_labels["artists"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Count sponsors
-            self.cursor.execute("SELECT COUNT(*) as count FROM Sponsor")
-            self.dashboard_labels["sponsors"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Count staff
-            self.cursor.execute("SELECT COUNT(*) as count FROM Staff")
-            self.dashboard_labels["staff"].config(text=str(self.cursor.fetchone()['count']))
-            
-            # Load upcoming events
-            self.cursor.execute("""
-                SELECT e.eventID, e.name, e.date, v.name as venue, e.status
-                FROM Events e
-                JOIN Venue v ON e.venueID = v.venueID
-                WHERE e.date >= CURDATE()
-                ORDER BY e.date
-                LIMIT 20
-            """)
-            events = self.cursor.fetchall()
+        
+        def fetch():
+            # Counts of events, active events, venues, artists, sponsors and staff, and the upcoming events
+            return self.repo.reports.dashboard_counts(), self.repo.events.upcoming(20)
+        
+        def show(data):
+            counts, events = data
+            for key, label in self.dashboard_labels.items():
+                label.config(text=str(counts[key]))
             
             self.dashboard_tree.delete(*self.dashboard_tree.get_children())
             for event in events:
@@ -243,8 +278,8 @@ class EventManagementAdminGUI:
                     event['eventID'], event['name'], event['date'],
                     event['venue'], event['status']
                 ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load dashboard: {str(e)}")
+        
+        self.tasks.submit("load_dashboard", fetch, show, "Failed to load dashboard", "Loading dashboard")
     
     def create_events_tab(self):
         """Events CRUD tab"""
@@ -270,7 +305,8 @@ class EventManagementAdminGUI:
             ("Start Time (HH:MM:SS): *", "start_time", "Format: 14:30:00"),
             ("End Time (HH:MM:SS): *", "end_time", "Format: 18:00:00"),
             ("Budget: *", "budget", "Must be > 0"),
-            ("Venue ID: *", "venue_id", "Select from Venues tab")
+            ("Venue ID: *", "venue_id", "Select from Venues tab"),
+            ("Inventory Mode:", "inventory_mode", "LAZY for very large venues")
         ]
         
         self.event_entries = {}
@@ -281,6 +317,10 @@ class EventManagementAdminGUI:
                 self.event_entries[key] = ttk.Combobox(form_frame, width=30, 
                                                        values=["Planned", "Completed", "Cancelled"])
                 self.event_entries[key].set("Planned")
+            elif key == "inventory_mode":
+                self.event_entries[key] = ttk.Combobox(form_frame, width=30, 
+                                                       values=["EAGER", "LAZY"])
+                self.event_entries[key].set("EAGER")
             else:
                 self.event_entries[key] = ttk.Entry(form_frame, width=32)
             self.event_entries[key].grid(row=i, column=1, pady=5, padx=5)
@@ -318,7 +358,17 @@ class EventManagementAdminGUI:
             self.events_tree.column(col, width=100)
         
         scrollbar = ttk.Scrollbar(tree_scroll, orient="vertical", command=self.events_tree.yview)
-        self.events_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows come a page at a time, sorted by the server, as the list is scrolled
+        def row_event(event):
+            return (
+                event['eventID'], event['name'], event['date'],
+                event['status'], event['time'], f"₹{event['budget']}", event['venue']
+            )
+        
+        sorts = {"ID": "eventID", "Name": "name", "Date": "date",
+                 "Status": "status", "Budget": "budget", "Venue": "venue"}
+        self.events_pager = PagedTree(self.events_tree, scrollbar, self.tasks, "events",
+                                      self.repo_page("events"), row_event, sorts, "date", descending=True)
         
         self.events_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -390,7 +440,17 @@ class EventManagementAdminGUI:
             self.venues_tree.column(col, width=120)
         
         scrollbar = ttk.Scrollbar(tree_scroll, orient="vertical", command=self.venues_tree.yview)
-        self.venues_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows come a page at a time, sorted by the server, as the list is scrolled
+        def row_venue(venue):
+            return (
+                venue['venueID'], venue['name'], venue['type'],
+                venue['capacity'], f"₹{venue['cost']}", venue['address']
+            )
+        
+        sorts = {"ID": "venueID", "Name": "name", "Type": "type",
+                 "Capacity": "capacity", "Cost": "cost", "Address": "address"}
+        self.venues_pager = PagedTree(self.venues_tree, scrollbar, self.tasks, "venues",
+                                      self.repo_page("venues"), row_venue, sorts, "name")
         
         self.venues_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -457,7 +517,17 @@ class EventManagementAdminGUI:
             self.artists_tree.column(col, width=120)
         
         scrollbar = ttk.Scrollbar(tree_scroll, orient="vertical", command=self.artists_tree.yview)
-        self.artists_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows come a page at a time, sorted by the server, as the list is scrolled
+        def row_artist(artist):
+            return (
+                artist['artistID'], artist['name'], artist['genre'],
+                artist['country'], artist['phone_no'], f"₹{artist['fee']}"
+            )
+        
+        sorts = {"ID": "artistID", "Name": "name", "Genre": "genre",
+                 "Country": "country", "Phone": "phone_no", "Fee": "fee"}
+        self.artists_pager = PagedTree(self.artists_tree, scrollbar, self.tasks, "artists",
+                                       self.repo_page("artists"), row_artist, sorts, "name")
         
         self.artists_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -521,7 +591,16 @@ class EventManagementAdminGUI:
             self.sponsors_tree.column(col, width=120)
         
         scrollbar = ttk.Scrollbar(tree_scroll, orient="vertical", command=self.sponsors_tree.yview)
-        self.sponsors_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows come a page at a time, sorted by the server, as the list is scrolled
+        def row_sponsor(sponsor):
+            return (
+                sponsor['sponsorID'], sponsor['name'], sponsor['industry'] or '',
+                sponsor['contact_person'] or '', sponsor['phone_no'] or '', sponsor['email'] or ''
+            )
+        
+        sorts = {"ID": "sponsorID", "Name": "name"}
+        self.sponsors_pager = PagedTree(self.sponsors_tree, scrollbar, self.tasks, "sponsors",
+                                        self.repo_page("sponsors"), row_sponsor, sorts, "name")
         
         self.sponsors_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -589,7 +668,17 @@ class EventManagementAdminGUI:
             self.staff_tree.column(col, width=120)
         
         scrollbar = ttk.Scrollbar(tree_scroll, orient="vertical", command=self.staff_tree.yview)
-        self.staff_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows come a page at a time, sorted by the server, as the list is scrolled
+        def row_staff(s):
+            return (
+                s['staffID'], s['name'], s['role'],
+                s['phone_no'] or '', s['email'] or '',
+                f"₹{s['salary']}" if s['salary'] else ''
+            )
+        
+        sorts = {"ID": "staffID", "Name": "name", "Role": "role"}
+        self.staff_pager = PagedTree(self.staff_tree, scrollbar, self.tasks, "staff",
+                                     self.repo_page("staff"), row_staff, sorts, "role")
         
         self.staff_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -725,6 +814,23 @@ class EventManagementAdminGUI:
                       width=30)
             btn.grid(row=i//3, column=i%3, padx=5, pady=5, sticky="ew")
         
+        # Heavy reports are precomputed in the background; these control how often
+        snapshot_frame = ttk.Frame(controls_frame)
+        snapshot_frame.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
+        ttk.Label(snapshot_frame, text="Precompute every (minutes):").pack(side="left", padx=5)
+        self.snapshot_interval = ttk.Entry(snapshot_frame, width=6)
+        self.snapshot_interval.insert(0, "5")
+        self.snapshot_interval.pack(side="left", padx=5)
+        ttk.Button(snapshot_frame, text="Apply", command=self.start_report_snapshotter).pack(side="left", padx=5)
+        tk.Button(snapshot_frame, text="🔄 Recompute Now",
+                  command=self.recompute_report,
+                  bg=self.accent_color, fg=self.light_color,
+                  font=("Arial", 9, "bold"), relief="flat", cursor="hand2").pack(side="left", padx=5)
+        tk.Button(snapshot_frame, text="💾 Save to File",
+                  command=self.save_report,
+                  bg=self.dark_color, fg=self.light_color,
+                  font=("Arial", 9, "bold"), relief="flat", cursor="hand2").pack(side="left", padx=5)
+        
         result_frame = ttk.LabelFrame(tab, text="📄 Report Results", padding=10)
         result_frame.pack(side="bottom", fill="both", expand=True, padx=5, pady=5)
         
@@ -742,7 +848,7 @@ class EventManagementAdminGUI:
         event_frame = ttk.LabelFrame(tab, text="🎯 Event Analytics", padding=10)
         event_frame.pack(fill="x", padx=10, pady=10)
         
-        ttk.Label(event_frame, text="Event ID:").grid(row=0, column=0, padx=5, pady=5)
+        ttk.Label(event_frame, text="Event ID(s):").grid(row=0, column=0, padx=5, pady=5)
         self.analytics_event_id = ttk.Entry(event_frame, width=15)
         self.analytics_event_id.insert(0, "1")
         self.analytics_event_id.grid(row=0, column=1, padx=5, pady=5)
@@ -760,6 +866,25 @@ class EventManagementAdminGUI:
                       font=("Arial", 9, "bold"), relief="flat", cursor="hand2")
             btn.grid(row=0, column=i+2, padx=5, pady=5)
         
+        tk.Button(event_frame, text="📈 All Metrics",
+                  command=self.run_event_metrics,
+                  bg=self.purple_color, fg=self.light_color,
+                  font=("Arial", 9, "bold"), relief="flat", cursor="hand2").grid(row=0, column=5, padx=5, pady=5)
+        
+        # Season metrics: every event between two dates
+        ttk.Label(event_frame, text="From:").grid(row=1, column=0, padx=5, pady=5)
+        self.analytics_from_date = ttk.Entry(event_frame, width=15)
+        self.analytics_from_date.insert(0, date.today().replace(month=1, day=1).isoformat())
+        self.analytics_from_date.grid(row=1, column=1, padx=5, pady=5)
+        ttk.Label(event_frame, text="To:").grid(row=1, column=2, padx=5, pady=5)
+        self.analytics_to_date = ttk.Entry(event_frame, width=15)
+        self.analytics_to_date.insert(0, date.today().replace(month=12, day=31).isoformat())
+        self.analytics_to_date.grid(row=1, column=3, padx=5, pady=5)
+        tk.Button(event_frame, text="📅 Season Metrics",
+                  command=self.run_season_metrics,
+                  bg=self.teal_color, fg=self.light_color,
+                  font=("Arial", 9, "bold"), relief="flat", cursor="hand2").grid(row=1, column=4, padx=5, pady=5)
+        
         # Functions section
         func_frame = ttk.LabelFrame(tab, text="⚡ Quick Functions", padding=10)
         func_frame.pack(fill="x", padx=10, pady=10)
@@ -797,12 +922,10 @@ class EventManagementAdminGUI:
     
     # Events CRUD
     def create_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID)
-                      VALUES (%s, %s, %s, %s, %s, %s, %s)"""
             values = (
                 self.event_entries['event_name'].get(),
                 self.event_entries['event_date'].get(),
@@ -810,23 +933,29 @@ class EventManagementAdminGUI:
                 self.event_entries['start_time'].get(),
                 self.event_entries['end_time'].get(),
                 float(self.event_entries['budget'].get()),
-                int(self.event_entries['venue_id'].get())
+                int(self.event_entries['venue_id'].get()),
+                self.event_entries['inventory_mode'].get() or 'EAGER'
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            messagebox.showinfo("Success", f"Event created successfully! ID: {self.cursor.lastrowid}")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Failed to create event:\n{str(e)}")
+            return
+        
+        def created(event_id):
+            messagebox.showinfo("Success", f"Event created successfully! ID: {event_id}")
             self.load_events()
             self.load_dashboard_data()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create event:\n{str(e)}")
+        
+        # Creating an event also generates its tickets, which can take a while for a large venue.
+        # Keyed by the values, so a double click does not create the event twice.
+        self.tasks.submit(("create_event", values), lambda: self.repo.events.create(values), created,
+                          "Failed to create event", "Creating event")
     
     def update_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """UPDATE Events SET name=%s, date=%s, status=%s, start_time=%s, 
-                      end_time=%s, budget=%s, venueID=%s WHERE eventID=%s"""
+            event_id = int(self.event_entries['event_id'].get())
             values = (
                 self.event_entries['event_name'].get(),
                 self.event_entries['event_date'].get(),
@@ -834,19 +963,34 @@ class EventManagementAdminGUI:
                 self.event_entries['start_time'].get(),
                 self.event_entries['end_time'].get(),
                 float(self.event_entries['budget'].get()),
-                int(self.event_entries['venue_id'].get()),
-                int(self.event_entries['event_id'].get())
+                int(self.event_entries['venue_id'].get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Failed to update event:\n{str(e)}")
+            return
+        
+        def update():
+            old_status = self.repo.events.status(event_id)
+            self.repo.events.update(event_id, values)
+            return old_status
+        
+        def updated(old_status):
             messagebox.showinfo("Success", "Event updated successfully!")
+            # Cancelling an event cancels all of its tickets in one transaction
+            if (old_status != 'Cancelled' and values[2] == 'Cancelled'
+                    and messagebox.askyesno("Cancel Tickets", 
+                                            "Event cancelled. Cancel all tickets sold for this event too?")):
+                self.tasks.submit(("cancel_event_tickets", event_id),
+                                  lambda: self.booking_engine.cancel_event_tickets(event_id),
+                                  lambda result: messagebox.showinfo("Tickets Cancelled", result.message),
+                                  "Failed to cancel tickets", "Cancelling tickets")
             self.load_events()
             self.load_dashboard_data()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update event:\n{str(e)}")
+        
+        self.tasks.submit(("update_event", event_id), update, updated, "Failed to update event", "Updating event")
     
     def delete_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
@@ -854,40 +998,29 @@ class EventManagementAdminGUI:
             if not event_id:
                 messagebox.showwarning("Warning", "Please enter Event ID to delete")
                 return
-            
-            if messagebox.askyesno("Confirm", "Are you sure you want to delete this event?\nThis will also delete all related tickets!"):
-                query = "DELETE FROM Events WHERE eventID = %s"
-                self.cursor.execute(query, (int(event_id),))
-                self.conn.commit()
-                messagebox.showinfo("Success", "Event deleted successfully!")
-                self.clear_entries(self.event_entries)
-                self.load_events()
-                self.load_dashboard_data()
-        except Exception as e:
+            event_id = int(event_id)
+        except ValueError as e:
             messagebox.showerror("Error", f"Failed to delete event:\n{str(e)}")
+            return
+        
+        def deleted(_):
+            messagebox.showinfo("Success", "Event deleted successfully!")
+            self.clear_entries(self.event_entries)
+            self.load_events()
+            self.load_dashboard_data()
+        
+        if messagebox.askyesno("Confirm", "Are you sure you want to delete this event?\nThis will also delete all related tickets!"):
+            self.tasks.submit(("delete_event", event_id), lambda: self.repo.events.delete(event_id), deleted,
+                              "Failed to delete event", "Deleting event")
+    
+    def repo_page(self, name):
+        """Page fetcher for a PagedTree; the repository only exists once connected"""
+        return lambda sort, descending, after: getattr(self.repo, name).page(sort, descending, after)
     
     def load_events(self):
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            self.cursor.execute("""
-                SELECT e.eventID, e.name, e.date, e.status, 
-                       CONCAT(e.start_time, '-', e.end_time) as time,
-                       e.budget, v.name as venue
-                FROM Events e
-                JOIN Venue v ON e.venueID = v.venueID
-                ORDER BY e.date DESC
-            """)
-            events = self.cursor.fetchall()
-            
-            self.events_tree.delete(*self.events_tree.get_children())
-            for event in events:
-                self.events_tree.insert("", "end", values=(
-                    event['eventID'], event['name'], event['date'],
-                    event['status'], event['time'], f"₹{event['budget']}", event['venue']
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load events:\n{str(e)}")
+        self.events_pager.reload()
     
     def on_event_select(self, event):
         selection = self.events_tree.selection()
@@ -895,10 +1028,7 @@ class EventManagementAdminGUI:
             item = self.events_tree.item(selection[0])
             values = item['values']
             
-            try:
-                self.cursor.execute("SELECT * FROM Events WHERE eventID = %s", (values[0],))
-                event_data = self.cursor.fetchone()
-                
+            def show(event_data):
                 self.event_entries['event_id'].delete(0, tk.END)
                 self.event_entries['event_id'].insert(0, event_data['eventID'])
                 self.event_entries['event_name'].delete(0, tk.END)
@@ -914,17 +1044,17 @@ class EventManagementAdminGUI:
                 self.event_entries['budget'].insert(0, event_data['budget'])
                 self.event_entries['venue_id'].delete(0, tk.END)
                 self.event_entries['venue_id'].insert(0, event_data['venueID'])
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load event details:\n{str(e)}")
+                self.event_entries['inventory_mode'].set(event_data['inventory_mode'])
+            
+            self.tasks.submit(("event", values[0]), lambda: self.repo.events.get(values[0]), show,
+                              "Failed to load event details", "Loading event")
     
     # Venues CRUD
     def create_venue(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """INSERT INTO Venue (name, type, address, country, pincode, capacity, cost)
-                      VALUES (%s, %s, %s, %s, %s, %s, %s)"""
             values = (
                 self.venue_entries['venue_name'].get(),
                 self.venue_entries['venue_type'].get(),
@@ -934,21 +1064,18 @@ class EventManagementAdminGUI:
                 int(self.venue_entries['capacity'].get()),
                 float(self.venue_entries['cost'].get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            messagebox.showinfo("Success", f"Venue created successfully! ID: {self.cursor.lastrowid}")
+            row_id = self.repo.venues.create(values)
+            messagebox.showinfo("Success", f"Venue created successfully! ID: {row_id}")
             self.load_venues()
             self.load_dashboard_data()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create venue:\n{str(e)}")
     
     def update_venue(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """UPDATE Venue SET name=%s, type=%s, address=%s, country=%s, 
-                      pincode=%s, capacity=%s, cost=%s WHERE venueID=%s"""
             values = (
                 self.venue_entries['venue_name'].get(),
                 self.venue_entries['venue_type'].get(),
@@ -956,18 +1083,16 @@ class EventManagementAdminGUI:
                 self.venue_entries['country'].get(),
                 self.venue_entries['pincode'].get(),
                 int(self.venue_entries['capacity'].get()),
-                float(self.venue_entries['cost'].get()),
-                int(self.venue_entries['venue_id'].get())
+                float(self.venue_entries['cost'].get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.venues.update(int(self.venue_entries['venue_id'].get()), values)
             messagebox.showinfo("Success", "Venue updated successfully!")
             self.load_venues()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update venue:\n{str(e)}")
     
     def delete_venue(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
@@ -977,9 +1102,7 @@ class EventManagementAdminGUI:
                 return
             
             if messagebox.askyesno("Confirm", "Are you sure you want to delete this venue?"):
-                query = "DELETE FROM Venue WHERE venueID = %s"
-                self.cursor.execute(query, (int(venue_id),))
-                self.conn.commit()
+                self.repo.venues.delete(int(venue_id))
                 messagebox.showinfo("Success", "Venue deleted successfully!")
                 self.clear_entries(self.venue_entries)
                 self.load_venues()
@@ -988,20 +1111,9 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to delete venue:\n{str(e)}")
     
     def load_venues(self):
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            self.cursor.execute("SELECT * FROM Venue ORDER BY name")
-            venues = self.cursor.fetchall()
-            
-            self.venues_tree.delete(*self.venues_tree.get_children())
-            for venue in venues:
-                self.venues_tree.insert("", "end", values=(
-                    venue['venueID'], venue['name'], venue['type'],
-                    venue['capacity'], f"₹{venue['cost']}", venue['address']
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load venues:\n{str(e)}")
+        self.venues_pager.reload()
     
     def on_venue_select(self, event):
         selection = self.venues_tree.selection()
@@ -1010,8 +1122,7 @@ class EventManagementAdminGUI:
             values = item['values']
             
             try:
-                self.cursor.execute("SELECT * FROM Venue WHERE venueID = %s", (values[0],))
-                venue_data = self.cursor.fetchone()
+                venue_data = self.repo.venues.get(values[0])
                 
                 self.venue_entries['venue_id'].delete(0, tk.END)
                 self.venue_entries['venue_id'].insert(0, venue_data['venueID'])
@@ -1033,12 +1144,10 @@ class EventManagementAdminGUI:
     
     # Artists CRUD
     def create_artist(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """INSERT INTO Artist (name, genre, country, phone_no, email, fee)
-                      VALUES (%s, %s, %s, %s, %s, %s)"""
             values = (
                 self.artist_entries['artist_name'].get(),
                 self.artist_entries['genre'].get(),
@@ -1047,39 +1156,34 @@ class EventManagementAdminGUI:
                 self.artist_entries['email'].get(),
                 float(self.artist_entries['fee'].get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            messagebox.showinfo("Success", f"Artist created successfully! ID: {self.cursor.lastrowid}")
+            row_id = self.repo.artists.create(values)
+            messagebox.showinfo("Success", f"Artist created successfully! ID: {row_id}")
             self.load_artists()
             self.load_dashboard_data()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create artist:\n{str(e)}")
     
     def update_artist(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """UPDATE Artist SET name=%s, genre=%s, country=%s, phone_no=%s, 
-                      email=%s, fee=%s WHERE artistID=%s"""
             values = (
                 self.artist_entries['artist_name'].get(),
                 self.artist_entries['genre'].get(),
                 self.artist_entries['country'].get(),
                 self.artist_entries['phone'].get(),
                 self.artist_entries['email'].get(),
-                float(self.artist_entries['fee'].get()),
-                int(self.artist_entries['artist_id'].get())
+                float(self.artist_entries['fee'].get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.artists.update(int(self.artist_entries['artist_id'].get()), values)
             messagebox.showinfo("Success", "Artist updated successfully!")
             self.load_artists()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update artist:\n{str(e)}")
     
     def delete_artist(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
@@ -1089,9 +1193,7 @@ class EventManagementAdminGUI:
                 return
             
             if messagebox.askyesno("Confirm", "Are you sure you want to delete this artist?"):
-                query = "DELETE FROM Artist WHERE artistID = %s"
-                self.cursor.execute(query, (int(artist_id),))
-                self.conn.commit()
+                self.repo.artists.delete(int(artist_id))
                 messagebox.showinfo("Success", "Artist deleted successfully!")
                 self.clear_entries(self.artist_entries)
                 self.load_artists()
@@ -1100,20 +1202,9 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to delete artist:\n{str(e)}")
     
     def load_artists(self):
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            self.cursor.execute("SELECT * FROM Artist ORDER BY name")
-            artists = self.cursor.fetchall()
-            
-            self.artists_tree.delete(*self.artists_tree.get_children())
-            for artist in artists:
-                self.artists_tree.insert("", "end", values=(
-                    artist['artistID'], artist['name'], artist['genre'],
-                    artist['country'], artist['phone_no'], f"₹{artist['fee']}"
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load artists:\n{str(e)}")
+        self.artists_pager.reload()
     
     def on_artist_select(self, event):
         selection = self.artists_tree.selection()
@@ -1122,8 +1213,7 @@ class EventManagementAdminGUI:
             values = item['values']
             
             try:
-                self.cursor.execute("SELECT * FROM Artist WHERE artistID = %s", (values[0],))
-                artist_data = self.cursor.fetchone()
+                artist_data = self.repo.artists.get(values[0])
                 
                 self.artist_entries['artist_id'].delete(0, tk.END)
                 self.artist_entries['artist_id'].insert(0, artist_data['artistID'])
@@ -1144,12 +1234,10 @@ class EventManagementAdminGUI:
     
     # Sponsors CRUD
     def create_sponsor(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """INSERT INTO Sponsor (name, industry, contact_person, phone_no, email)
-                      VALUES (%s, %s, %s, %s, %s)"""
             values = (
                 self.sponsor_entries['sponsor_name'].get(),
                 self.sponsor_entries['industry'].get() or None,
@@ -1157,38 +1245,33 @@ class EventManagementAdminGUI:
                 self.sponsor_entries['phone'].get() or None,
                 self.sponsor_entries['email'].get() or None
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            messagebox.showinfo("Success", f"Sponsor created successfully! ID: {self.cursor.lastrowid}")
+            row_id = self.repo.sponsors.create(values)
+            messagebox.showinfo("Success", f"Sponsor created successfully! ID: {row_id}")
             self.load_sponsors()
             self.load_dashboard_data()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create sponsor:\n{str(e)}")
     
     def update_sponsor(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """UPDATE Sponsor SET name=%s, industry=%s, contact_person=%s, 
-                      phone_no=%s, email=%s WHERE sponsorID=%s"""
             values = (
                 self.sponsor_entries['sponsor_name'].get(),
                 self.sponsor_entries['industry'].get() or None,
                 self.sponsor_entries['contact_person'].get() or None,
                 self.sponsor_entries['phone'].get() or None,
-                self.sponsor_entries['email'].get() or None,
-                int(self.sponsor_entries['sponsor_id'].get())
+                self.sponsor_entries['email'].get() or None
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.sponsors.update(int(self.sponsor_entries['sponsor_id'].get()), values)
             messagebox.showinfo("Success", "Sponsor updated successfully!")
             self.load_sponsors()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update sponsor:\n{str(e)}")
     
     def delete_sponsor(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
@@ -1198,9 +1281,7 @@ class EventManagementAdminGUI:
                 return
             
             if messagebox.askyesno("Confirm", "Are you sure you want to delete this sponsor?"):
-                query = "DELETE FROM Sponsor WHERE sponsorID = %s"
-                self.cursor.execute(query, (int(sponsor_id),))
-                self.conn.commit()
+                self.repo.sponsors.delete(int(sponsor_id))
                 messagebox.showinfo("Success", "Sponsor deleted successfully!")
                 self.clear_entries(self.sponsor_entries)
                 self.load_sponsors()
@@ -1209,20 +1290,9 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to delete sponsor:\n{str(e)}")
     
     def load_sponsors(self):
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            self.cursor.execute("SELECT * FROM Sponsor ORDER BY name")
-            sponsors = self.cursor.fetchall()
-            
-            self.sponsors_tree.delete(*self.sponsors_tree.get_children())
-            for sponsor in sponsors:
-                self.sponsors_tree.insert("", "end", values=(
-                    sponsor['sponsorID'], sponsor['name'], sponsor['industry'] or '',
-                    sponsor['contact_person'] or '', sponsor['phone_no'] or '', sponsor['email'] or ''
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load sponsors:\n{str(e)}")
+        self.sponsors_pager.reload()
     
     def on_sponsor_select(self, event):
         selection = self.sponsors_tree.selection()
@@ -1231,8 +1301,7 @@ class EventManagementAdminGUI:
             values = item['values']
             
             try:
-                self.cursor.execute("SELECT * FROM Sponsor WHERE sponsorID = %s", (values[0],))
-                sponsor_data = self.cursor.fetchone()
+                sponsor_data = self.repo.sponsors.get(values[0])
                 
                 self.sponsor_entries['sponsor_id'].delete(0, tk.END)
                 self.sponsor_entries['sponsor_id'].insert(0, sponsor_data['sponsorID'])
@@ -1251,12 +1320,10 @@ class EventManagementAdminGUI:
     
     # Staff CRUD
     def create_staff(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """INSERT INTO Staff (name, role, phone_no, email, salary)
-                      VALUES (%s, %s, %s, %s, %s)"""
             values = (
                 self.staff_entries['staff_name'].get(),
                 self.staff_entries['role'].get(),
@@ -1264,37 +1331,33 @@ class EventManagementAdminGUI:
                 self.staff_entries['email'].get() or None,
                 float(self.staff_entries['salary'].get()) if self.staff_entries['salary'].get() else None
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            messagebox.showinfo("Success", f"Staff created successfully! ID: {self.cursor.lastrowid}")
+            row_id = self.repo.staff.create(values)
+            messagebox.showinfo("Success", f"Staff created successfully! ID: {row_id}")
             self.load_staff()
             self.load_dashboard_data()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create staff:\n{str(e)}")
     
     def update_staff(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = """UPDATE Staff SET name=%s, role=%s, phone_no=%s, email=%s, salary=%s WHERE staffID=%s"""
             values = (
                 self.staff_entries['staff_name'].get(),
                 self.staff_entries['role'].get(),
                 self.staff_entries['phone'].get() or None,
                 self.staff_entries['email'].get() or None,
-                float(self.staff_entries['salary'].get()) if self.staff_entries['salary'].get() else None,
-                int(self.staff_entries['staff_id'].get())
+                float(self.staff_entries['salary'].get()) if self.staff_entries['salary'].get() else None
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.staff.update(int(self.staff_entries['staff_id'].get()), values)
             messagebox.showinfo("Success", "Staff updated successfully!")
             self.load_staff()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update staff:\n{str(e)}")
     
     def delete_staff(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
@@ -1304,9 +1367,7 @@ class EventManagementAdminGUI:
                 return
             
             if messagebox.askyesno("Confirm", "Are you sure you want to delete this staff member?"):
-                query = "DELETE FROM Staff WHERE staffID = %s"
-                self.cursor.execute(query, (int(staff_id),))
-                self.conn.commit()
+                self.repo.staff.delete(int(staff_id))
                 messagebox.showinfo("Success", "Staff deleted successfully!")
                 self.clear_entries(self.staff_entries)
                 self.load_staff()
@@ -1315,21 +1376,9 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to delete staff:\n{str(e)}")
     
     def load_staff(self):
-        if not self.conn:
+        if not self.pool:
             return
-        try:
-            self.cursor.execute("SELECT * FROM Staff ORDER BY role, name")
-            staff = self.cursor.fetchall()
-            
-            self.staff_tree.delete(*self.staff_tree.get_children())
-            for s in staff:
-                self.staff_tree.insert("", "end", values=(
-                    s['staffID'], s['name'], s['role'],
-                    s['phone_no'] or '', s['email'] or '', 
-                    f"₹{s['salary']}" if s['salary'] else ''
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load staff:\n{str(e)}")
+        self.staff_pager.reload()
     
     def on_staff_select(self, event):
         selection = self.staff_tree.selection()
@@ -1338,8 +1387,7 @@ class EventManagementAdminGUI:
             values = item['values']
             
             try:
-                self.cursor.execute("SELECT * FROM Staff WHERE staffID = %s", (values[0],))
-                staff_data = self.cursor.fetchone()
+                staff_data = self.repo.staff.get(values[0])
                 
                 self.staff_entries['staff_id'].delete(0, tk.END)
                 self.staff_entries['staff_id'].insert(0, staff_data['staffID'])
@@ -1358,117 +1406,104 @@ class EventManagementAdminGUI:
     # ASSIGNMENT OPERATIONS
     
     def assign_artist_to_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "INSERT INTO performs (artistID, eventID, noOfSongs) VALUES (%s, %s, %s)"
             values = (
                 int(self.assign_artist_id.get()),
                 int(self.assign_event_artist.get()),
                 int(self.assign_songs.get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.add_artist(*values)
             messagebox.showinfo("Success", "Artist assigned to event successfully!")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to assign artist:\n{str(e)}")
+            messagebox.showerror("Error", f"Failed to assign artist:\n{error_message(e)}")
     
     def remove_artist_from_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "DELETE FROM performs WHERE artistID = %s AND eventID = %s"
             values = (
                 int(self.assign_artist_id.get()),
                 int(self.assign_event_artist.get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.remove_artist(*values)
             messagebox.showinfo("Success", "Artist removed from event successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to remove artist:\n{str(e)}")
     
     def assign_sponsor_to_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "INSERT INTO sponsors_event (sponsorID, eventID, amount) VALUES (%s, %s, %s)"
             values = (
                 int(self.assign_sponsor_id.get()),
                 int(self.assign_event_sponsor.get()),
                 float(self.assign_amount.get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.add_sponsor(*values)
             messagebox.showinfo("Success", "Sponsor assigned to event successfully!")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to assign sponsor:\n{str(e)}")
+            messagebox.showerror("Error", f"Failed to assign sponsor:\n{error_message(e)}")
     
     def remove_sponsor_from_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "DELETE FROM sponsors_event WHERE sponsorID = %s AND eventID = %s"
             values = (
                 int(self.assign_sponsor_id.get()),
                 int(self.assign_event_sponsor.get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.remove_sponsor(*values)
             messagebox.showinfo("Success", "Sponsor removed from event successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to remove sponsor:\n{str(e)}")
     
     def assign_staff_to_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "INSERT INTO works_at (staffID, eventID, shift) VALUES (%s, %s, %s)"
             values = (
                 int(self.assign_staff_id.get()),
                 int(self.assign_event_staff.get()),
                 self.assign_shift.get()
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.add_staff(*values)
             messagebox.showinfo("Success", "Staff assigned to event successfully!")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to assign staff:\n{str(e)}")
+            messagebox.showerror("Error", f"Failed to assign staff:\n{error_message(e)}")
     
     def remove_staff_from_event(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            query = "DELETE FROM works_at WHERE staffID = %s AND eventID = %s"
             values = (
                 int(self.assign_staff_id.get()),
                 int(self.assign_event_staff.get())
             )
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            self.repo.assignments.remove_staff(*values)
             messagebox.showinfo("Success", "Staff removed from event successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to remove staff:\n{str(e)}")
     
     def view_event_artists(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
             event_id = int(self.view_assign_event.get())
-            self.cursor.callproc("Get_Event_Artists", [event_id])
+            results = self.repo.reports.call("Get_Event_Artists", [event_id])
             
             self.assignments_text.delete(1.0, tk.END)
             self.assignments_text.insert(tk.END, f"=== Artists for Event {event_id} ===\n\n")
             
-            for result in self.cursor.stored_results():
-                rows = result.fetchall()
+            for _, rows in results:
                 if rows:
                     self.assignments_text.insert(tk.END, f"{'ID':<5} {'Name':<30} {'Genre':<20} {'Songs':<10} {'Fee':<15}\n")
                     self.assignments_text.insert(tk.END, "-" * 85 + "\n")
@@ -1484,19 +1519,18 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to view artists:\n{str(e)}")
     
     def view_event_sponsors(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
             event_id = int(self.view_assign_event.get())
-            self.cursor.callproc("Get_Event_Sponsors", [event_id])
+            results = self.repo.reports.call("Get_Event_Sponsors", [event_id])
             
             self.assignments_text.delete(1.0, tk.END)
             self.assignments_text.insert(tk.END, f"=== Sponsors for Event {event_id} ===\n\n")
             
             total_amount = 0
-            for result in self.cursor.stored_results():
-                rows = result.fetchall()
+            for _, rows in results:
                 if rows:
                     self.assignments_text.insert(tk.END, f"{'ID':<5} {'Name':<30} {'Industry':<20} {'Amount':<15}\n")
                     self.assignments_text.insert(tk.END, "-" * 75 + "\n")
@@ -1514,18 +1548,17 @@ class EventManagementAdminGUI:
             messagebox.showerror("Error", f"Failed to view sponsors:\n{str(e)}")
     
     def view_event_staff(self):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
             event_id = int(self.view_assign_event.get())
-            self.cursor.callproc("Get_Event_Staff", [event_id])
+            results = self.repo.reports.call("Get_Event_Staff", [event_id])
             
             self.assignments_text.delete(1.0, tk.END)
             self.assignments_text.insert(tk.END, f"=== Staff for Event {event_id} ===\n\n")
             
-            for result in self.cursor.stored_results():
-                rows = result.fetchall()
+            for _, rows in results:
                 if rows:
                     self.assignments_text.insert(tk.END, f"{'ID':<5} {'Name':<30} {'Role':<20} {'Shift':<15} {'Salary':<15}\n")
                     self.assignments_text.insert(tk.END, "-" * 90 + "\n")
@@ -1542,69 +1575,126 @@ class EventManagementAdminGUI:
     
     #  REPORTS & ANALYTICS 
     
-    def run_report(self, procedure_name):
-        if not self.conn:
+    def start_report_snapshotter(self):
+        """(Re)start the background worker that precomputes the heavy reports"""
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            self.cursor.callproc(procedure_name)
-            
-            self.report_text.delete(1.0, tk.END)
-            self.report_text.insert(tk.END, f"{'='*100}\n")
-            self.report_text.insert(tk.END, f"{procedure_name.replace('_', ' ').upper()}\n")
-            self.report_text.insert(tk.END, f"{'='*100}\n\n")
-            
-            for result in self.cursor.stored_results():
-                rows = result.fetchall()
-                if rows:
-                    # Get column names
-                    columns = result.column_names
-                    
-                    # Calculate column widths
-                    col_widths = {}
-                    for col in columns:
-                        col_widths[col] = max(len(str(col)), 15)
-                    
-                    # Header
-                    header = " | ".join(str(col).ljust(col_widths[col]) for col in columns)
-                    self.report_text.insert(tk.END, header + "\n")
-                    self.report_text.insert(tk.END, "-" * len(header) + "\n")
-                    
-                    # Data rows
-                    for row in rows:
-                        row_str = " | ".join(str(v if v is not None else '').ljust(col_widths[k]) 
-                                            for k, v in row.items())
-                        self.report_text.insert(tk.END, row_str + "\n")
-                    
-                    self.report_text.insert(tk.END, f"\n{len(rows)} rows returned.\n\n")
-                else:
-                    self.report_text.insert(tk.END, "No data found.\n\n")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to run report:\n{str(e)}")
-            self.report_text.insert(tk.END, f"Error: {str(e)}\n")
+            interval = float(self.snapshot_interval.get()) * 60
+        except ValueError:
+            messagebox.showerror("Error", "Precompute interval must be a number of minutes")
+            return
+        if self.report_snapshotter:
+            self.report_snapshotter.stop()
+        self.report_snapshotter = ReportSnapshotter(self.pool, interval=interval)
+        self.report_snapshotter.start()
+    
+    def recompute_report(self):
+        if not self.pool:
+            messagebox.showerror("Error", "Please connect to database first!")
+            return
+        if self.current_report not in SNAPSHOT_REPORTS:
+            messagebox.showinfo("Recompute", "Select one of the precomputed reports first")
+            return
+        report = self.current_report
+        self.tasks.submit(("recompute", report), lambda: self.report_snapshots.refresh(report),
+                          lambda _: self.run_report(report), "Failed to recompute report", "Recomputing report")
+    
+    def write_report(self, procedure_name, write, max_rows=None):
+        """Stream a report into write(text) on a worker thread; returns the number of rows"""
+        title = procedure_name.replace('_', ' ').upper()
+        if procedure_name in SNAPSHOT_REPORTS:
+            # Latest background snapshot, read a chunk at a time from the server
+            with self.report_snapshots.open(procedure_name) as (generated_at, duration_ms, columns, chunks):
+                source = f"Snapshot generated at {generated_at} (took {duration_ms} ms)"
+                return write_report(write, title, source, [(columns, chunks)], max_rows)
+        # Served from the cache until one of the tables the report reads changes.
+        # callproc buffers its result sets, so these small reports arrive whole.
+        results = self.report_cache.call(procedure_name)
+        source = f"{self.report_cache.stats()}; {self.pool.stats()}"
+        return write_report(write, title, source, [(columns, chunked(rows)) for columns, rows in results], max_rows)
+    
+    def run_report(self, procedure_name):
+        if not self.pool:
+            messagebox.showerror("Error", "Please connect to database first!")
+            return
+        self.current_report = procedure_name
+        
+        # Drop the report still streaming in, if any
+        self.tasks.cancel("report")
+        if self.report_stream:
+            self.report_stream.cancel()
+        stream = self.report_stream = ReportStream()
+        self.report_text.delete(1.0, tk.END)
+        
+        def show(_):
+            # The rest of the text written before the worker finished
+            if self.report_stream is stream:
+                self.report_text.insert(tk.END, stream.read())
+        
+        def failed(e):
+            if self.report_stream is stream:
+                self.report_text.insert(tk.END, f"Error: {str(e)}\n")
+        
+        task = self.tasks.submit("report", lambda: self.write_report(procedure_name, stream.write, REPORT_DISPLAY_ROWS),
+                                 show, "Failed to run report", f"Running {procedure_name.replace('_', ' ')}", failed)
+        self.drain_report(stream, task)
+    
+    def drain_report(self, stream, task):
+        """Show the text streamed in so far, one insert per poll, until the worker finishes"""
+        if task.cancelled or self.report_stream is not stream:
+            # Cancelled or replaced: let the worker stop instead of waiting for the window
+            stream.cancel()
+            return
+        if task.future.done():
+            # show() inserts the rest
+            return
+        text = stream.read()
+        if text:
+            self.report_text.insert(tk.END, text)
+        self.root.after(TaskRunner.POLL_MS, self.drain_report, stream, task)
+    
+    def save_report(self):
+        """Stream the whole selected report straight into a text file"""
+        if not self.pool:
+            messagebox.showerror("Error", "Please connect to database first!")
+            return
+        if not self.current_report:
+            messagebox.showinfo("Save Report", "Run a report first")
+            return
+        report = self.current_report
+        path = filedialog.asksaveasfilename(title="Save Report", defaultextension=".txt",
+                                            initialfile=f"{report}.txt",
+                                            filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        def save():
+            with open(path, "w", encoding="utf-8") as f:
+                return self.write_report(report, f.write)
+        
+        self.tasks.submit(("save report", report, path), save,
+                          lambda rows: messagebox.showinfo("Save Report", f"{rows} rows saved to {path}"),
+                          "Failed to save report", f"Saving {report.replace('_', ' ')}")
     
     def run_event_analytics(self, procedure_name):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            event_id = int(self.analytics_event_id.get())
-            # Close existing result sets to avoid "Unread result found" error
-            try:
-                self.cursor.fetchall()
-            except:
-                pass
-            # Create a new cursor for the procedure call
-            proc_cursor = self.conn.cursor(dictionary=True)
-            proc_cursor.callproc(procedure_name, [event_id])
-            
+            event_id = self.analytics_event_ids()[0]
+        except (ValueError, IndexError) as e:
+            messagebox.showerror("Error", f"Failed to run analytics:\n{str(e)}")
+            return
+        
+        def show(results):
             self.analytics_text.delete(1.0, tk.END)
             self.analytics_text.insert(tk.END, f"{'='*100}\n")
             self.analytics_text.insert(tk.END, f"{procedure_name.replace('_', ' ').upper()} - Event ID: {event_id}\n")
             self.analytics_text.insert(tk.END, f"{'='*100}\n\n")
             
-            for result in proc_cursor.stored_results():
-                rows = result.fetchall()
+            for _, rows in results:
                 if rows:
                     for row in rows:
                         for key, value in row.items():
@@ -1612,52 +1702,89 @@ class EventManagementAdminGUI:
                         self.analytics_text.insert(tk.END, "\n")
                 else:
                     self.analytics_text.insert(tk.END, "No data found.\n\n")
-            
-            proc_cursor.close()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to run analytics:\n{str(e)}")
-            self.analytics_text.insert(tk.END, f"Error: {str(e)}\n")
+        
+        self.tasks.submit(("analytics", procedure_name, event_id),
+                          lambda: self.repo.reports.call(procedure_name, [event_id]), show,
+                          "Failed to run analytics", "Running analytics", self.show_analytics_error)
+    
+    def show_analytics_error(self, error):
+        self.analytics_text.insert(tk.END, f"Error: {str(error)}\n")
+    
+    def analytics_event_ids(self):
+        """Event IDs typed in the Analytics tab, comma-separated"""
+        return [int(part) for part in self.analytics_event_id.get().split(",") if part.strip()]
+    
+    def format_metric(self, metric, value):
+        if value is None:
+            return ""
+        if metric in MONEY_METRICS:
+            return f"₹{value:,.2f}"
+        if metric == "occupancy":
+            return f"{value:.2f}%"
+        return str(value)
+    
+    def show_metrics(self, title, rows):
+        """Metric rows as a table in the analytics results, one line per event"""
+        self.analytics_text.delete(1.0, tk.END)
+        self.analytics_text.insert(tk.END, f"{'='*100}\n")
+        self.analytics_text.insert(tk.END, f"{title}\n")
+        self.analytics_text.insert(tk.END, f"{'='*100}\n\n")
+        if not rows:
+            self.analytics_text.insert(tk.END, "No data found.\n\n")
+            return
+        
+        columns = list(rows[0].keys())
+        cells = [[self.format_metric(col, row[col]) for col in columns] for row in rows]
+        col_widths = [max([len(col)] + [len(line[i]) for line in cells]) for i, col in enumerate(columns)]
+        
+        header = " | ".join(col.ljust(width) for col, width in zip(columns, col_widths))
+        self.analytics_text.insert(tk.END, header + "\n")
+        self.analytics_text.insert(tk.END, "-" * len(header) + "\n")
+        for line in cells:
+            self.analytics_text.insert(tk.END, " | ".join(cell.ljust(width) for cell, width in zip(line, col_widths)) + "\n")
+        self.analytics_text.insert(tk.END, f"\n{len(rows)} events.\n")
     
     def run_quick_function(self, function_name, display_name):
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         try:
-            event_id = int(self.analytics_event_id.get())
-            
-            # Create fresh cursor for function call
-            func_cursor = self.conn.cursor(dictionary=True)
-            query = f"SELECT {function_name}(%s) AS result"
-            func_cursor.execute(query, (event_id,))
-            result = func_cursor.fetchone()
-            
-            self.analytics_text.delete(1.0, tk.END)
-            self.analytics_text.insert(tk.END, f"{'='*60}\n")
-            self.analytics_text.insert(tk.END, f"{display_name} - Event ID: {event_id}\n")
-            self.analytics_text.insert(tk.END, f"{'='*60}\n\n")
-            
-            # Format result based on function type
-            result_value = result['result']
-            if function_name in ['Get_Event_Revenue', 'Get_Total_Sponsorship', 'Get_Total_Artist_Fees', 'Get_Event_Net_Profit']:
-                self.analytics_text.insert(tk.END, f"Result: ₹{result_value:,.2f}\n")
-            elif function_name == 'Get_Event_Occupancy_Percentage':
-                self.analytics_text.insert(tk.END, f"Result: {result_value:.2f}%\n")
-            else:
-                self.analytics_text.insert(tk.END, f"Result: {result_value}\n")
-            
-            # Show additional context
-            func_cursor.execute("SELECT name, date, status FROM Events WHERE eventID = %s", (event_id,))
-            event_info = func_cursor.fetchone()
-            if event_info:
-                self.analytics_text.insert(tk.END, f"\nEvent Details:\n")
-                self.analytics_text.insert(tk.END, f"  Name: {event_info['name']}\n")
-                self.analytics_text.insert(tk.END, f"  Date: {event_info['date']}\n")
-                self.analytics_text.insert(tk.END, f"  Status: {event_info['status']}\n")
-            
-            func_cursor.close()
-        except Exception as e:
+            event_ids = self.analytics_event_ids()
+        except ValueError as e:
             messagebox.showerror("Error", f"Failed to run function:\n{str(e)}")
-            self.analytics_text.insert(tk.END, f"Error: {str(e)}\n")
+            return
+        title = f"{display_name} - Event ID(s): {', '.join(map(str, event_ids))}"
+        # One query for all listed events instead of one function call per event
+        metrics = [FUNCTION_METRICS[function_name]]
+        self.tasks.submit(("metrics", tuple(event_ids), tuple(metrics)),
+                          lambda: self.event_metrics.for_events(event_ids, metrics),
+                          lambda rows: self.show_metrics(title, rows),
+                          "Failed to run function", "Computing metrics", self.show_analytics_error)
+    
+    def run_event_metrics(self):
+        if not self.pool:
+            messagebox.showerror("Error", "Please connect to database first!")
+            return
+        try:
+            event_ids = self.analytics_event_ids()
+        except ValueError as e:
+            messagebox.showerror("Error", f"Failed to load metrics:\n{str(e)}")
+            return
+        title = f"EVENT METRICS - Event ID(s): {', '.join(map(str, event_ids))}"
+        self.tasks.submit(("metrics", tuple(event_ids), None), lambda: self.event_metrics.for_events(event_ids),
+                          lambda rows: self.show_metrics(title, rows),
+                          "Failed to load metrics", "Computing metrics", self.show_analytics_error)
+    
+    def run_season_metrics(self):
+        if not self.pool:
+            messagebox.showerror("Error", "Please connect to database first!")
+            return
+        first_date = self.analytics_from_date.get()
+        last_date = self.analytics_to_date.get()
+        self.tasks.submit(("season_metrics", first_date, last_date),
+                          lambda: self.event_metrics.for_dates(first_date, last_date),
+                          lambda rows: self.show_metrics(f"SEASON METRICS - {first_date} to {last_date}", rows),
+                          "Failed to load metrics", "Computing season metrics", self.show_analytics_error)
     
     # UTILITY FUNCTIONS 
     
@@ -1669,9 +1796,14 @@ class EventManagementAdminGUI:
                 entry.set("")
     
     def __del__(self):
-        if self.conn:
-            self.cursor.close()
-            self.conn.close()
+        if self.report_stream:
+            self.report_stream.cancel()
+        self.tasks.close()
+        if self.report_snapshotter:
+            self.report_snapshotter.stop()
+        if self.pool:
+            self.repo.close()
+            self.pool.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+import os
+import re
+import sys
+import time
+import mysql.connector
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_FILE = os.path.join(REPO_DIR, "event_management_system.sql")
+
+# Let benchmarks import the portal-side modules (bookingEngine, ...)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def add_connection_args(parser):
+    """Same connection settings as the portals' connection frame"""
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--database", default="evm")
+
+
+def connect_args(args):
+    return {
+        "host": args.host,
+        "user": args.user,
+        "password": args.password,
+        "database": args.database
+    }
+
+
+def connect(args):
+    return mysql.connector.connect(**connect_args(args))
+
+
+def schema_objects(path=SCHEMA_FILE):
+    """Map trigger/function/procedure/view name -> its CREATE statement in the schema script"""
+    objects = {}
+    delimiter = ";"
+    buffer = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.upper().startswith("DELIMITER"):
+                delimiter = stripped.split()[1]
+                continue
+            buffer.append(line)
+            if stripped.endswith(delimiter):
+                statement = "".join(buffer).strip()
+                statement = statement[:len(statement) - len(delimiter)].strip()
+                buffer = []
+                match = re.search(r"CREATE\s+(TRIGGER|FUNCTION|PROCEDURE|VIEW)\s+(\w+)", statement, re.I)
+                if match:
+                    objects[match.group(2)] = statement[match.start():]
+    return objects
+
+
+def replace_schema_object(cursor, kind, name, ddl):
+    """Drop and recreate a trigger/function/procedure/view"""
+    cursor.execute(f"DROP {kind} IF EXISTS {name}")
+    if ddl:
+        cursor.execute(ddl)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Timer:
+    """with Timer() as t: ...; t.elapsed is in seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) if rows else len(str(h))
+              for i, h in enumerate(headers)]
+    print(" | ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for row in rows:
+        print(" | ".join(str(v).ljust(w) for v, w in zip(row, widths)))
@@ -0,0 +1,253 @@
+"""Hammer one hot event with concurrent simulated attendees, then check for oversells.
+
+    python benchmarks/bookingLoadTest.py --password secret --users 50 --capacity 2000
+    python benchmarks/bookingLoadTest.py --password secret --users 200 --seat-order lowest --seats-per-booking 4
+    python benchmarks/bookingLoadTest.py --password secret --users 200 --pool-size 20
+
+Each simulated attendee runs in its own thread with its own BookingEngine, and
+keeps booking seats it believes are free until the event sells out or
+--duration runs out. The threads share one ConnectionPool; by default it has a
+connection per attendee, a smaller --pool-size shows the checkout waits. --seat-order lowest makes every attendee go
+for the same front-row seats (worst-case contention); random spreads them out.
+
+Afterwards it reports throughput, booking latency percentiles and retry /
+deadlock counts, and verifies that no ticket was sold twice, that attends
+never exceeded the venue capacity and that the inventory counters match the
+Ticket rows. The venue, event and attendees are deleted again unless --keep.
+"""
+import argparse
+import random
+import threading
+import time
+import mysql.connector
+from mysql.connector import errorcode
+import benchUtils
+from benchUtils import Timer
+from bookingEngine import BookingEngine, placeholders
+from connectionPool import ConnectionPool
+
+
+class SimulatedAttendee(threading.Thread):
+    """Books seats for one attendee until it sees the event as sold out"""
+
+    def __init__(self, args, pool, attendee_id, event_id, seat_nos, deadline):
+        super().__init__(daemon=True)
+        self.args = args
+        self.pool = pool
+        self.attendee_id = attendee_id
+        self.event_id = event_id
+        self.free = list(seat_nos)
+        self.deadline = deadline
+        self.latencies = []
+        self.won = 0
+        self.lost = 0
+        self.seats_won = 0
+        self.retries = 0
+        self.deadlocks = 0
+        self.errors = 0
+
+    def run(self):
+        engine = BookingEngine(self.pool, max_retries=self.args.max_retries)
+        while self.free and time.perf_counter() < self.deadline:
+            seat_nos = self.free[:self.args.seats_per_booking]
+            del self.free[:len(seat_nos)]
+            try:
+                with Timer() as t:
+                    result = engine.book_seats(self.attendee_id, self.event_id, seat_nos)
+            except mysql.connector.Error as e:
+                # Retries exhausted: count it and try those seats again later
+                if e.errno in (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT):
+                    self.deadlocks += 1
+                    self.free.extend(seat_nos)
+                    continue
+                self.errors += 1
+                break
+            self.latencies.append(t.elapsed)
+            self.retries += result.retries
+            if result.won:
+                self.won += 1
+                self.seats_won += len(seat_nos)
+            else:
+                self.lost += 1
+                # Someone else got at least one of them; try again later with the rest
+                self.free.extend(still_available(self.pool, self.event_id, seat_nos))
+
+
+def still_available(pool, event_id, seat_nos):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                SELECT seatNo FROM Ticket
+                WHERE eventID = %s AND seatNo IN ({placeholders(seat_nos)}) AND status != 'AVAILABLE'
+            """, (event_id, *seat_nos))
+            taken = {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+    return [seat_no for seat_no in seat_nos if seat_no not in taken]
+
+
+def seed(conn, capacity, users, inventory_mode):
+    """Create a venue, one hot event and `users` attendees; returns (venue_id, event_id, attendee_ids, seat_nos)"""
+    tag = f"{int(time.time()) % 10 ** 8:08d}"
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""INSERT INTO Venue (cost, address, country, pincode, name, type, capacity)
+                          VALUES (0, 'Load Test', 'India', '000000', 'Load Test Venue', 'Stadium', %s)""",
+                       (capacity,))
+        venue_id = cursor.lastrowid
+        cursor.execute("""INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID, inventory_mode)
+                          VALUES ('Load Test Event', '2099-01-01', 'Planned', '10:00:00', '11:00:00', 1, %s, %s)""",
+                       (venue_id, inventory_mode))
+        event_id = cursor.lastrowid
+        cursor.executemany("""INSERT INTO Attendee (name, phone_no, email, gender, age)
+                              VALUES (%s, %s, %s, 'O', 30)""",
+                           [(f"Load Test {i}", f"LT{tag}{i:05d}", f"loadtest.{tag}.{i}@example.com")
+                            for i in range(users)])
+        cursor.execute("SELECT attendeeID FROM Attendee WHERE phone_no LIKE %s ORDER BY attendeeID",
+                       (f"LT{tag}%",))
+        attendee_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT CONCAT(sr.type, '-', seq.n)
+            FROM seat_range sr
+            JOIN seq_numbers seq ON seq.n BETWEEN sr.first_seat AND sr.last_seat
+            WHERE sr.eventID = %s
+            ORDER BY seq.n
+        """, (event_id,))
+        seat_nos = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+    finally:
+        cursor.close()
+    return venue_id, event_id, attendee_ids, seat_nos
+
+
+def cleanup(conn, venue_id, event_id, attendee_ids):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM Events WHERE eventID = %s", (event_id,))
+        cursor.execute("DELETE FROM Venue WHERE venueID = %s", (venue_id,))
+        cursor.execute(f"DELETE FROM Attendee WHERE attendeeID IN ({placeholders(attendee_ids)})",
+                       tuple(attendee_ids))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def check_invariants(conn, event_id, capacity, seats_won):
+    """List of (check, expected, actual, ok) rows"""
+    cursor = conn.cursor()
+    checks = []
+    try:
+        cursor.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT p.ticketID FROM purchases p
+                JOIN Ticket t ON t.ticketID = p.ticketID
+                WHERE t.eventID = %s
+                GROUP BY p.ticketID HAVING COUNT(*) > 1
+            ) dup
+        """, (event_id,))
+        duplicates = cursor.fetchone()[0]
+        checks.append(("tickets purchased twice", 0, duplicates, duplicates == 0))
+
+        cursor.execute("SELECT COUNT(*) FROM attends WHERE eventID = %s", (event_id,))
+        attending = cursor.fetchone()[0]
+        checks.append(("attends <= capacity", f"<= {capacity}", attending, attending <= capacity))
+
+        cursor.execute("SELECT attendee_count FROM Events WHERE eventID = %s", (event_id,))
+        counted = cursor.fetchone()[0]
+        checks.append(("Events.attendee_count", attending, counted, counted == attending))
+
+        cursor.execute("""SELECT COUNT(*) FROM purchases p JOIN Ticket t ON t.ticketID = p.ticketID
+                          WHERE t.eventID = %s""", (event_id,))
+        purchased = cursor.fetchone()[0]
+        checks.append(("purchases = seats won by clients", seats_won, purchased, purchased == seats_won))
+
+        cursor.execute("SELECT COUNT(*) FROM Ticket WHERE eventID = %s AND status = 'SOLD'", (event_id,))
+        sold = cursor.fetchone()[0]
+        checks.append(("SOLD tickets = purchases", purchased, sold, sold == purchased))
+
+        cursor.execute("""SELECT COALESCE(SUM(sold), 0), COALESCE(SUM(available), 0)
+                          FROM event_inventory WHERE eventID = %s""", (event_id,))
+        counted_sold, counted_available = cursor.fetchone()
+        cursor.execute("SELECT Get_Total_Tickets_Count(%s) - COUNT(*) FROM Ticket WHERE eventID = %s AND status != 'AVAILABLE'",
+                       (event_id, event_id))
+        available = cursor.fetchone()[0]
+        checks.append(("event_inventory.sold", sold, counted_sold, counted_sold == sold))
+        checks.append(("event_inventory.available", available, counted_available, counted_available == available))
+        conn.rollback()
+    finally:
+        cursor.close()
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--users", type=int, default=50, help="concurrent simulated attendees")
+    parser.add_argument("--capacity", type=int, default=2000, help="venue capacity of the hot event")
+    parser.add_argument("--seats-per-booking", type=int, default=1)
+    parser.add_argument("--seat-order", choices=("random", "lowest"), default="random")
+    parser.add_argument("--inventory-mode", choices=("EAGER", "LAZY"), default="EAGER")
+    parser.add_argument("--duration", type=float, default=60, help="stop after this many seconds")
+    parser.add_argument("--max-retries", type=int, default=3, help="BookingEngine deadlock retries")
+    parser.add_argument("--pool-size", type=int, default=0, help="shared connections (default: one per user)")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded data in place")
+    args = parser.parse_args()
+
+    conn = benchUtils.connect(args)
+    venue_id, event_id, attendee_ids, seat_nos = seed(conn, args.capacity, args.users, args.inventory_mode)
+    print(f"Seeded event {event_id}: {len(seat_nos)} seats, {len(attendee_ids)} attendees")
+
+    pool = ConnectionPool(benchUtils.connect_args(args), size=args.pool_size or args.users, timeout=args.duration)
+    try:
+        deadline = time.perf_counter() + args.duration
+        workers = []
+        for attendee_id in attendee_ids:
+            order = list(seat_nos)
+            if args.seat_order == "random":
+                random.shuffle(order)
+            workers.append(SimulatedAttendee(args, pool, attendee_id, event_id, order, deadline))
+
+        with Timer() as t:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        latencies = sorted(l for w in workers for l in w.latencies)
+        won = sum(w.won for w in workers)
+        seats_won = sum(w.seats_won for w in workers)
+        attempts = len(latencies)
+        benchUtils.print_table(("metric", "value"), [
+            ("elapsed s", f"{t.elapsed:.2f}"),
+            ("booking attempts", attempts),
+            ("won / lost", f"{won} / {sum(w.lost for w in workers)}"),
+            ("seats sold", f"{seats_won} / {len(seat_nos)}"),
+            ("attempts/s", f"{attempts / t.elapsed:,.1f}"),
+            ("seats sold/s", f"{seats_won / t.elapsed:,.1f}"),
+            ("p50 ms", f"{benchUtils.percentile(latencies, 50) * 1000:.1f}"),
+            ("p95 ms", f"{benchUtils.percentile(latencies, 95) * 1000:.1f}"),
+            ("p99 ms", f"{benchUtils.percentile(latencies, 99) * 1000:.1f}"),
+            ("deadlock retries", sum(w.retries for w in workers)),
+            ("retries exhausted", sum(w.deadlocks for w in workers)),
+            ("other errors", sum(w.errors for w in workers)),
+            ("connection pool", pool.stats()),
+        ])
+
+        print()
+        checks = check_invariants(conn, event_id, args.capacity, seats_won)
+        benchUtils.print_table(("invariant", "expected", "actual", "ok"),
+                               [(name, expected, actual, "OK" if ok else "FAIL")
+                                for name, expected, actual, ok in checks])
+    finally:
+        if not args.keep:
+            cleanup(conn, venue_id, event_id, attendee_ids)
+        pool.close()
+        conn.close()
+
+    if not all(ok for *_, ok in checks):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Time event creation (and the ticket generation it triggers) by venue capacity.
+
+    python benchmarks/eventCreationBenchmark.py --password secret --capacities 1000,10000,60000
+    python benchmarks/eventCreationBenchmark.py --password secret --compare-legacy
+
+--compare-legacy temporarily swaps in the old row-by-row WHILE-loop trigger to
+show the difference, then restores the trigger from event_management_system.sql.
+Every venue/event created here is deleted again afterwards.
+"""
+import argparse
+import benchUtils
+from benchUtils import Timer
+
+
+LEGACY_TRIGGER = """
+CREATE TRIGGER trg_after_event_insert
+AFTER INSERT ON Events
+FOR EACH ROW
+BEGIN
+    DECLARE total_capacity INT;
+    DECLARE vip_capacity INT;
+    DECLARE premium_capacity INT;
+    DECLARE general_capacity INT;
+    DECLARE student_capacity INT;
+    DECLARE seat_no INT DEFAULT 1;
+
+    SELECT capacity INTO total_capacity FROM Venue WHERE venueID = NEW.venueID;
+
+    SET vip_capacity = total_capacity * 0.1;
+    SET premium_capacity = total_capacity * 0.2;
+    SET general_capacity = total_capacity * 0.5;
+    SET student_capacity = total_capacity * 0.2;
+
+    WHILE vip_capacity > 0 DO
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        VALUES (1000.00, 'AVAILABLE', 'VIP', CONCAT('VIP-', seat_no), NEW.eventID);
+        SET seat_no = seat_no + 1;
+        SET vip_capacity = vip_capacity - 1;
+    END WHILE;
+
+    WHILE premium_capacity > 0 DO
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        VALUES (750.00, 'AVAILABLE', 'PREMIUM', CONCAT('PREMIUM-', seat_no), NEW.eventID);
+        SET seat_no = seat_no + 1;
+        SET premium_capacity = premium_capacity - 1;
+    END WHILE;
+
+    WHILE general_capacity > 0 DO
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        VALUES (500.00, 'AVAILABLE', 'GENERAL', CONCAT('GENERAL-', seat_no), NEW.eventID);
+        SET seat_no = seat_no + 1;
+        SET general_capacity = general_capacity - 1;
+    END WHILE;
+
+    WHILE student_capacity > 0 DO
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        VALUES (250.00, 'AVAILABLE', 'STUDENT', CONCAT('STUDENT-', seat_no), NEW.eventID);
+        SET seat_no = seat_no + 1;
+        SET student_capacity = student_capacity - 1;
+    END WHILE;
+END
+"""
+
+
+def time_event_creation(conn, capacity, repeat):
+    """Seconds to insert + commit one event at a venue of the given capacity (best of `repeat`)"""
+    cursor = conn.cursor()
+    best = None
+    tickets = 0
+    try:
+        cursor.execute("""INSERT INTO Venue (cost, address, country, pincode, name, type, capacity)
+                          VALUES (0, 'Benchmark', 'India', '000000', 'Benchmark Venue', 'Stadium', %s)""",
+                       (capacity,))
+        venue_id = cursor.lastrowid
+        conn.commit()
+        for _ in range(repeat):
+            with Timer() as t:
+                cursor.execute("""INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID)
+                                  VALUES ('Benchmark Event', '2099-01-01', 'Planned', '10:00:00', '11:00:00', 1, %s)""",
+                               (venue_id,))
+                conn.commit()
+            best = t.elapsed if best is None else min(best, t.elapsed)
+            event_id = cursor.lastrowid
+            cursor.execute("SELECT COUNT(*) FROM Ticket WHERE eventID = %s", (event_id,))
+            tickets = cursor.fetchone()[0]
+            cursor.execute("DELETE FROM Events WHERE eventID = %s", (event_id,))
+            conn.commit()
+        cursor.execute("DELETE FROM Venue WHERE venueID = %s", (venue_id,))
+        conn.commit()
+    finally:
+        cursor.close()
+    return best, tickets
+
+
+def run(conn, capacities, repeat, label):
+    rows = []
+    for capacity in capacities:
+        seconds, tickets = time_event_creation(conn, capacity, repeat)
+        rows.append((label, capacity, tickets, f"{seconds * 1000:.1f}", f"{tickets / seconds:,.0f}"))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--capacities", default="100,1000,10000,30000,60000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare-legacy", action="store_true")
+    args = parser.parse_args()
+
+    capacities = [int(c) for c in args.capacities.split(",")]
+    conn = benchUtils.connect(args)
+    rows = run(conn, capacities, args.repeat, "set-based")
+
+    if args.compare_legacy:
+        cursor = conn.cursor()
+        try:
+            benchUtils.replace_schema_object(cursor, "TRIGGER", "trg_after_event_insert", LEGACY_TRIGGER)
+            rows += run(conn, capacities, args.repeat, "while-loop")
+        finally:
+            current = benchUtils.schema_objects()["trg_after_event_insert"]
+            benchUtils.replace_schema_object(cursor, "TRIGGER", "trg_after_event_insert", current)
+            cursor.close()
+
+    benchUtils.print_table(("trigger", "capacity", "tickets", "create ms", "tickets/s"), rows)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Check that seats whose hold expired are offered by the best-available allocator again.
+
+    python benchmarks/holdExpiryCheck.py --password secret
+    python benchmarks/holdExpiryCheck.py --password secret --inventory-mode LAZY
+
+Seeds a small event, holds every VIP seat through a SeatAllocator for a second,
+lets the holds expire and runs one HoldSweeper pass. The allocator is not told
+about the sweep, as when another portal's sweeper releases them, yet it must
+still find the seats instead of answering sold out. The venue, event and
+attendees are deleted again unless --keep.
+"""
+import argparse
+import time
+import benchUtils
+from bookingEngine import BookingEngine
+from bookingLoadTest import seed, cleanup
+from connectionPool import ConnectionPool
+from holdSweeper import HoldSweeper
+from seatAllocator import SeatAllocator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--capacity", type=int, default=100, help="venue capacity of the test event")
+    parser.add_argument("--inventory-mode", choices=("EAGER", "LAZY"), default="EAGER")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded data in place")
+    args = parser.parse_args()
+
+    conn = benchUtils.connect(args)
+    venue_id, event_id, attendee_ids, seat_nos = seed(conn, args.capacity, 2, args.inventory_mode)
+    holder, buyer = attendee_ids
+    pool = ConnectionPool(benchUtils.connect_args(args), size=2)
+    checks = []
+    try:
+        allocator = SeatAllocator(pool, BookingEngine(pool))
+        vip_seats = allocator.available(event_id, "VIP")
+        hold = allocator.allocate(holder, event_id, "VIP", vip_seats, hold=True, hold_seconds=1)
+        checks.append(("every VIP seat held", vip_seats, len(hold.seats), hold.won))
+
+        result = allocator.allocate(buyer, event_id, "VIP", 1, hold=True)
+        checks.append(("VIP sold out while held", "lost", "won" if result.won else "lost", not result.won))
+
+        time.sleep(2)
+        released = len(HoldSweeper(pool).sweep(conn))
+        checks.append(("expired holds swept", vip_seats, released, released == vip_seats))
+
+        result = allocator.allocate(buyer, event_id, "VIP", 1, hold=True)
+        checks.append(("swept seat allocated again", "won", "won" if result.won else result.message, result.won))
+    finally:
+        if not args.keep:
+            cleanup(conn, venue_id, event_id, attendee_ids)
+        pool.close()
+        conn.close()
+
+    benchUtils.print_table(("check", "expected", "actual", "ok"),
+                           [(name, expected, actual, "OK" if ok else "FAIL") for name, expected, actual, ok in checks])
+    if not all(ok for *_, ok in checks):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,618 @@
+"""EXPLAIN every SQL statement the portals issue and fail on new full scans.
+
+    python benchmarks/queryPlanCheck.py --password secret
+    python benchmarks/queryPlanCheck.py --password secret --events 5000 --capacity 100 --min-rows 5000
+    python benchmarks/queryPlanCheck.py --password secret --no-seed --verbose
+
+Statements are collected from the source instead of a hand-kept list: every
+cursor.execute() and repository fetch_all() / fetch_one() / write() in the
+portal-side modules (string literals, f-strings and query variables; an
+f-string field that is a call such as placeholders() is taken as one bound
+parameter), each fetch_page() as its first and a later page for every sort in
+the class's ORDERS, plus every stored function/procedure whose
+name appears in those modules, and the routines those call in turn.
+Statements built at runtime that cannot be rendered are listed as not
+explained.
+
+The database is first seeded with --events EAGER events (tickets, purchases,
+attends, artists, staff, sponsors and waitlist history) and analyzed, so the
+optimizer sees realistic row counts; --no-seed explains against the data that
+is already there. Each statement gets EXPLAIN FORMAT=JSON with sample values
+for its parameters (the busiest event/attendee etc.), and table accesses are
+flagged when they examine at least --min-rows rows:
+
+    full scan / full index scan   fails the run unless listed in ALLOWED_SCANS
+    filesort / temporary table    reported only, but any filesort in a
+                                  SORTED_BY_INDEX statement fails the run
+
+An index is proposed for each flagged scan from the columns its condition
+uses. Everything seeded here is deleted again unless --keep.
+"""
+import argparse
+import ast
+import datetime
+import json
+import os
+import re
+import time
+import mysql.connector
+import benchUtils
+from repository import page_sql
+
+
+# Modules whose SQL the portals issue, directly or through the booking classes
+APP_MODULES = ("adminPortal", "customerPortal", "repository", "bookingEngine", "seatAllocator", "waitlist",
+               "holdSweeper", "eventMetrics", "reportCache", "reportSnapshots")
+
+# Methods whose first argument is an SQL statement
+STATEMENT_CALLS = ("execute", "fetch_all", "fetch_one", "fetch_page", "write")
+
+# Classes that only run the statements handed to them and build no SQL of their own
+WRAPPER_CLASSES = ("StatementCache",)
+
+# Statements that read whole tables on purpose. A label covers all statements of
+# a function or method ("repository.Reports.dashboard_counts"), just one
+# ("...#2") or, for a paged list, the first and later pages of one sort
+# ("repository.Events.page/name").
+ALLOWED_SCANS = {
+    # Dashboard totals count whole tables
+    "repository.Reports.dashboard_counts",
+    # Column sorts the admin can pick besides the indexed default and ID sorts read the whole table
+    "repository.Events.page/name",
+    "repository.Events.page/status",
+    "repository.Events.page/budget",
+    "repository.Events.page/venue",
+    "repository.Venues.page/type",
+    "repository.Venues.page/capacity",
+    "repository.Venues.page/cost",
+    "repository.Venues.page/address",
+    "repository.Artists.page/genre",
+    "repository.Artists.page/country",
+    "repository.Artists.page/fee",
+    "repository.Staff.page/name",
+    # Reports over the whole database
+    "Report_Events_Venue_Tickets",
+    "Report_Top_Attended_Events",
+    "Report_Sponsor_Contributions",
+    "Report_Artist_Performances",
+    "Report_Attendee_Demographics",
+    "Query_Revenue_Per_Venue",
+}
+
+# Statements whose ORDER BY must be read from an index: a filesort of any size
+# fails the run, since it means each page sorts the whole event again
+SORTED_BY_INDEX = {
+    "repository.Tickets.available",
+}
+
+TABLES = ("Venue", "Events", "Ticket", "Attendee", "Artist", "social_media", "performs", "booking_request",
+          "purchases", "attends", "Sponsor", "sponsors_event", "Staff", "works_at", "ticket_tier", "seat_range",
+          "event_inventory", "event_rollup", "event_settlement", "data_version", "report_snapshot",
+          "report_snapshot_row", "waitlist", "seq_numbers")
+
+# Parameter values: the busiest event / attendee, so keyed lookups are explained at their worst
+SAMPLE_QUERIES = {
+    "eventid": "SELECT eventID FROM event_inventory GROUP BY eventID ORDER BY SUM(sold) DESC LIMIT 1",
+    "attendeeid": "SELECT attendeeID FROM purchases GROUP BY attendeeID ORDER BY COUNT(*) DESC LIMIT 1",
+    "venueid": "SELECT venueID FROM Events GROUP BY venueID ORDER BY COUNT(*) DESC LIMIT 1",
+    "ticketid": "SELECT MAX(ticketID) FROM Ticket",
+    "artistid": "SELECT MAX(artistID) FROM Artist",
+    "sponsorid": "SELECT MAX(sponsorID) FROM Sponsor",
+    "staffid": "SELECT MAX(staffID) FROM Staff",
+    "waitlistid": "SELECT MAX(waitlistID) FROM waitlist",
+    "requestkey": "SELECT MAX(request_key) FROM booking_request",
+    # The busiest event's first GENERAL range (the 'type' sample)
+    "firstseat": """SELECT MIN(first_seat) FROM seat_range WHERE type = 'GENERAL' AND eventID =
+                    (SELECT eventID FROM event_inventory GROUP BY eventID ORDER BY SUM(sold) DESC LIMIT 1)""",
+}
+
+ROUTINE = re.compile(r"CREATE\s+(FUNCTION|PROCEDURE)\s+(\w+)\s*\(([^)]*)\)", re.I)
+INTO_VARIABLES = re.compile(r"\bINTO\s+\w+(?:\s*,\s*\w+)*", re.I)
+TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+NOT_ALIASES = {"WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "CROSS", "STRAIGHT_JOIN", "NATURAL", "ON", "USING",
+               "SET", "GROUP", "ORDER", "HAVING", "LIMIT", "FOR", "UNION", "WINDOW", "AND", "OR"}
+COMPARED_COLUMN = re.compile(r"([\w.]+)\s*(?:=|!=|<>|>=|<=|<|>)\s*$|([\w.]+)\s+IN\s*\(([^()]*,)?\s*$", re.I)
+TODAY = datetime.date.today()
+
+
+def normalize(name):
+    return name.split(".")[-1].replace("_", "").lower()
+
+
+# Statement collection
+
+def code_statements(module):
+    """(label, sql or None, reason) for every statement call in a module"""
+    with open(os.path.join(benchUtils.REPO_DIR, module + ".py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    functions = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            functions.append((node.name, node, {}))
+        elif isinstance(node, ast.ClassDef) and node.name not in WRAPPER_CLASSES:
+            orders = class_orders(node)
+            functions += [(f"{node.name}.{n.name}", n, orders) for n in node.body if isinstance(n, ast.FunctionDef)]
+
+    for name, function, orders in functions:
+        strings = string_assignments(function)
+        # Wrappers that pass their own sql argument on (StatementCache) hold no statement
+        arguments = {a.arg for a in function.args.args}
+        calls = sorted((n for n in ast.walk(function)
+                        if isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute)
+                        and n.func.attr in STATEMENT_CALLS and n.args
+                        and not (isinstance(n.args[0], ast.Name) and n.args[0].id in arguments)),
+                       key=lambda n: (n.lineno, n.col_offset))
+        for number, call in enumerate(calls, 1):
+            label = f"{module}.{name}#{number}"
+            try:
+                variants = list(dict.fromkeys(render(call.args[0], strings)))
+            except ValueError as e:
+                yield label, None, str(e)
+                continue
+            if call.func.attr == "fetch_page":
+                if not orders:
+                    yield label, None, "fetch_page() outside a class with ORDERS"
+                    continue
+                # The first page and one read past a previous page's last row, per sort
+                variants = [(f"/{sort}{after}", page_sql(sql, order, keyset=bool(after)))
+                            for sql in variants for sort, order in orders.items() for after in ("", "+after")]
+                for suffix, sql in variants:
+                    yield label + suffix, sql, None
+                continue
+            for i, sql in enumerate(variants, 1):
+                yield (f"{label}/{i}" if len(variants) > 1 else label), sql, None
+
+
+def class_orders(node):
+    """A class's ORDERS: sort name -> order columns, as fetch_page() is given them"""
+    for item in node.body:
+        if (isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name)
+                and item.targets[0].id == "ORDERS"):
+            return ast.literal_eval(item.value)
+    return {}
+
+
+def string_assignments(function):
+    """name -> string / f-string nodes assigned to it anywhere in the function"""
+    strings = {}
+    for node in ast.walk(function):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and (isinstance(node.value, ast.JoinedStr)
+                     or isinstance(node.value, ast.Constant) and isinstance(node.value.value, str))):
+            strings.setdefault(node.targets[0].id, []).append(node.value)
+    return strings
+
+
+def render(node, strings):
+    """Every SQL text a string expression can produce"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.Name) and node.id in strings:
+        return [sql for value in strings[node.id] for sql in render(value, strings)]
+    if isinstance(node, ast.JoinedStr):
+        texts = [""]
+        for part in node.values:
+            if isinstance(part, ast.Constant):
+                pieces = [part.value]
+            elif isinstance(part.value, ast.Call):
+                # placeholders(...) and friends expand to bound parameters
+                pieces = ["%s"]
+            elif isinstance(part.value, ast.Name) and part.value.id in strings:
+                pieces = render(part.value, strings)
+            else:
+                raise ValueError(f"SQL built from {ast.unparse(part.value)}")
+            texts = [text + piece for text in texts for piece in pieces]
+        return texts
+    raise ValueError(f"SQL built at runtime from {ast.unparse(node)}")
+
+
+def routine_statements(ddl, samples):
+    """The SELECT/UPDATE/DELETE/INSERT ... SELECT statements of a function/procedure, parameters filled in"""
+    match = ROUTINE.match(ddl)
+    variables = []
+    for param in match.group(3).split(","):
+        words = param.split()
+        if words and words[0].upper() in ("IN", "OUT", "INOUT"):
+            words = words[1:]
+        if words:
+            variables.append(words[0])
+    upper = ddl.upper()
+    body = re.sub(r"--[^\n]*", "", ddl[upper.index("BEGIN") + 5:upper.rindex("END")])
+    variables += re.findall(r"\bDECLARE\s+(\w+)", body, re.I)
+
+    statements = []
+    for piece in body.split(";"):
+        piece = piece.strip()
+        if re.match(r"RETURN\b", piece, re.I):
+            piece = "SELECT " + piece[len("RETURN"):]
+        keyword = re.search(r"\b(SELECT|UPDATE|DELETE|INSERT)\b", piece, re.I)
+        if not keyword:
+            continue
+        sql = piece[keyword.start():]
+        if sql[:6].upper() == "SELECT":
+            sql = INTO_VARIABLES.sub(" ", sql, count=1)
+        if not re.search(r"\bFROM\b", sql, re.I) and sql[:6].upper() != "UPDATE":
+            continue
+        for variable in variables:
+            sql = re.sub(rf"(?<![.\w`]){variable}(?![\w(])", samples.get(normalize(variable), "1"), sql)
+        statements.append(sql)
+    return statements
+
+
+def used_routines(sources):
+    """name -> CREATE statement of every routine the sources name, and the routines those call"""
+    routines = {name: ddl for name, ddl in benchUtils.schema_objects().items() if ROUTINE.match(ddl)}
+    used = {}
+    pending = [name for name in routines if re.search(rf"\b{name}\b", sources)]
+    while pending:
+        name = pending.pop()
+        if name in used:
+            continue
+        used[name] = routines[name]
+        pending += [other for other in routines if other != name and re.search(rf"\b{other}\b", routines[name])]
+    return used
+
+
+def explainable(sql):
+    words = sql.lstrip().split(None, 1)
+    first = words[0].upper() if words else ""
+    return first in ("SELECT", "WITH", "UPDATE", "DELETE") or (first == "INSERT" and re.search(r"\bSELECT\b", sql, re.I))
+
+
+# Parameters
+
+def load_samples(conn):
+    cursor = conn.cursor()
+    samples = {
+        "date": f"'{TODAY}'",
+        "eventdate": f"'{TODAY}'",
+        "starttime": "'10:00:00'",
+        "endtime": "'12:00:00'",
+        "type": "'GENERAL'",
+    }
+    try:
+        for key, query in SAMPLE_QUERIES.items():
+            cursor.execute(query)
+            row = cursor.fetchone()
+            if row and row[0] is not None:
+                samples[key] = str(row[0]) if isinstance(row[0], int) else "'" + str(row[0]).replace("'", "''") + "'"
+        conn.rollback()
+    finally:
+        cursor.close()
+    return samples
+
+
+def bind(sql, samples):
+    """Replace each %s with a sample value for the column it is compared with"""
+    parts = sql.split("%s")
+    out = parts[0]
+    for part in parts[1:]:
+        if re.search(r"\b(?:INTERVAL|LIMIT|OFFSET)\s*$", out, re.I):
+            value = "1"
+        else:
+            match = COMPARED_COLUMN.search(out)
+            column = match and (match.group(1) or match.group(2))
+            value = samples.get(normalize(column), "'1'") if column else "'1'"
+        out += value + part
+    return out
+
+
+# Plan analysis
+
+def table_accesses(node):
+    """Every table access in an EXPLAIN FORMAT=JSON tree"""
+    if isinstance(node, dict):
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            yield table
+        for value in node.values():
+            yield from table_accesses(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from table_accesses(item)
+
+
+def sort_operations(node, key="query_block"):
+    """(operation, kind, subtree) for every filesort / temporary table in the plan"""
+    if isinstance(node, dict):
+        if node.get("using_filesort"):
+            yield key, "filesort", node
+        if node.get("using_temporary_table"):
+            yield key, "temporary table", node
+        for child_key, value in node.items():
+            yield from sort_operations(value, child_key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from sort_operations(item, key)
+
+
+def table_names(sql):
+    """alias -> table for the tables a statement names"""
+    names = {}
+    for table, alias in TABLE_REFERENCE.findall(sql):
+        names[table] = table
+        if alias and alias.upper() not in NOT_ALIASES:
+            names[alias] = table
+    return names
+
+
+def existing_indexes(conn):
+    """table -> column lists of its indexes, lower-cased"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """)
+        indexes = {}
+        for table, index, column in cursor.fetchall():
+            indexes.setdefault(table.lower(), {}).setdefault(index, []).append(column.lower())
+        conn.rollback()
+    finally:
+        cursor.close()
+    return {table: list(by_name.values()) for table, by_name in indexes.items()}
+
+
+def propose_index(table, alias, access, indexes):
+    """ALTER TABLE for the columns a scanned table is filtered/joined on, unless an index already leads with them"""
+    columns = list(dict.fromkeys(re.findall(rf"`{re.escape(alias)}`\.`(\w+)`", access.get("attached_condition", ""))))
+    if not columns:
+        return None
+    lowered = [c.lower() for c in columns]
+    if any(index[:len(lowered)] == lowered for index in indexes.get(table.lower(), [])):
+        return None
+    return f"ALTER TABLE {table} ADD INDEX idx_{table.lower()}_{'_'.join(lowered)} ({', '.join(columns)});"
+
+
+def allowed(label):
+    if label in ALLOWED_SCANS or label.split("/")[0] in ALLOWED_SCANS or label.split("#")[0] in ALLOWED_SCANS:
+        return True
+    # Paged lists: "repository.Events.page#1/name+after" is covered by "repository.Events.page/name"
+    method, _, sort = label.partition("/")
+    return bool(sort) and f"{method.split('#')[0]}/{sort.removesuffix('+after')}" in ALLOWED_SCANS
+
+
+def check(label, sql, plan, min_rows, indexes):
+    """Findings rows (label, table, access, rows, key, finding, verdict) and proposed indexes"""
+    names = table_names(sql)
+    findings = []
+    proposals = []
+    for access in table_accesses(plan):
+        alias = access["table_name"]
+        rows = access.get("rows_examined_per_scan", 0)
+        if (access.get("insert") or "materialized_from_subquery" in access or alias.startswith("<")
+                or access.get("access_type") not in ("ALL", "index")
+                or "range_checked_for_each_record" in access or rows < min_rows):
+            continue
+        table = names.get(alias, alias)
+        finding = "full scan" if access["access_type"] == "ALL" else "full index scan"
+        findings.append((label, table, access["access_type"], rows, access.get("key", ""), finding,
+                         "allowed" if allowed(label) else "NEW"))
+        if not allowed(label):
+            proposal = propose_index(table, alias, access, indexes)
+            if proposal:
+                proposals.append(proposal)
+    for operation, kind, subtree in sort_operations(plan):
+        rows = max((a.get("rows_produced_per_join", 0) for a in table_accesses(subtree)), default=0)
+        if kind == "filesort" and label.split("#")[0] in SORTED_BY_INDEX:
+            findings.append((label, operation, "", rows, "", kind, "NEW"))
+        elif rows >= min_rows:
+            findings.append((label, operation, "", rows, "", kind, "reported"))
+    return findings, proposals
+
+
+def verbose_rows(label, sql, plan):
+    names = table_names(sql)
+    return [(label, names.get(a["table_name"], a["table_name"]), a.get("access_type", ""),
+             a.get("rows_examined_per_scan", ""), a.get("key", ""), "", "")
+            for a in table_accesses(plan)]
+
+
+# Seed data
+
+class Seed:
+    """EAGER events over a set of venues, half past and half upcoming, with sales and assignments"""
+
+    def __init__(self, conn, args):
+        self.conn = conn
+        self.tag = f"{int(time.time()) % 10 ** 8:08d}"
+        cursor = conn.cursor()
+        try:
+            cursor.executemany("""INSERT INTO Venue (cost, address, country, pincode, name, type, capacity)
+                                  VALUES (1000, 'Plan Check', 'India', '000000', %s, 'Hall', %s)""",
+                               [(f"Plan Check {self.tag} {i}", args.capacity) for i in range(args.venues)])
+            self.venue_ids = self.ids(cursor, "SELECT venueID FROM Venue WHERE name LIKE %s", f"Plan Check {self.tag} %")
+
+            days = -(-args.events // args.venues)
+            first_day = TODAY - datetime.timedelta(days=days // 2)
+            events = []
+            for i in range(args.events):
+                day = first_day + datetime.timedelta(days=i // args.venues)
+                events.append((day, 'Completed' if day < TODAY else 'Planned', self.venue_ids[i % args.venues]))
+            self.insert(cursor, """INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID)
+                                   VALUES ('Plan Check Event', %s, %s, '10:00:00', '12:00:00', 1, %s)""", events)
+            venue_filter = f"IN ({', '.join(['%s'] * len(self.venue_ids))})"
+            event_ids = self.ids(cursor, f"SELECT eventID FROM Events WHERE venueID {venue_filter} ORDER BY eventID",
+                                 *self.venue_ids)
+
+            self.insert(cursor, """INSERT INTO Attendee (name, phone_no, email, gender, age)
+                                   VALUES (%s, %s, %s, %s, %s)""",
+                        [(f"Plan Check {i}", f"QP{self.tag}{i:06d}", f"plan.check.{self.tag}.{i}@example.com",
+                          "MFO"[i % 3], 18 + i % 60) for i in range(args.attendees)])
+            self.attendee_ids = self.ids(cursor, "SELECT attendeeID FROM Attendee WHERE phone_no LIKE %s",
+                                         f"QP{self.tag}%")
+            self.insert(cursor, """INSERT INTO Artist (name, genre, country, phone_no, email, fee)
+                                   VALUES (%s, 'Music', 'India', %s, %s, 100)""",
+                        [(f"Plan Check {i}", f"QP{self.tag}{i:04d}", f"plan.check.{self.tag}.{i}@example.com")
+                         for i in range(args.people)])
+            artist_ids = self.ids(cursor, "SELECT artistID FROM Artist WHERE phone_no LIKE %s", f"QP{self.tag}%")
+            self.insert(cursor, """INSERT INTO Staff (name, role, phone_no, email, salary)
+                                   VALUES (%s, 'Volunteer', %s, %s, 100)""",
+                        [(f"Plan Check {i}", f"QP{self.tag}{i:04d}", f"plan.check.{self.tag}.{i}@example.com")
+                         for i in range(args.people)])
+            staff_ids = self.ids(cursor, "SELECT staffID FROM Staff WHERE phone_no LIKE %s", f"QP{self.tag}%")
+            self.insert(cursor, """INSERT INTO Sponsor (name, industry, contact_person, phone_no, email)
+                                   VALUES (%s, 'Benchmark', 'Plan Check', %s, %s)""",
+                        [(f"Plan Check {i}", f"QP{self.tag}{i:04d}", f"plan.check.{self.tag}.{i}@example.com")
+                         for i in range(args.people)])
+            sponsor_ids = self.ids(cursor, "SELECT sponsorID FROM Sponsor WHERE phone_no LIKE %s", f"QP{self.tag}%")
+
+            people = len(artist_ids)
+            self.insert(cursor, "INSERT INTO performs (artistID, eventID, noOfSongs) VALUES (%s, %s, 5)",
+                        [(artist_ids[(i + k) % people], e) for i, e in enumerate(event_ids) for k in range(2)])
+            self.insert(cursor, "INSERT INTO works_at (staffID, eventID, shift) VALUES (%s, %s, 'FULL_DAY')",
+                        [(staff_ids[(i + k) % people], e) for i, e in enumerate(event_ids) for k in range(2)])
+            self.insert(cursor, "INSERT INTO sponsors_event (sponsorID, eventID, amount) VALUES (%s, %s, 500)",
+                        [(sponsor_ids[i % people], e) for i, e in enumerate(event_ids)])
+
+            # Sell the first --sold share of every event's seats, round-robin over the attendees
+            cursor.execute(f"""SELECT t.eventID, t.ticketID FROM Ticket t JOIN Events e ON e.eventID = t.eventID
+                               WHERE e.venueID {venue_filter} ORDER BY t.eventID, t.ticketID""",
+                           tuple(self.venue_ids))
+            per_event = int(args.capacity * args.sold)
+            sold = {}
+            for event_id, ticket_id in cursor.fetchall():
+                if len(sold.setdefault(event_id, [])) < per_event:
+                    sold[event_id].append(ticket_id)
+            purchases = []
+            attends = set()
+            for k, (event_id, ticket_id) in enumerate((e, t) for e, tickets in sold.items() for t in tickets):
+                attendee_id = self.attendee_ids[k % len(self.attendee_ids)]
+                purchases.append((attendee_id, ticket_id))
+                attends.add((attendee_id, event_id))
+            self.insert(cursor, "INSERT INTO purchases (attendeeID, ticketID) VALUES (%s, %s)", purchases)
+            self.insert(cursor, "INSERT INTO attends (attendeeID, eventID) VALUES (%s, %s)", sorted(attends))
+
+            # Waitlist history: finished entries pile up in a long-running system. None are
+            # WAITING, so a running WaitlistPromoter leaves the seeded events alone.
+            entries = {(event_ids[i % len(event_ids)], ("VIP", "PREMIUM", "GENERAL", "STUDENT")[i % 4],
+                        self.attendee_ids[i % len(self.attendee_ids)]) for i in range(args.waitlist)}
+            self.insert(cursor, """INSERT INTO waitlist (eventID, type, attendeeID, quantity, status)
+                                   VALUES (%s, %s, %s, 1, %s)""",
+                        [(*entry, ("FULFILLED", "EXPIRED", "CANCELLED")[i % 3])
+                         for i, entry in enumerate(sorted(entries))])
+
+            cursor.execute(f"ANALYZE TABLE {', '.join(TABLES)}")
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def ids(self, cursor, query, *params):
+        cursor.execute(query, params)
+        return [row[0] for row in cursor.fetchall()]
+
+    def insert(self, cursor, query, rows):
+        for i in range(0, len(rows), 1000):
+            cursor.executemany(query, rows[i:i + 1000])
+            self.conn.commit()
+
+    def delete(self):
+        cursor = self.conn.cursor()
+        try:
+            for i in range(0, len(self.venue_ids), 10):
+                batch = self.venue_ids[i:i + 10]
+                cursor.execute(f"DELETE FROM Venue WHERE venueID IN ({', '.join(['%s'] * len(batch))})", tuple(batch))
+                self.conn.commit()
+            cursor.execute("DELETE FROM Attendee WHERE phone_no LIKE %s", (f"QP{self.tag}%",))
+            for table in ("Artist", "Staff", "Sponsor"):
+                cursor.execute(f"DELETE FROM {table} WHERE phone_no LIKE %s", (f"QP{self.tag}%",))
+            self.conn.commit()
+        finally:
+            cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--min-rows", type=int, default=1000, help="flag accesses examining at least this many rows")
+    parser.add_argument("--no-seed", action="store_true", help="explain against the existing data only")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--venues", type=int, default=20)
+    parser.add_argument("--capacity", type=int, default=50, help="seats per event")
+    parser.add_argument("--sold", type=float, default=0.5, help="share of every event's seats sold")
+    parser.add_argument("--attendees", type=int, default=5000)
+    parser.add_argument("--people", type=int, default=50, help="artists, staff and sponsors each")
+    parser.add_argument("--waitlist", type=int, default=5000, help="waitlist history rows")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded data in place")
+    parser.add_argument("--verbose", action="store_true", help="print every table access, not just findings")
+    args = parser.parse_args()
+
+    statements = []
+    sources = ""
+    for module in APP_MODULES:
+        with open(os.path.join(benchUtils.REPO_DIR, module + ".py"), encoding="utf-8") as f:
+            sources += f.read()
+        statements += list(code_statements(module))
+
+    conn = benchUtils.connect(args)
+    seed = None
+    try:
+        if not args.no_seed:
+            with benchUtils.Timer() as t:
+                seed = Seed(conn, args)
+            print(f"Seeded {args.events} events in {t.elapsed:.1f}s")
+        samples = load_samples(conn)
+        indexes = existing_indexes(conn)
+        for name, ddl in sorted(used_routines(sources).items()):
+            routine = routine_statements(ddl, samples)
+            statements += [(f"{name}#{i}" if len(routine) > 1 else name, sql, None)
+                           for i, sql in enumerate(routine, 1)]
+
+        findings = []
+        proposals = []
+        accesses = []
+        unexplained = []
+        explained = 0
+        cursor = conn.cursor()
+        try:
+            for label, sql, reason in statements:
+                if sql is None:
+                    unexplained.append((label, reason))
+                    continue
+                if not explainable(sql):
+                    continue
+                try:
+                    cursor.execute("EXPLAIN FORMAT=JSON " + bind(sql, samples))
+                    plan = json.loads(cursor.fetchone()[0])
+                except mysql.connector.Error as e:
+                    unexplained.append((label, e.msg))
+                    continue
+                explained += 1
+                rows, proposed = check(label, sql, plan, args.min_rows, indexes)
+                findings += rows
+                proposals += [p for p in proposed if p not in proposals]
+                if args.verbose:
+                    accesses += verbose_rows(label, sql, plan)
+            conn.rollback()
+        finally:
+            cursor.close()
+    finally:
+        if seed is not None and not args.keep:
+            seed.delete()
+        conn.close()
+
+    headers = ("statement", "table", "access", "rows", "key", "finding", "verdict")
+    if args.verbose:
+        benchUtils.print_table(headers, accesses)
+        print()
+    benchUtils.print_table(headers, findings)
+    if proposals:
+        print("\nProposed indexes:")
+        for proposal in proposals:
+            print(f"  {proposal}")
+    if unexplained:
+        print("\nNot explained:")
+        for label, reason in unexplained:
+            print(f"  {label}: {reason}")
+
+    new = sum(1 for *_, verdict in findings if verdict == "NEW")
+    print(f"\n{explained} statements explained, {len(findings)} findings, {new} new full scans or filesorts "
+          f"(threshold {args.min_rows} rows)")
+    if new:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
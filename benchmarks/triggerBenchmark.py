@@ -0,0 +1,307 @@
+"""Per-row cost of each write path with each of its triggers enabled vs. disabled.
+
+    python benchmarks/triggerBenchmark.py --password secret
+    python benchmarks/triggerBenchmark.py --password secret --sizes 1000,10000,50000 --rows 500 --paths performs,attends
+
+For every history size, seeds that many events (each with one ticket, a
+purchase, an attendee, an artist, a staff member and a sponsor), then times
+--rows single-row writes on each path under these trigger sets:
+
+    all              the triggers in event_management_system.sql
+    none             every trigger on that table/event dropped
+    without <name>   one trigger dropped
+    + <name>         a duplicate-check trigger that was removed in favour of
+                     the table's key, added back to show what it cost
+
+Triggers are dropped and recreated on the live database, so run this against
+a local copy only; the schema's triggers are restored at the end, and all
+seeded rows are deleted.
+"""
+import argparse
+import datetime
+import re
+import time
+import benchUtils
+from benchUtils import Timer
+from bookingEngine import placeholders
+
+
+# Duplicate checks now enforced by primary/unique keys (mapped to messages in dbErrors.py)
+REMOVED_TRIGGERS = {
+    "prevent_duplicate_ticket_sale": """
+CREATE TRIGGER prevent_duplicate_ticket_sale
+BEFORE INSERT ON purchases
+FOR EACH ROW
+BEGIN
+    DECLARE purchase_count INT;
+    SELECT COUNT(*) INTO purchase_count FROM purchases WHERE ticketID = NEW.ticketID;
+    IF purchase_count > 0 THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Cannot purchase ticket: This ticket has already been sold';
+    END IF;
+END
+""",
+    "prevent_duplicate_artist_performance": """
+CREATE TRIGGER prevent_duplicate_artist_performance
+BEFORE INSERT ON performs
+FOR EACH ROW
+BEGIN
+    DECLARE perf_count INT;
+    SELECT COUNT(*) INTO perf_count FROM performs WHERE artistID = NEW.artistID AND eventID = NEW.eventID;
+    IF perf_count > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Duplicate entry: This artist is already scheduled to perform at this event';
+    END IF;
+END
+""",
+    "prevent_duplicate_staff_assignment": """
+CREATE TRIGGER prevent_duplicate_staff_assignment
+BEFORE INSERT ON works_at
+FOR EACH ROW
+BEGIN
+    DECLARE assignment_count INT;
+    SELECT COUNT(*) INTO assignment_count FROM works_at WHERE staffID = NEW.staffID AND eventID = NEW.eventID;
+    IF assignment_count > 0 THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Duplicate entry: This staff member is already assigned to this event';
+    END IF;
+END
+""",
+    "prevent_duplicate_sponsor": """
+CREATE TRIGGER prevent_duplicate_sponsor
+BEFORE INSERT ON sponsors_event
+FOR EACH ROW
+BEGIN
+    DECLARE sponsor_count INT;
+    SELECT COUNT(*) INTO sponsor_count FROM sponsors_event WHERE sponsorID = NEW.sponsorID AND eventID = NEW.eventID;
+    IF sponsor_count > 0 THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Duplicate entry: This sponsor is already linked to this event';
+    END IF;
+END
+""",
+}
+
+TRIGGER_TARGET = re.compile(r"CREATE\s+TRIGGER\s+\w+\s+(?:BEFORE|AFTER)\s+(INSERT|UPDATE|DELETE)\s+ON\s+(\w+)", re.I)
+
+FIRST_DAY = datetime.date(2100, 1, 1)
+
+
+def trigger_targets(ddl_by_name):
+    """Map trigger name -> (table, event)"""
+    targets = {}
+    for name, ddl in ddl_by_name.items():
+        match = TRIGGER_TARGET.search(ddl)
+        if match:
+            targets[name] = (match.group(2), match.group(1).upper())
+    return targets
+
+
+class Seed:
+    """Synthetic history: `size` events at one venue, each with the rows every write path touches"""
+
+    def __init__(self, conn, size, rows):
+        self.conn = conn
+        self.tag = f"{int(time.time()) % 10 ** 8:08d}"
+        cursor = conn.cursor()
+        try:
+            # Capacity 1: each EAGER event gets exactly one ticket and one attendee place
+            cursor.execute("""INSERT INTO Venue (cost, address, country, pincode, name, type, capacity)
+                              VALUES (0, 'Benchmark', 'India', '000000', 'Trigger Benchmark Venue', 'Hall', 1)""")
+            self.venue_id = cursor.lastrowid
+            cursor.execute("""INSERT INTO Attendee (name, phone_no, email, gender, age)
+                              VALUES ('Trigger Benchmark', %s, %s, 'O', 30)""",
+                           (f"TB{self.tag}", f"trigger.benchmark.{self.tag}@example.com"))
+            self.attendee_id = cursor.lastrowid
+            cursor.execute("""INSERT INTO Artist (name, genre, country, phone_no, email, fee)
+                              VALUES ('Trigger Benchmark', 'Music', 'India', %s, %s, 0)""",
+                           (f"TB{self.tag}", f"trigger.benchmark.{self.tag}@example.com"))
+            self.artist_id = cursor.lastrowid
+            cursor.execute("""INSERT INTO Staff (name, role, phone_no, email, salary)
+                              VALUES ('Trigger Benchmark', 'Volunteer', %s, %s, 0)""",
+                           (f"TB{self.tag}", f"trigger.benchmark.{self.tag}@example.com"))
+            self.staff_id = cursor.lastrowid
+            cursor.execute("""INSERT INTO Sponsor (name, industry, contact_person, phone_no, email)
+                              VALUES ('Trigger Benchmark', 'Benchmark', 'Benchmark', %s, %s)""",
+                           (f"TB{self.tag}", f"trigger.benchmark.{self.tag}@example.com"))
+            self.sponsor_id = cursor.lastrowid
+
+            event_ids = self.create_events(cursor, 0, size + rows)
+            self.history, self.measured = event_ids[:size], event_ids[size:]
+            cursor.execute("""SELECT eventID, ticketID FROM Ticket
+                              WHERE eventID IN (SELECT eventID FROM Events WHERE venueID = %s)""",
+                           (self.venue_id,))
+            self.ticket_of = dict(cursor.fetchall())
+
+            for event_id in self.history:
+                self.insert_links(cursor, event_id)
+            conn.commit()
+        finally:
+            cursor.close()
+        self.next_day = size + rows
+
+    def create_events(self, cursor, first, count):
+        ids = []
+        for i in range(first, first + count):
+            cursor.execute("""INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID)
+                              VALUES ('Trigger Benchmark', %s, 'Planned', '10:00:00', '12:00:00', 1, %s)""",
+                           (FIRST_DAY + datetime.timedelta(days=i), self.venue_id))
+            ids.append(cursor.lastrowid)
+        return ids
+
+    def insert_links(self, cursor, event_id):
+        cursor.execute("INSERT INTO purchases (attendeeID, ticketID) VALUES (%s, %s)",
+                       (self.attendee_id, self.ticket_of[event_id]))
+        cursor.execute("INSERT INTO attends (attendeeID, eventID) VALUES (%s, %s)", (self.attendee_id, event_id))
+        cursor.execute("INSERT INTO performs (artistID, eventID, noOfSongs) VALUES (%s, %s, 1)",
+                       (self.artist_id, event_id))
+        cursor.execute("INSERT INTO works_at (staffID, eventID, shift) VALUES (%s, %s, 'FULL_DAY')",
+                       (self.staff_id, event_id))
+        cursor.execute("INSERT INTO sponsors_event (sponsorID, eventID, amount) VALUES (%s, %s, 0)",
+                       (self.sponsor_id, event_id))
+
+    def delete(self):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("DELETE FROM Venue WHERE venueID = %s", (self.venue_id,))
+            cursor.execute("DELETE FROM Attendee WHERE attendeeID = %s", (self.attendee_id,))
+            cursor.execute("DELETE FROM Artist WHERE artistID = %s", (self.artist_id,))
+            cursor.execute("DELETE FROM Staff WHERE staffID = %s", (self.staff_id,))
+            cursor.execute("DELETE FROM Sponsor WHERE sponsorID = %s", (self.sponsor_id,))
+            self.conn.commit()
+        finally:
+            cursor.close()
+
+
+def timed(cursor, statements):
+    """Execute (sql, params) pairs one at a time; returns the latency of each"""
+    latencies = []
+    for sql, params in statements:
+        with Timer() as t:
+            cursor.execute(sql, params)
+        latencies.append(t.elapsed)
+    return latencies
+
+
+def events_insert(cursor, seed):
+    day = seed.next_day
+    seed.next_day += len(seed.measured)
+    latencies = timed(cursor, [(
+        """INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID)
+           VALUES ('Trigger Benchmark', %s, 'Planned', '10:00:00', '12:00:00', 1, %s)""",
+        (FIRST_DAY + datetime.timedelta(days=day + i), seed.venue_id)) for i in range(len(seed.measured))])
+    cursor.execute("DELETE FROM Events WHERE venueID = %s AND date >= %s",
+                   (seed.venue_id, FIRST_DAY + datetime.timedelta(days=day)))
+    return latencies
+
+
+def events_update(cursor, seed):
+    latencies = timed(cursor, [("UPDATE Events SET start_time = '09:00:00' WHERE eventID = %s", (event_id,))
+                               for event_id in seed.measured])
+    cursor.execute(f"UPDATE Events SET start_time = '10:00:00' WHERE eventID IN ({placeholders(seed.measured)})",
+                   tuple(seed.measured))
+    return latencies
+
+
+def purchases_insert(cursor, seed):
+    latencies = timed(cursor, [("INSERT INTO purchases (attendeeID, ticketID) VALUES (%s, %s)",
+                                (seed.attendee_id, seed.ticket_of[event_id])) for event_id in seed.measured])
+    tickets = [seed.ticket_of[event_id] for event_id in seed.measured]
+    cursor.execute(f"DELETE FROM purchases WHERE ticketID IN ({placeholders(tickets)})", tuple(tickets))
+    cursor.execute(f"UPDATE Ticket SET status = 'AVAILABLE' WHERE ticketID IN ({placeholders(tickets)})",
+                   tuple(tickets))
+    return latencies
+
+
+def attends_insert(cursor, seed):
+    latencies = timed(cursor, [("INSERT INTO attends (attendeeID, eventID) VALUES (%s, %s)",
+                                (seed.attendee_id, event_id)) for event_id in seed.measured])
+    # Delete without the counter trigger (the trigger set under test may not have
+    # incremented it) and reset the measured events' counters directly
+    cursor.execute("SET @skip_inventory_triggers = 1")
+    cursor.execute(f"DELETE FROM attends WHERE attendeeID = %s AND eventID IN ({placeholders(seed.measured)})",
+                   (seed.attendee_id, *seed.measured))
+    cursor.execute("SET @skip_inventory_triggers = NULL")
+    cursor.execute(f"UPDATE Events SET attendee_count = 0 WHERE eventID IN ({placeholders(seed.measured)})",
+                   tuple(seed.measured))
+    return latencies
+
+
+def link_insert(table, column, attribute, columns="", values=""):
+    """Write path inserting (entity, event, ...) rows into a link table"""
+    def run(cursor, seed):
+        entity_id = getattr(seed, attribute)
+        latencies = timed(cursor, [(f"INSERT INTO {table} ({column}, eventID{columns}) VALUES (%s, %s{values})",
+                                    (entity_id, event_id)) for event_id in seed.measured])
+        cursor.execute(f"DELETE FROM {table} WHERE {column} = %s AND eventID IN ({placeholders(seed.measured)})",
+                       (entity_id, *seed.measured))
+        return latencies
+    return run
+
+
+# path name -> (table, trigger event, runner)
+PATHS = {
+    "events_insert": ("Events", "INSERT", events_insert),
+    "events_update": ("Events", "UPDATE", events_update),
+    "purchases": ("purchases", "INSERT", purchases_insert),
+    "attends": ("attends", "INSERT", attends_insert),
+    "performs": ("performs", "INSERT", link_insert("performs", "artistID", "artist_id", ", noOfSongs", ", 1")),
+    "works_at": ("works_at", "INSERT", link_insert("works_at", "staffID", "staff_id", ", shift", ", 'FULL_DAY'")),
+    "sponsors_event": ("sponsors_event", "INSERT",
+                       link_insert("sponsors_event", "sponsorID", "sponsor_id", ", amount", ", 0")),
+}
+
+
+def install(cursor, names, candidates, ddl_by_name):
+    """Make exactly `names` (out of `candidates`) the triggers present"""
+    for name in candidates:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for name in names:
+        cursor.execute(ddl_by_name[name])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--sizes", default="1000,10000", help="history sizes (events) to seed")
+    parser.add_argument("--rows", type=int, default=500, help="timed writes per path and trigger set")
+    parser.add_argument("--paths", default=",".join(PATHS))
+    args = parser.parse_args()
+
+    schema = {name: ddl for name, ddl in benchUtils.schema_objects().items() if TRIGGER_TARGET.search(ddl)}
+    ddl_by_name = dict(schema, **REMOVED_TRIGGERS)
+    targets = trigger_targets(ddl_by_name)
+
+    conn = benchUtils.connect(args)
+    cursor = conn.cursor()
+    rows = []
+    try:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            seed = Seed(conn, size, args.rows)
+            try:
+                for path in args.paths.split(","):
+                    table, event, runner = PATHS[path]
+                    current = [n for n in schema if targets[n] == (table, event)]
+                    removed = [n for n in REMOVED_TRIGGERS if targets[n] == (table, event)]
+                    trigger_sets = [("all", current), ("none", [])]
+                    trigger_sets += [(f"without {n}", [c for c in current if c != n]) for n in current]
+                    trigger_sets += [(f"+ {n}", current + [n]) for n in removed]
+
+                    for label, names in trigger_sets:
+                        install(cursor, names, current + removed, ddl_by_name)
+                        latencies = sorted(runner(cursor, seed))
+                        conn.commit()
+                        rows.append((path, size, label,
+                                     f"{sum(latencies) / len(latencies) * 1e6:.0f}",
+                                     f"{benchUtils.percentile(latencies, 95) * 1e6:.0f}"))
+                    install(cursor, current, current + removed, ddl_by_name)
+            finally:
+                seed.delete()
+    finally:
+        # Whatever happened, leave the schema's trigger set in place
+        install(cursor, schema, list(ddl_by_name), ddl_by_name)
+        cursor.close()
+
+    benchUtils.print_table(("path", "history", "triggers", "mean us/row", "p95 us/row"), rows)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Event insert latency (venue clash check included) as event history grows.
+
+    python benchmarks/venueClashBenchmark.py --password secret
+    python benchmarks/venueClashBenchmark.py --password secret --events 20000 --venues 100 --compare-legacy
+
+Inserts --events events spread over --venues venues (four non-overlapping
+slots per venue per day) and reports insert latency per tenth of the run.
+With the indexed clash check the later buckets should be as fast as the first.
+
+--compare-legacy repeats the run with the old three-way OR clash trigger and
+only the foreign key index on venueID, then restores both from
+event_management_system.sql. Everything created here is deleted afterwards.
+Events are created LAZY so ticket generation does not dominate the timing.
+"""
+import argparse
+import datetime
+import benchUtils
+from benchUtils import Timer
+
+
+SLOTS = (("08:00:00", "10:00:00"), ("11:00:00", "13:00:00"), ("14:00:00", "16:00:00"), ("17:00:00", "19:00:00"))
+
+LEGACY_TRIGGER = """
+CREATE TRIGGER prevent_venue_time_clash
+BEFORE INSERT ON Events
+FOR EACH ROW
+BEGIN
+    DECLARE clash_count INT;
+
+    SELECT COUNT(*) INTO clash_count
+    FROM Events
+    WHERE venueID = NEW.venueID
+    AND date = NEW.date
+    AND status != 'Cancelled'
+    AND (
+        (NEW.start_time >= start_time AND NEW.start_time < end_time)
+        OR
+        (NEW.end_time > start_time AND NEW.end_time <= end_time)
+        OR
+        (NEW.start_time <= start_time AND NEW.end_time >= end_time)
+    );
+
+    IF clash_count > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Venue time clash: This venue is already booked for an overlapping time slot on this date';
+    END IF;
+END
+"""
+
+
+def create_venues(conn, count):
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""INSERT INTO Venue (cost, address, country, pincode, name, type, capacity)
+                              VALUES (0, 'Benchmark', 'India', '000000', %s, 'Hall', 10)""",
+                           [(f"Clash Benchmark Venue {i}",) for i in range(count)])
+        conn.commit()
+        cursor.execute("SELECT venueID FROM Venue WHERE name LIKE 'Clash Benchmark Venue %' ORDER BY venueID")
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def delete_venues(conn, venue_ids):
+    cursor = conn.cursor()
+    try:
+        for i in range(0, len(venue_ids), 50):
+            batch = venue_ids[i:i + 50]
+            cursor.execute(f"DELETE FROM Venue WHERE venueID IN ({', '.join(['%s'] * len(batch))})", tuple(batch))
+            conn.commit()
+    finally:
+        cursor.close()
+
+
+def insert_events(conn, venue_ids, events, commit_every):
+    """Insert the events round-robin over the venues; returns per-insert latencies in order"""
+    cursor = conn.cursor()
+    latencies = []
+    first_day = datetime.date(2100, 1, 1)
+    try:
+        for i in range(events):
+            venue_id = venue_ids[i % len(venue_ids)]
+            slot = i // len(venue_ids)
+            day = first_day + datetime.timedelta(days=slot // len(SLOTS))
+            start_time, end_time = SLOTS[slot % len(SLOTS)]
+            with Timer() as t:
+                cursor.execute("""INSERT INTO Events (name, date, status, start_time, end_time, budget,
+                                                      venueID, inventory_mode)
+                                  VALUES ('Clash Benchmark', %s, 'Planned', %s, %s, 1, %s, 'LAZY')""",
+                               (day, start_time, end_time, venue_id))
+            latencies.append(t.elapsed)
+            if (i + 1) % commit_every == 0:
+                conn.commit()
+        conn.commit()
+    finally:
+        cursor.close()
+    return latencies
+
+
+def run(conn, args, label):
+    venue_ids = create_venues(conn, args.venues)
+    try:
+        latencies = insert_events(conn, venue_ids, args.events, args.commit_every)
+    finally:
+        delete_venues(conn, venue_ids)
+
+    rows = []
+    bucket = max(1, len(latencies) // 10)
+    for start in range(0, len(latencies), bucket):
+        window = sorted(latencies[start:start + bucket])
+        rows.append((label, f"{start + 1}-{start + len(window)}",
+                     f"{benchUtils.percentile(window, 50) * 1000:.2f}",
+                     f"{benchUtils.percentile(window, 95) * 1000:.2f}",
+                     f"{window[-1] * 1000:.2f}"))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    benchUtils.add_connection_args(parser)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--venues", type=int, default=500)
+    parser.add_argument("--commit-every", type=int, default=100)
+    parser.add_argument("--compare-legacy", action="store_true")
+    args = parser.parse_args()
+
+    conn = benchUtils.connect(args)
+    rows = run(conn, args, "indexed")
+
+    if args.compare_legacy:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("ALTER TABLE Events ADD KEY idx_legacy_venue (venueID), DROP KEY idx_event_venue_slot")
+            benchUtils.replace_schema_object(cursor, "TRIGGER", "prevent_venue_time_clash", LEGACY_TRIGGER)
+            rows += run(conn, args, "legacy")
+        finally:
+            current = benchUtils.schema_objects()["prevent_venue_time_clash"]
+            benchUtils.replace_schema_object(cursor, "TRIGGER", "prevent_venue_time_clash", current)
+            cursor.execute("ALTER TABLE Events ADD KEY idx_event_venue_slot (venueID, date, start_time), "
+                           "DROP KEY idx_legacy_venue")
+            cursor.close()
+
+    benchUtils.print_table(("clash check", "events", "p50 ms", "p95 ms", "max ms"), rows)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+import mysql.connector
+from mysql.connector import errorcode
+from dbErrors import error_message
+from repository import StatementCache
+
+
+# Errors that mean "another buyer got there first" rather than a failure
+LOST_ERRNOS = (errorcode.ER_DUP_ENTRY, errorcode.ER_SIGNAL_EXCEPTION)
+
+# Errors that are safe to retry from the start of the transaction
+RETRY_ERRNOS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+# Connection lost mid-request: the commit may or may not have happened, so these
+# are only retried (after reconnecting) for requests that carry a request key
+RECONNECT_ERRNOS = (errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_SERVER_LOST, errorcode.CR_SERVER_LOST_EXTENDED)
+
+# How long a seat stays reserved in the cart before the sweeper releases it
+HOLD_SECONDS = 600
+
+
+def placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+class BookingResult:
+    """Outcome of a booking attempt: either the seat was won or it was lost"""
+
+    def __init__(self, won, ticket_ids=(), message="", retries=0, seats=(), replayed=False):
+        self.won = won
+        self.ticket_ids = list(ticket_ids)
+        self.seats = list(seats)
+        self.message = message
+        self.retries = retries
+        self.replayed = replayed
+
+    def __bool__(self):
+        return self.won
+
+    def __repr__(self):
+        state = "won" if self.won else "lost"
+        return f"BookingResult({state}, tickets={self.ticket_ids}, message={self.message!r})"
+
+
+class BookingEngine:
+    """Claims seats and records purchase + attendance in a single transaction
+
+    Seats are identified by their label (e.g. 'VIP-12'). For LAZY events the
+    Ticket row is created by the claim itself; the unique (eventID, seatNo)
+    key makes that race-free in the same way the conditional UPDATE does for
+    existing rows.
+
+    book_seats and checkout accept an optional request_key (e.g. a uuid4 made
+    once per hold and reused until its checkout succeeds). A request whose key
+    already has a committed booking returns that booking again instead of
+    buying more tickets, so it is safe to resend after a timeout or a dropped
+    connection.
+    """
+
+    def __init__(self, pool, max_retries=3):
+        self.pool = pool
+        self.max_retries = max_retries
+        # The fixed-text statements every booking runs are prepared once per connection
+        self.statements = StatementCache(pool)
+
+    def book_seats(self, attendee_id, event_id, seat_nos, request_key=None):
+        """Book seats all-or-nothing; lost if any one of them is already taken"""
+        return self._run(lambda cursor: self._book_seats(cursor, attendee_id, event_id, seat_nos, request_key),
+                         request_key)
+
+    def hold_seats(self, attendee_id, event_id, seat_nos, hold_seconds=HOLD_SECONDS):
+        """Reserve seats for an attendee until checkout or expiry (all-or-nothing)"""
+        return self._run(lambda cursor: self._hold_seats(cursor, attendee_id, event_id, seat_nos, hold_seconds))
+
+    def checkout(self, attendee_id, event_id, ticket_ids, request_key=None):
+        """Convert the attendee's unexpired holds into purchases"""
+        return self._run(lambda cursor: self._checkout(cursor, attendee_id, event_id, ticket_ids, request_key),
+                         request_key)
+
+    def release_holds(self, attendee_id, ticket_ids):
+        """Give held tickets back to general sale before they expire"""
+        return self._run(lambda cursor: self._release_holds(cursor, attendee_id, ticket_ids))
+
+    def cancel_tickets(self, attendee_id, ticket_ids):
+        """Cancel some of an attendee's purchased tickets and return the seats to sale"""
+        return self._run(lambda cursor: self._cancel_tickets(cursor, attendee_id, ticket_ids))
+
+    def cancel_event_tickets(self, event_id):
+        """Cancel every purchase, hold and waitlist entry of an event (e.g. when it is cancelled)"""
+        return self._run(lambda cursor: self._cancel_event_tickets(cursor, event_id))
+
+    def _run(self, work, request_key=None):
+        """Run work(cursor) in one transaction on a pooled connection, retrying on deadlock / lock wait timeout"""
+        retries = 0
+        while True:
+            with self.pool.connection() as conn:
+                if conn.in_transaction:
+                    # The caller holds this thread's connection mid-transaction; rolling back
+                    # would discard its writes (reads end their own snapshot, see pool.reading)
+                    raise RuntimeError("A booking cannot run inside an open transaction on the same connection")
+                cursor = conn.cursor(dictionary=True)
+                try:
+                    conn.start_transaction()
+                    result = work(cursor)
+                    if result.won:
+                        conn.commit()
+                    else:
+                        conn.rollback()
+                    result.retries = retries
+                    return result
+                except mysql.connector.Error as e:
+                    if e.errno in RECONNECT_ERRNOS and request_key and retries < self.max_retries:
+                        # If the first attempt did commit, the retry finds its request key and replays it
+                        retries += 1
+                        conn.reconnect(attempts=3, delay=1)
+                        continue
+                    try:
+                        conn.rollback()
+                    except mysql.connector.Error:
+                        # The connection is gone (the server rolled back); report the original error
+                        pass
+                    if e.errno in RETRY_ERRNOS and retries < self.max_retries:
+                        retries += 1
+                        continue
+                    if e.errno in LOST_ERRNOS:
+                        return BookingResult(False, message=error_message(e), retries=retries)
+                    raise
+                finally:
+                    cursor.close()
+
+    def _claim_seats(self, cursor, attendee_id, event_id, seat_nos, hold_seconds):
+        """Flip seats from AVAILABLE to HELD (or to SOLD when hold_seconds is None)
+
+        Returns the claimed ticket IDs, or None if any seat is not available.
+        Seats are claimed in label order so concurrent group claims cannot deadlock.
+        """
+        status = "SOLD" if hold_seconds is None else "HELD"
+        held_by = None if hold_seconds is None else attendee_id
+
+        cursor.execute(f"""
+            SELECT seatNo FROM Ticket
+            WHERE eventID = %s AND seatNo IN ({placeholders(seat_nos)})
+        """, (event_id, *seat_nos))
+        existing = [row['seatNo'] for row in cursor.fetchall()]
+        missing = [seat_no for seat_no in seat_nos if seat_no not in existing]
+
+        # Conditional claim: only one transaction can flip a row away from AVAILABLE
+        if existing:
+            cursor.execute(f"""
+                UPDATE Ticket
+                SET status = %s, held_by = %s, hold_expires_at = NOW() + INTERVAL %s SECOND
+                WHERE eventID = %s AND seatNo IN ({placeholders(existing)}) AND status = 'AVAILABLE'
+                ORDER BY seatNo
+            """, (status, held_by, hold_seconds, event_id, *existing))
+            if cursor.rowcount != len(existing):
+                return None
+
+        # LAZY seats without a Ticket row yet: materialize them from the seat ranges.
+        # A concurrent claim of the same seat fails on unique_seat_per_event.
+        if missing:
+            seats_sql = " UNION ALL ".join(["SELECT %s AS seatNo"] * len(missing))
+            cursor.execute(f"""
+                INSERT INTO Ticket (price, status, type, seatNo, eventID, held_by, hold_expires_at)
+                SELECT sr.price, %s, sr.type, s.seatNo, sr.eventID, %s, NOW() + INTERVAL %s SECOND
+                FROM ({seats_sql}) s
+                JOIN seat_range sr
+                  ON sr.type = SUBSTRING_INDEX(s.seatNo, '-', 1)
+                 AND CAST(SUBSTRING_INDEX(s.seatNo, '-', -1) AS UNSIGNED) BETWEEN sr.first_seat AND sr.last_seat
+                JOIN Events e ON e.eventID = sr.eventID AND e.inventory_mode = 'LAZY'
+                WHERE sr.eventID = %s
+                ORDER BY s.seatNo
+            """, (status, held_by, hold_seconds, *missing, event_id))
+            if cursor.rowcount != len(missing):
+                return None
+
+        cursor.execute(f"""
+            SELECT ticketID FROM Ticket
+            WHERE eventID = %s AND seatNo IN ({placeholders(seat_nos)})
+            ORDER BY ticketID
+        """, (event_id, *seat_nos))
+        return [row['ticketID'] for row in cursor.fetchall()]
+
+    def _on_sale(self, cursor, event_id, lock="FOR SHARE"):
+        """True if the event is still Planned
+
+        Called after the seats are claimed, just before the booking is
+        recorded: the locking read makes a concurrent status change wait for
+        this booking (whose tickets a later cancellation then resets) or this
+        booking see the committed status, and the event row is only locked
+        for the last step of the transaction. Bookings pass FOR UPDATE: they
+        take the row for the attendee counter next anyway, and two shared
+        locks upgraded at once would deadlock. Claiming first keeps every
+        path locking Ticket rows before the Events row.
+        """
+        cursor.execute(f"SELECT status FROM Events WHERE eventID = %s {lock}", (event_id,))
+        event = cursor.fetchone()
+        return event is not None and event['status'] == 'Planned'
+
+    def _start_request(self, cursor, request_key, attendee_id, event_id):
+        """Register a request key; returns the earlier booking if the key was already used
+
+        The key's primary key row is inserted first, so a concurrent resend of the
+        same request waits here until the first one commits or rolls back.
+        """
+        if request_key is None:
+            return None
+        try:
+            cursor.execute("INSERT INTO booking_request (request_key, attendeeID, eventID) VALUES (%s, %s, %s)",
+                           (request_key, attendee_id, event_id))
+            return None
+        except mysql.connector.Error as e:
+            if e.errno != errorcode.ER_DUP_ENTRY:
+                raise
+
+        # Locking reads see the committed booking even inside this transaction's snapshot
+        cursor.execute("SELECT attendeeID, eventID FROM booking_request WHERE request_key = %s FOR SHARE",
+                       (request_key,))
+        request = cursor.fetchone()
+        if request['attendeeID'] != attendee_id or request['eventID'] != event_id:
+            return BookingResult(False, message="This booking request has already been used for another booking")
+        cursor.execute("""
+            SELECT p.ticketID, t.seatNo
+            FROM purchases p
+            JOIN Ticket t ON t.ticketID = p.ticketID
+            WHERE p.request_key = %s
+            ORDER BY p.ticketID
+            FOR SHARE
+        """, (request_key,))
+        rows = cursor.fetchall()
+        if not rows:
+            return BookingResult(False, message="The tickets booked by this request have since been cancelled")
+        return BookingResult(True, ticket_ids=[row['ticketID'] for row in rows],
+                             seats=[row['seatNo'] for row in rows], replayed=True,
+                             message=f"{len(rows)} tickets were already booked by this request")
+
+    def _book_seats(self, cursor, attendee_id, event_id, seat_nos, request_key):
+        if not seat_nos:
+            return BookingResult(False, message="No seats selected")
+        earlier = self._start_request(cursor, request_key, attendee_id, event_id)
+        if earlier is not None:
+            return earlier
+
+        seat_nos = sorted(set(seat_nos))
+        ticket_ids = self._claim_seats(cursor, attendee_id, event_id, seat_nos, None)
+        if ticket_ids is None:
+            return BookingResult(False, message="One or more of the selected seats has already been sold")
+        if not self._on_sale(cursor, event_id, "FOR UPDATE"):
+            return BookingResult(False, message="This event is no longer on sale")
+
+        self._record_purchases(cursor, attendee_id, event_id, ticket_ids, request_key)
+        return BookingResult(True, ticket_ids=ticket_ids, seats=seat_nos,
+                             message=f"{len(ticket_ids)} tickets booked successfully")
+
+    def _hold_seats(self, cursor, attendee_id, event_id, seat_nos, hold_seconds):
+        if not seat_nos:
+            return BookingResult(False, message="No seats selected")
+        seat_nos = sorted(set(seat_nos))
+        ticket_ids = self._claim_seats(cursor, attendee_id, event_id, seat_nos, hold_seconds)
+        if ticket_ids is None:
+            return BookingResult(False, message="One or more of the selected seats is no longer available")
+        if not self._on_sale(cursor, event_id):
+            return BookingResult(False, message="This event is no longer on sale")
+        return BookingResult(True, ticket_ids=ticket_ids, seats=seat_nos,
+                             message=f"{len(ticket_ids)} tickets held for {hold_seconds // 60} minutes")
+
+    def _checkout(self, cursor, attendee_id, event_id, ticket_ids, request_key):
+        if not ticket_ids:
+            return BookingResult(False, message="No tickets to book")
+        earlier = self._start_request(cursor, request_key, attendee_id, event_id)
+        if earlier is not None:
+            return earlier
+
+        ticket_ids = sorted(set(ticket_ids))
+        cursor.execute(f"""
+            UPDATE Ticket
+            SET status = 'SOLD', held_by = NULL, hold_expires_at = NULL
+            WHERE ticketID IN ({placeholders(ticket_ids)}) AND eventID = %s
+              AND status = 'HELD' AND held_by = %s AND hold_expires_at > NOW()
+            ORDER BY ticketID
+        """, (*ticket_ids, event_id, attendee_id))
+        if cursor.rowcount != len(ticket_ids):
+            return BookingResult(False, message="Your hold has expired; please select the tickets again")
+        if not self._on_sale(cursor, event_id, "FOR UPDATE"):
+            return BookingResult(False, message="This event is no longer on sale")
+
+        self._record_purchases(cursor, attendee_id, event_id, ticket_ids, request_key)
+        return BookingResult(True, ticket_ids=ticket_ids, message=f"{len(ticket_ids)} tickets booked successfully")
+
+    def _release_holds(self, cursor, attendee_id, ticket_ids):
+        if not ticket_ids:
+            return BookingResult(False, message="No holds to release")
+        cursor.execute(f"""
+            UPDATE Ticket
+            SET status = 'AVAILABLE', held_by = NULL, hold_expires_at = NULL
+            WHERE ticketID IN ({placeholders(ticket_ids)}) AND status = 'HELD' AND held_by = %s
+        """, (*ticket_ids, attendee_id))
+        return BookingResult(True, ticket_ids=ticket_ids, message=f"{cursor.rowcount} holds released")
+
+    def _cancel_tickets(self, cursor, attendee_id, ticket_ids):
+        if not ticket_ids:
+            return BookingResult(False, message="No tickets to cancel")
+        ticket_ids = sorted(set(ticket_ids))
+        cursor.execute(f"""
+            SELECT t.ticketID, t.eventID, t.seatNo
+            FROM purchases p
+            JOIN Ticket t ON t.ticketID = p.ticketID
+            JOIN Events e ON e.eventID = t.eventID
+            WHERE p.attendeeID = %s AND p.ticketID IN ({placeholders(ticket_ids)}) AND e.status = 'Planned'
+            ORDER BY t.ticketID
+            FOR UPDATE
+        """, (attendee_id, *ticket_ids))
+        rows = cursor.fetchall()
+        if len(rows) != len(ticket_ids):
+            return BookingResult(False, message="Only your own tickets for upcoming events can be cancelled")
+
+        cursor.execute(f"DELETE FROM purchases WHERE attendeeID = %s AND ticketID IN ({placeholders(ticket_ids)})",
+                       (attendee_id, *ticket_ids))
+        cursor.execute(f"""
+            UPDATE Ticket
+            SET status = 'AVAILABLE', held_by = NULL, hold_expires_at = NULL
+            WHERE ticketID IN ({placeholders(ticket_ids)})
+            ORDER BY ticketID
+        """, tuple(ticket_ids))
+
+        # No longer attending the events they have no tickets left for
+        event_ids = sorted({row['eventID'] for row in rows})
+        cursor.execute(f"""
+            DELETE a FROM attends a
+            WHERE a.attendeeID = %s AND a.eventID IN ({placeholders(event_ids)})
+              AND NOT EXISTS (
+                  SELECT 1 FROM purchases p
+                  JOIN Ticket t ON t.ticketID = p.ticketID
+                  WHERE p.attendeeID = a.attendeeID AND t.eventID = a.eventID
+              )
+        """, (attendee_id, *event_ids))
+        return BookingResult(True, ticket_ids=ticket_ids, seats=[row['seatNo'] for row in rows],
+                             message=f"{len(ticket_ids)} tickets cancelled")
+
+    def _cancel_event_tickets(self, cursor, event_id):
+        """Set-based: a handful of statements however many tickets were sold
+
+        The per-row inventory triggers are switched off for this session while
+        the tickets are reset, and the event's counters are recomputed once.
+        """
+        cursor.execute("SET @skip_inventory_triggers = 1")
+        try:
+            cursor.execute("""
+                DELETE a FROM attends a
+                JOIN (
+                    SELECT DISTINCT p.attendeeID
+                    FROM purchases p
+                    JOIN Ticket t ON t.ticketID = p.ticketID
+                    WHERE t.eventID = %s
+                ) buyers ON buyers.attendeeID = a.attendeeID
+                WHERE a.eventID = %s
+            """, (event_id, event_id))
+            cursor.execute("""
+                DELETE p FROM purchases p
+                JOIN Ticket t ON t.ticketID = p.ticketID
+                WHERE t.eventID = %s
+            """, (event_id,))
+            cancelled = cursor.rowcount
+            cursor.execute("""
+                UPDATE Ticket
+                SET status = 'AVAILABLE', held_by = NULL, hold_expires_at = NULL
+                WHERE eventID = %s AND status != 'AVAILABLE'
+            """, (event_id,))
+            cursor.execute("""
+                UPDATE waitlist SET status = 'CANCELLED'
+                WHERE eventID = %s AND status IN ('WAITING', 'OFFERED')
+            """, (event_id,))
+            cursor.callproc("Refresh_Event_Inventory", (event_id,))
+        finally:
+            try:
+                cursor.execute("SET @skip_inventory_triggers = NULL")
+            except mysql.connector.Error:
+                # The connection is gone (and the variable with it); report the original error.
+                # A live connection the operation failed on is reset by the pool on check-in.
+                pass
+        return BookingResult(True, message=f"{cancelled} tickets cancelled")
+
+    def _record_purchases(self, cursor, attendee_id, event_id, ticket_ids, request_key=None):
+        # One multi-row insert, prepared once per group size
+        rows_sql = ", ".join(["(%s, %s, %s)"] * len(ticket_ids))
+        self.statements.execute(f"INSERT INTO purchases (attendeeID, ticketID, request_key) VALUES {rows_sql}",
+                                [value for ticket_id in ticket_ids for value in (attendee_id, ticket_id, request_key)])
+        self._ensure_attending(cursor, attendee_id, event_id)
+
+    def _ensure_attending(self, cursor, attendee_id, event_id):
+        """Add the attendee to attends unless they are already registered for the event"""
+        if self.statements.fetch_one("SELECT 1 AS attending FROM attends WHERE attendeeID = %s AND eventID = %s",
+                                     (attendee_id, event_id)) is None:
+            self.statements.execute("INSERT INTO attends (attendeeID, eventID) VALUES (%s, %s)",
+                                    (attendee_id, event_id))
@@ -0,0 +1,168 @@
+import threading
+import time
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+# Session variables the schema's triggers and procedures read; an operation that
+# failed half-way may have left them set on its connection
+SESSION_VARIABLES = ("@skip_inventory_triggers", "@reopen_event_id")
+
+
+class ConnectionPool:
+    """Hands out MySQL connections, one per operation, up to `size` at a time
+
+    Unlike mysql.connector.pooling, a checkout waits (up to `timeout` seconds)
+    for a connection to come back instead of failing as soon as all are in
+    use. A connection that sat idle for more than `check_after` seconds is
+    pinged, and reconnected if the server dropped it, before it is handed out.
+
+    Checkouts are reentrant per thread: code that already holds a connection
+    (e.g. a background worker calling the booking engine) gets the same one
+    back, so nested operations share its session and never wait on
+    themselves.
+    """
+
+    def __init__(self, connect_args, size=5, timeout=30, check_after=30):
+        self.connect_args = connect_args
+        self.size = size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.idle = []  # (connection, returned at)
+        self.opened = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.local = threading.local()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.reconnects = 0
+        self.discarded = 0
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the length of the with block"""
+        held = getattr(self.local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._checkout()
+        self.local.conn = conn
+        broken = failed = False
+        try:
+            yield conn
+        except mysql.connector.Error:
+            broken = not conn.is_connected()
+            failed = True
+            raise
+        finally:
+            self.local.conn = None
+            self._checkin(conn, broken, failed)
+
+    @contextmanager
+    def reading(self):
+        """connection() for reads: ends the read snapshot they open
+
+        Reads nested on a connection the thread already holds would otherwise
+        leave a transaction open for the next operation on it. A read inside
+        the caller's own transaction is left alone.
+        """
+        with self.connection() as conn:
+            opened = not conn.in_transaction
+            yield conn
+            if opened and conn.in_transaction:
+                conn.rollback()
+
+    def _checkout(self):
+        started = time.perf_counter()
+        waited = False
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise PoolError("The connection pool is closed")
+                if self.idle:
+                    conn, returned_at = self.idle.pop()
+                    break
+                if self.opened < self.size:
+                    # Reserve the slot; the connection is opened outside the lock
+                    self.opened += 1
+                    conn, returned_at = None, None
+                    break
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    raise PoolError(f"No free database connection after {self.timeout} s (pool size {self.size})")
+                waited = True
+                self.condition.wait(remaining)
+            wait = time.perf_counter() - started
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+        try:
+            if conn is None:
+                conn = mysql.connector.connect(**self.connect_args)
+            elif time.monotonic() - returned_at > self.check_after and not conn.is_connected():
+                self.reconnects += 1
+                conn.reconnect(attempts=3, delay=1)
+        except mysql.connector.Error:
+            self._release_slot()
+            raise
+        return conn
+
+    def _checkin(self, conn, broken=False, failed=False):
+        if not broken:
+            try:
+                if conn.in_transaction:
+                    # End the read snapshot (or abandoned transaction) of the operation
+                    conn.rollback()
+                if failed:
+                    # Don't hand the next operation a session with the triggers switched off
+                    cursor = conn.cursor()
+                    try:
+                        cursor.execute("SET " + ", ".join(f"{name} = NULL" for name in SESSION_VARIABLES))
+                    finally:
+                        cursor.close()
+            except mysql.connector.Error:
+                broken = True
+        if broken or self.closed:
+            if broken:
+                self.discarded += 1
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+            self._release_slot()
+            return
+        with self.condition:
+            self.idle.append((conn, time.monotonic()))
+            self.condition.notify()
+
+    def _release_slot(self):
+        with self.condition:
+            self.opened -= 1
+            self.condition.notify()
+
+    def close(self):
+        """Close the idle connections; ones still checked out are closed when returned"""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.opened -= len(idle)
+            self.condition.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except mysql.connector.Error:
+                pass
+
+    def stats(self):
+        average = self.wait_total * 1000 / self.checkouts if self.checkouts else 0
+        in_use = self.opened - len(self.idle)
+        return (f"pool {in_use}/{self.opened} in use (size {self.size}), {self.checkouts} checkouts, "
+                f"{self.waits} waited, wait avg {average:.1f} ms / max {self.wait_max * 1000:.0f} ms, "
+                f"{self.reconnects} reconnects, {self.discarded} dropped")
@@ -1,7 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import mysql.connector
+import uuid
 from datetime import datetime
+from bookingEngine import BookingEngine
+from connectionPool import ConnectionPool
+from dbErrors import error_message
+from seatAllocator import SeatAllocator, TICKET_TYPES
+from holdSweeper import HoldSweeper
+from pagedTree import PagedTree
+from waitlist import Waitlist, WaitlistPromoter
+from repository import Repository
+from taskRunner import TaskRunner
 
 class CustomerPortal:
     def __init__(self, root):
@@ -19,9 +28,14 @@ class CustomerPortal:
         
         self.root.configure(bg=self.bg_color)
         
-        # Database connection
-        self.conn = None
-        self.cursor = None
+        # Database connections, checked out per operation
+        self.pool = None
+        self.repo = None
+        self.booking_engine = None
+        self.seat_allocator = None
+        self.hold_sweeper = None
+        self.waitlist = None
+        self.waitlist_promoter = None
         self.current_user_id = None
         self.current_user_type = None
         self.current_user_name = None
@@ -33,6 +47,9 @@ class CustomerPortal:
         self.setup_connection_frame()
         self.setup_main_menu()
         
+        # Database calls of the browse windows run on worker threads
+        self.tasks = TaskRunner(self.root)
+        
     def setup_styles(self):
         """Configure ttk styles with colors"""
         style = ttk.Style()
@@ -96,13 +113,38 @@ class CustomerPortal:
     def connect_db(self):
         """Connect to MySQL database"""
         try:
-            self.conn = mysql.connector.connect(
-                host=self.host_entry.get(),
-                user=self.user_entry.get(),
-                password=self.pass_entry.get(),
-                database=self.db_entry.get()
-            )
-            self.cursor = self.conn.cursor(dictionary=True)
+            connect_args = {
+                "host": self.host_entry.get(),
+                "user": self.user_entry.get(),
+                "password": self.pass_entry.get(),
+                "database": self.db_entry.get()
+            }
+            pool = ConnectionPool(connect_args)
+            with pool.connection():
+                # Open the first connection now so bad credentials fail here
+                pass
+            if self.pool:
+                self.pool.close()
+            self.pool = pool
+            self.repo = Repository(self.pool)
+            self.booking_engine = BookingEngine(self.pool)
+            self.seat_allocator = SeatAllocator(self.pool, self.booking_engine)
+            self.waitlist = Waitlist(self.pool, self.booking_engine)
+            # Rebuild the free-seat map of every upcoming event from Ticket in the
+            # background; an event booked before it is ready loads its own map
+            self.tasks.submit("seat_map", self.seat_allocator.rebuild, lambda _: None,
+                              "Failed to load the free-seat map", "Loading seat map")
+            
+            # Release abandoned carts and promote waitlisted attendees in the
+            # background, each checking out its own connection per tick
+            if self.hold_sweeper:
+                self.hold_sweeper.stop()
+            self.hold_sweeper = HoldSweeper(self.pool, on_release=self.seat_allocator.release)
+            self.hold_sweeper.start()
+            if self.waitlist_promoter:
+                self.waitlist_promoter.stop()
+            self.waitlist_promoter = WaitlistPromoter(self.pool)
+            self.waitlist_promoter.start()
             self.status_label.config(text="Connected ✓", foreground=self.secondary_color)
             messagebox.showinfo("Success", "Connected to database successfully!")
         except Exception as e:
@@ -173,6 +215,31 @@ class CustomerPortal:
                   pady=10)
         browse_btn.pack(pady=10)
         
+        my_tickets_btn = tk.Button(browse_frame, text="My Tickets", 
+                  command=self.show_my_tickets,
+                  width=40,
+                  bg=self.secondary_color,
+                  fg=self.light_color,
+                  font=("Arial", 12, "bold"),
+                  relief="flat",
+                  cursor="hand2",
+                  activebackground="#3db864",
+                  activeforeground=self.light_color,
+                  pady=10)
+        my_tickets_btn.pack(pady=10)
+        
+        waitlist_btn = tk.Button(browse_frame, text="My Waitlist", 
+                  command=self.show_my_waitlist,
+                  width=40,
+                  bg=self.dark_color,
+                  fg=self.light_color,
+                  font=("Arial", 12, "bold"),
+                  relief="flat",
+                  cursor="hand2",
+                  activeforeground=self.light_color,
+                  pady=10)
+        waitlist_btn.pack(pady=10)
+        
         # Logout button (initially hidden)
         self.logout_btn = tk.Button(self.main_frame, text="Logout", 
                                     command=self.logout,
@@ -187,7 +254,7 @@ class CustomerPortal:
         
     def show_attendee_registration(self):
         """Show attendee registration form"""
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         
@@ -224,8 +291,6 @@ class CustomerPortal:
         
         def register_attendee():
             try:
-                query = """INSERT INTO Attendee (name, phone_no, email, gender, age)
-                          VALUES (%s, %s, %s, %s, %s)"""
                 values = (
                     entries['name'].get(),
                     entries['phone'].get(),
@@ -233,11 +298,7 @@ class CustomerPortal:
                     entries['gender'].get() if entries['gender'].get() else None,
                     int(entries['age'].get()) if entries['age'].get() else None
                 )
-                self.cursor.execute(query, values)
-                self.conn.commit()
-                
-                # Get the new attendee ID
-                self.current_user_id = self.cursor.lastrowid
+                self.current_user_id = self.repo.attendees.register(values)
                 self.current_user_type = "Attendee"
                 self.current_user_name = entries['name'].get()
                 
@@ -264,7 +325,7 @@ class CustomerPortal:
     
     def show_events_browser(self):
         """Show events browser and booking interface"""
-        if not self.conn:
+        if not self.pool:
             messagebox.showerror("Error", "Please connect to database first!")
             return
         
@@ -306,17 +367,9 @@ class CustomerPortal:
         scrollbar.pack(side="right", fill="y")
         
         # Load events
-        try:
-            query = """
-                SELECT e.eventID, e.name, e.date, e.start_time, v.name as venue_name, e.status
-                FROM Events e
-                JOIN Venue v ON e.venueID = v.venueID
-                WHERE e.status = 'Planned' AND e.date >= CURDATE()
-                ORDER BY e.date
-            """
-            self.cursor.execute(query)
-            events = self.cursor.fetchall()
-            
+        def show_events(events):
+            if not browser_window.winfo_exists():
+                return
             for event in events:
                 events_tree.insert("", "end", values=(
                     event['eventID'],
@@ -326,8 +379,8 @@ class CustomerPortal:
                     event['venue_name'],
                     event['status']
                 ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load events: {str(e)}")
+        
+        self.tasks.submit("events_on_sale", self.repo.events.on_sale, show_events, "Failed to load events")
         
         # Buttons frame
         btn_frame = ttk.Frame(browser_window)
@@ -375,17 +428,19 @@ class CustomerPortal:
                                              bg=self.light_color, fg=self.dark_color)
         text_area.pack(fill="both", expand=True)
         
-        try:
-            # Get event info
-            query = """
-                SELECT e.*, v.name as venue_name, v.address, v.capacity, v.type as venue_type
-                FROM Events e
-                JOIN Venue v ON e.venueID = v.venueID
-                WHERE e.eventID = %s
-            """
-            self.cursor.execute(query, (event_id,))
-            event = self.cursor.fetchone()
-            
+        text_area.insert(tk.END, "Loading...")
+        
+        def fetch():
+            # Event and venue, performing artists and the per-tier inventory counters
+            return (self.repo.events.details(event_id), self.repo.events.artists(event_id),
+                    self.repo.events.tiers(event_id))
+        
+        def show(details):
+            if not details_window.winfo_exists():
+                # Closed while loading
+                return
+            event, artists, tickets = details
+            text_area.delete(1.0, tk.END)
             text_area.insert(tk.END, f"{'='*60}\n")
             text_area.insert(tk.END, f"{event['name']}\n")
             text_area.insert(tk.END, f"{'='*60}\n\n")
@@ -402,15 +457,6 @@ class CustomerPortal:
             text_area.insert(tk.END, f"  Address: {event['address']}\n")
             text_area.insert(tk.END, f"  Capacity: {event['capacity']}\n\n")
             
-            # Get artists
-            self.cursor.execute("""
-                SELECT a.name, a.genre, p.noOfSongs
-                FROM Artist a
-                JOIN performs p ON a.artistID = p.artistID
-                WHERE p.eventID = %s
-            """, (event_id,))
-            artists = self.cursor.fetchall()
-            
             if artists:
                 text_area.insert(tk.END, f"Performing Artists:\n")
                 for artist in artists:
@@ -418,28 +464,16 @@ class CustomerPortal:
                                    f"  • {artist['name']} ({artist['genre']}) - {artist['noOfSongs']} songs\n")
                 text_area.insert(tk.END, "\n")
             
-            # Get ticket info
-            self.cursor.execute("""
-                SELECT type, COUNT(*) as total, 
-                       SUM(CASE WHEN status = 'AVAILABLE' THEN 1 ELSE 0 END) as available,
-                       MIN(price) as min_price, MAX(price) as max_price
-                FROM Ticket
-                WHERE eventID = %s
-                GROUP BY type
-            """, (event_id,))
-            tickets = self.cursor.fetchall()
-            
             if tickets:
                 text_area.insert(tk.END, f"Ticket Information:\n")
                 for ticket in tickets:
                     text_area.insert(tk.END, 
                                    f"  • {ticket['type']}: {ticket['available']}/{ticket['total']} available "
-                                   f"(₹{ticket['min_price']}-₹{ticket['max_price']})\n")
+                                   f"(₹{ticket['price']})\n")
             
             text_area.config(state='disabled')
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load event details: {str(e)}")
+        
+        self.tasks.submit(("event_details", event_id), fetch, show, "Failed to load event details")
     
     def show_tickets_for_event(self, event_id):
         """Show available tickets for an event"""
@@ -454,90 +488,292 @@ class CustomerPortal:
         tickets_window.configure(bg=self.bg_color)
         
         # Title
-        title_label = tk.Label(tickets_window, text="Select a Ticket to Book", 
+        title_label = tk.Label(tickets_window, text="Select Tickets to Book", 
                               font=("Arial", 16, "bold"),
                               bg=self.bg_color,
                               fg=self.primary_color)
         title_label.pack(pady=10)
         
+        # Best available seats for the whole group, any mix of ticket types
+        best_frame = ttk.LabelFrame(tickets_window, text="Best Available Seats (Group Booking)", padding=10)
+        best_frame.pack(fill="x", padx=20, pady=5)
+        
+        quantity_spins = {}
+        for i, ticket_type in enumerate(TICKET_TYPES):
+            ttk.Label(best_frame, text=f"{ticket_type}:").grid(row=0, column=i * 2, padx=5)
+            quantity_spins[ticket_type] = ttk.Spinbox(best_frame, from_=0, to=10, width=4)
+            quantity_spins[ticket_type].set(1 if ticket_type == "GENERAL" else 0)
+            quantity_spins[ticket_type].grid(row=0, column=i * 2 + 1, padx=5)
+        
+        together_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(best_frame, text="Seats together", variable=together_var).grid(
+            row=1, column=0, columnspan=3, sticky="w", padx=5, pady=(8, 0))
+        
+        def book_best_available():
+            try:
+                quantities = {t: int(spin.get()) for t, spin in quantity_spins.items()}
+                # Hold the seats first so the confirmation dialog cannot race other buyers
+                hold = self.seat_allocator.allocate_group(self.current_user_id, event_id, quantities,
+                                                          together_var.get(), hold=True)
+                if not hold.won:
+                    if messagebox.askyesno("Seats Unavailable", 
+                                          f"{hold.message}.\n\nJoin the waitlist? Seats that free up "
+                                          "are offered to the waitlist in order of joining."):
+                        self.waitlist.join(self.current_user_id, event_id, quantities)
+                        messagebox.showinfo("Waitlist", "You are on the waitlist. Check 'My Waitlist' for offers.")
+                    return
+                if self.confirm_and_checkout(event_id, hold):
+                    tickets_window.destroy()
+            except Exception as e:
+                messagebox.showerror("Error", f"Booking failed: {error_message(e)}")
+        
+        tk.Button(best_frame, text="Book Best Available", command=book_best_available,
+                  bg=self.primary_color, fg=self.light_color,
+                  font=("Arial", 10, "bold"), relief="flat", cursor="hand2").grid(
+            row=1, column=4, columnspan=4, sticky="e", padx=10, pady=(8, 0))
+        
         # Tickets list
         list_frame = ttk.Frame(tickets_window)
         list_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
         columns = ("Ticket ID", "Type", "Seat", "Price", "Status")
-        tickets_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=15)
+        tickets_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=15,
+                                    selectmode="extended")
         
         for col in columns:
             tickets_tree.heading(col, text=col)
             tickets_tree.column(col, width=150)
         
         scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tickets_tree.yview)
-        tickets_tree.configure(yscrollcommand=scrollbar.set)
         
         tickets_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Load tickets
-        try:
-            query = """
-                SELECT ticketID, type, seatNo, price, status
-                FROM Ticket
-                WHERE eventID = %s AND status = 'AVAILABLE'
-                ORDER BY type, seatNo
-            """
-            self.cursor.execute(query, (event_id,))
-            tickets = self.cursor.fetchall()
-            
-            for ticket in tickets:
-                tickets_tree.insert("", "end", values=(
-                    ticket['ticketID'],
-                    ticket['type'],
-                    ticket['seatNo'],
-                    f"₹{ticket['price']}",
-                    ticket['status']
-                ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load tickets: {str(e)}")
+        # Load tickets a page at a time; large venues have thousands of free seats
+        def row_ticket(ticket):
+            return (
+                ticket['ticketID'] or '',
+                ticket['type'],
+                ticket['seatNo'],
+                f"₹{ticket['price']}",
+                ticket['status']
+            )
+        
+        pager = PagedTree(tickets_tree, scrollbar, self.tasks, "tickets",
+                          lambda sort, descending, after: self.repo.tickets.available(event_id, sort, descending, after),
+                          row_ticket, {"Type": "type", "Price": "price"}, "type", key=("tickets", event_id))
+        pager.reload()
         
         # Book button
         def book_ticket():
             selection = tickets_tree.selection()
             if not selection:
-                messagebox.showwarning("Warning", "Please select a ticket!")
+                messagebox.showwarning("Warning", "Please select one or more tickets!")
                 return
             
-            ticket_id = tickets_tree.item(selection[0])['values'][0]
+            seat_nos = [tickets_tree.item(item)['values'][2] for item in selection]
             
-            if messagebox.askyesno("Confirm Booking", 
-                                  "Do you want to book this ticket?"):
-                try:
-                    # Insert into purchases table (trigger will update ticket status)
-                    query = "INSERT INTO purchases (attendeeID, ticketID) VALUES (%s, %s)"
-                    self.cursor.execute(query, (self.current_user_id, ticket_id))
-                    self.conn.commit()
-                    
-                    # Also add to attends table if not already there
-                    try:
-                        query2 = "INSERT INTO attends (attendeeID, eventID) VALUES (%s, %s)"
-                        self.cursor.execute(query2, (self.current_user_id, event_id))
-                        self.conn.commit()
-                    except:
-                        pass  # Already attending
-                    
-                    messagebox.showinfo("Success", 
-                                      "Ticket booked successfully!\n"
-                                      "Confirmation has been recorded in the system.")
+            try:
+                # Hold all selected seats at once so the group is booked together or not at all
+                hold = self.booking_engine.hold_seats(self.current_user_id, event_id, seat_nos)
+                if not hold.won:
+                    messagebox.showwarning("Tickets Unavailable", 
+                                         f"Sorry, these tickets could not be booked:\n{hold.message}")
+                    return
+                self.seat_allocator.mark_taken(event_id, hold.seats)
+                if self.confirm_and_checkout(event_id, hold):
                     tickets_window.destroy()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Booking failed: {str(e)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Booking failed: {error_message(e)}")
         
-        book_btn = tk.Button(tickets_window, text="Book Selected Ticket", 
+        book_btn = tk.Button(tickets_window, text="Book Selected Tickets", 
                   command=book_ticket, width=30,
                   bg=self.secondary_color, fg=self.light_color,
                   font=("Arial", 11, "bold"), relief="flat", cursor="hand2",
                   pady=8)
         book_btn.pack(pady=10)
     
+    def confirm_and_checkout(self, event_id, hold):
+        """Ask the customer to confirm held seats, then check them out or release them"""
+        if not messagebox.askyesno("Confirm Booking", 
+                                  f"Seats held for you: {', '.join(hold.seats)}\n"
+                                  f"{hold.message}.\n\nDo you want to complete the booking?"):
+            self.booking_engine.release_holds(self.current_user_id, hold.ticket_ids)
+            self.seat_allocator.release(event_id, hold.seats)
+            return False
+        
+        # One key per hold, kept for every retry: if an attempt timed out after its
+        # commit, the retry gets the original booking back instead of a second one
+        request_key = uuid.uuid4().hex
+        while True:
+            try:
+                result = self.booking_engine.checkout(self.current_user_id, event_id, hold.ticket_ids,
+                                                      request_key=request_key)
+                break
+            except Exception as e:
+                if not messagebox.askretrycancel("Booking Not Confirmed",
+                                                f"The booking could not be confirmed: {error_message(e)}\n\n"
+                                                "Retry to complete it; a booking that already went through "
+                                                "is not made twice."):
+                    self.booking_engine.release_holds(self.current_user_id, hold.ticket_ids)
+                    self.seat_allocator.release(event_id, hold.seats)
+                    return False
+        if not result.won:
+            messagebox.showwarning("Booking Failed", result.message)
+            return False
+        messagebox.showinfo("Success", 
+                          f"Booked seats: {', '.join(hold.seats)}\n"
+                          "Confirmation has been recorded in the system.")
+        return True
+    
+    def show_my_tickets(self):
+        """Show the attendee's purchased tickets and let them cancel some or all of them"""
+        if not self.current_user_id or self.current_user_type != "Attendee":
+            messagebox.showwarning("Login Required", 
+                                 "Please register/login as an Attendee to see your tickets!")
+            return
+        
+        my_tickets_window = tk.Toplevel(self.root)
+        my_tickets_window.title("My Tickets")
+        my_tickets_window.geometry("800x450")
+        my_tickets_window.configure(bg=self.bg_color)
+        
+        columns = ("Ticket ID", "Event", "Date", "Seat", "Price", "Event Status")
+        my_tickets_tree = ttk.Treeview(my_tickets_window, columns=columns, show="headings", height=12,
+                                       selectmode="extended")
+        for col in columns:
+            my_tickets_tree.heading(col, text=col)
+            my_tickets_tree.column(col, width=120)
+        my_tickets_tree.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        def load_tickets():
+            my_tickets_tree.delete(*my_tickets_tree.get_children())
+            try:
+                for ticket in self.repo.tickets.purchased_by(self.current_user_id):
+                    my_tickets_tree.insert("", "end", values=(
+                        ticket['ticketID'],
+                        ticket['name'],
+                        ticket['date'],
+                        ticket['seatNo'],
+                        f"₹{ticket['price']}",
+                        ticket['status']
+                    ), tags=(ticket['eventID'],))
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load tickets: {str(e)}")
+        
+        def cancel_selected():
+            selection = my_tickets_tree.selection()
+            if not selection:
+                messagebox.showwarning("Warning", "Please select one or more tickets!")
+                return
+            items = [my_tickets_tree.item(item) for item in selection]
+            seats = [item['values'][3] for item in items]
+            if not messagebox.askyesno("Cancel Tickets", f"Cancel these tickets?\n{', '.join(seats)}"):
+                return
+            try:
+                result = self.booking_engine.cancel_tickets(self.current_user_id,
+                                                            [item['values'][0] for item in items])
+                if not result.won:
+                    messagebox.showwarning("Cancellation Failed", result.message)
+                    return
+                for event_id in {int(item['tags'][0]) for item in items}:
+                    self.seat_allocator.release(event_id, [item['values'][3] for item in items
+                                                           if int(item['tags'][0]) == event_id])
+                messagebox.showinfo("Cancelled", result.message)
+                load_tickets()
+            except Exception as e:
+                messagebox.showerror("Error", f"Cancellation failed: {str(e)}")
+        
+        tk.Button(my_tickets_window, text="Cancel Selected Tickets", command=cancel_selected, width=30,
+                  bg=self.accent_color, fg=self.light_color,
+                  font=("Arial", 11, "bold"), relief="flat", cursor="hand2",
+                  pady=8).pack(pady=10)
+        
+        load_tickets()
+    
+    def show_my_waitlist(self):
+        """Show the attendee's waitlist entries and let them book offered seats"""
+        if not self.current_user_id or self.current_user_type != "Attendee":
+            messagebox.showwarning("Login Required", 
+                                 "Please register/login as an Attendee to see your waitlist!")
+            return
+        
+        waitlist_window = tk.Toplevel(self.root)
+        waitlist_window.title("My Waitlist")
+        waitlist_window.geometry("800x400")
+        waitlist_window.configure(bg=self.bg_color)
+        
+        columns = ("ID", "Event", "Type", "Quantity", "Status", "Offer Expires")
+        waitlist_tree = ttk.Treeview(waitlist_window, columns=columns, show="headings", height=10)
+        for col in columns:
+            waitlist_tree.heading(col, text=col)
+            waitlist_tree.column(col, width=120)
+        waitlist_tree.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        def load_entries():
+            waitlist_tree.delete(*waitlist_tree.get_children())
+            try:
+                for entry in self.waitlist.entries(self.current_user_id):
+                    waitlist_tree.insert("", "end", values=(
+                        entry['waitlistID'],
+                        entry['event_name'],
+                        entry['type'],
+                        entry['quantity'],
+                        entry['status'],
+                        entry['offer_expires_at'] or ''
+                    ), tags=(entry['eventID'],))
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load waitlist: {str(e)}")
+        
+        def selected_entry():
+            selection = waitlist_tree.selection()
+            if not selection:
+                messagebox.showwarning("Warning", "Please select a waitlist entry!")
+                return None
+            item = waitlist_tree.item(selection[0])
+            return item['values'][0], int(item['tags'][0]), item['values'][4]
+        
+        def book_offer():
+            entry = selected_entry()
+            if not entry:
+                return
+            waitlist_id, event_id, status = entry
+            if status != "OFFERED":
+                messagebox.showinfo("Waitlist", "No seats have been offered for this entry yet.")
+                return
+            try:
+                offer = self.waitlist.offer(waitlist_id, self.current_user_id)
+                if not offer.won:
+                    messagebox.showwarning("Offer Expired", offer.message)
+                elif self.confirm_and_checkout(event_id, offer):
+                    self.waitlist.mark_fulfilled(waitlist_id)
+                load_entries()
+            except Exception as e:
+                messagebox.showerror("Error", f"Booking failed: {error_message(e)}")
+        
+        def leave_waitlist():
+            entry = selected_entry()
+            if not entry:
+                return
+            if messagebox.askyesno("Leave Waitlist", "Leave the waitlist for this event?"):
+                try:
+                    self.waitlist.leave(entry[0], self.current_user_id)
+                    self.seat_allocator.rebuild(entry[1])
+                    load_entries()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to leave waitlist: {str(e)}")
+        
+        btn_frame = ttk.Frame(waitlist_window)
+        btn_frame.pack(pady=10)
+        for text, command, color in [("Book Offered Seats", book_offer, self.secondary_color),
+                                     ("Leave Waitlist", leave_waitlist, self.accent_color),
+                                     ("Refresh", load_entries, self.primary_color)]:
+            tk.Button(btn_frame, text=text, command=command, width=20,
+                      bg=color, fg=self.light_color, font=("Arial", 10, "bold"),
+                      relief="flat", cursor="hand2").pack(side="left", padx=5)
+        
+        load_entries()
+    
     def update_user_status(self):
         """Update user status label"""
         if self.current_user_id:
@@ -559,9 +795,14 @@ class CustomerPortal:
         messagebox.showinfo("Logged Out", "You have been logged out successfully!")
     
     def __del__(self):
-        if self.conn:
-            self.cursor.close()
-            self.conn.close()
+        self.tasks.close()
+        if self.hold_sweeper:
+            self.hold_sweeper.stop()
+        if self.waitlist_promoter:
+            self.waitlist_promoter.stop()
+        if self.pool:
+            self.repo.close()
+            self.pool.close()
 
 
 if __name__ == "__main__":
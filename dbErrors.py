@@ -0,0 +1,44 @@
+import re
+import mysql.connector
+from mysql.connector import errorcode
+
+
+# Messages for duplicate-key errors, by 'table.key' as MySQL names it in the error.
+# These replace the duplicate-check triggers the keys made redundant.
+DUPLICATE_MESSAGES = {
+    "performs.PRIMARY": "Duplicate entry: This artist is already scheduled to perform at this event",
+    "works_at.PRIMARY": "Duplicate entry: This staff member is already assigned to this event",
+    "sponsors_event.PRIMARY": "Duplicate entry: This sponsor is already linked to this event",
+    "purchases.PRIMARY": "Cannot purchase ticket: This ticket has already been sold",
+    "purchases.unique_ticket_purchase": "Cannot purchase ticket: This ticket has already been sold",
+    "Ticket.unique_seat_per_event": "This seat has already been taken",
+    "attends.PRIMARY": "This attendee is already registered for this event",
+}
+
+# Servers before 8.0.19 name only the key ('PRIMARY'). A bare name that only
+# one table uses keeps its message; one that several share gets this one.
+DUPLICATE_ENTRY_MESSAGE = "Duplicate entry: This record already exists"
+
+
+def bare_key_messages(messages):
+    bare = {}
+    for name, message in messages.items():
+        key = name.split(".")[-1]
+        bare[key] = message if bare.get(key, message) == message else DUPLICATE_ENTRY_MESSAGE
+    return bare
+
+
+BARE_KEY_MESSAGES = bare_key_messages(DUPLICATE_MESSAGES)
+
+DUPLICATE_KEY = re.compile(r"for key '([^']+)'")
+
+
+def error_message(error):
+    """User-facing text for a database error, with duplicate-key errors spelled out"""
+    if isinstance(error, mysql.connector.Error) and error.errno == errorcode.ER_DUP_ENTRY:
+        match = DUPLICATE_KEY.search(error.msg or "")
+        if match and match.group(1) in DUPLICATE_MESSAGES:
+            return DUPLICATE_MESSAGES[match.group(1)]
+        if match and match.group(1) in BARE_KEY_MESSAGES:
+            return BARE_KEY_MESSAGES[match.group(1)]
+    return str(error)
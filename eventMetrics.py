@@ -0,0 +1,130 @@
+from bookingEngine import placeholders
+
+
+# Per-event aggregates, each one grouped pass over its source table for all
+# selected events. {events} is the event filter on the alias e. The cost
+# sources skip closed events, whose figures come from event_settlement.
+SOURCES = {
+    "inv": """
+        LEFT JOIN (
+            SELECT ei.eventID, SUM(ei.total) AS total_tickets, SUM(ei.sold) AS tickets_sold,
+                   SUM(ei.available) AS available_tickets, SUM(ei.revenue) AS revenue
+            FROM event_inventory ei
+            JOIN Events e ON e.eventID = ei.eventID
+            WHERE {events}
+            GROUP BY ei.eventID
+        ) inv ON inv.eventID = e.eventID""",
+    "sp": """
+        LEFT JOIN (
+            SELECT se.eventID, SUM(se.amount) AS sponsorship
+            FROM sponsors_event se
+            JOIN Events e ON e.eventID = se.eventID
+            WHERE {events}
+              AND NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = e.eventID)
+            GROUP BY se.eventID
+        ) sp ON sp.eventID = e.eventID""",
+    "af": """
+        LEFT JOIN (
+            SELECT p.eventID, SUM(ar.fee) AS artist_fees
+            FROM performs p
+            JOIN Artist ar ON ar.artistID = p.artistID
+            JOIN Events e ON e.eventID = p.eventID
+            WHERE {events}
+              AND NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = e.eventID)
+            GROUP BY p.eventID
+        ) af ON af.eventID = e.eventID""",
+    "sc": """
+        LEFT JOIN (
+            SELECT wa.eventID, SUM(s.salary) AS staff_cost
+            FROM works_at wa
+            JOIN Staff s ON s.staffID = wa.staffID
+            JOIN Events e ON e.eventID = wa.eventID
+            WHERE {events}
+              AND NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = e.eventID)
+            GROUP BY wa.eventID
+        ) sc ON sc.eventID = e.eventID""",
+    "r": """
+        LEFT JOIN event_rollup r ON r.eventID = e.eventID""",
+    "st": """
+        LEFT JOIN event_settlement st ON st.eventID = e.eventID""",
+}
+
+# metric -> (SQL expression, sources it reads); e is Events, v is Venue.
+# Money metrics and tickets sold of closed events come from their settlement (st).
+METRICS = {
+    "total_tickets": ("COALESCE(inv.total_tickets, 0)", ("inv",)),
+    "tickets_sold": ("COALESCE(st.tickets_sold, inv.tickets_sold, 0)", ("st", "inv")),
+    "available_tickets": ("COALESCE(inv.available_tickets, 0)", ("inv",)),
+    "revenue": ("COALESCE(st.ticket_revenue, inv.revenue, 0)", ("st", "inv")),
+    "attendees": ("e.attendee_count", ()),
+    "occupancy": ("ROUND(e.attendee_count * 100.0 / v.capacity, 2)", ()),
+    "artist_count": ("COALESCE(r.artist_count, 0)", ("r",)),
+    "staff_count": ("COALESCE(r.staff_count, 0)", ("r",)),
+    "sponsor_count": ("COALESCE(r.sponsor_count, 0)", ("r",)),
+    "sponsorship": ("COALESCE(st.sponsorship_revenue, sp.sponsorship, 0)", ("st", "sp")),
+    "artist_fees": ("COALESCE(st.artist_expenses, af.artist_fees, 0)", ("st", "af")),
+    "staff_cost": ("COALESCE(st.staff_expenses, sc.staff_cost, 0)", ("st", "sc")),
+    "venue_cost": ("COALESCE(st.venue_cost, v.cost)", ("st",)),
+    "net_profit": ("COALESCE(st.net_profit, COALESCE(inv.revenue, 0) + COALESCE(sp.sponsorship, 0)"
+                   " - v.cost - COALESCE(af.artist_fees, 0) - COALESCE(sc.staff_cost, 0))",
+                   ("st", "inv", "sp", "af", "sc")),
+}
+
+MONEY_METRICS = ("revenue", "sponsorship", "artist_fees", "staff_cost", "venue_cost", "net_profit")
+
+# The scalar functions of the Analytics tab and the metric each one computes
+FUNCTION_METRICS = {
+    "Get_Event_Revenue": "revenue",
+    "Get_Tickets_Sold_Count": "tickets_sold",
+    "Get_Available_Tickets_Count": "available_tickets",
+    "Get_Event_Occupancy_Percentage": "occupancy",
+    "Get_Total_Sponsorship": "sponsorship",
+    "Get_Total_Artist_Fees": "artist_fees",
+    "Get_Event_Net_Profit": "net_profit",
+    "Get_Attendee_Count": "attendees",
+    "Get_Artist_Count": "artist_count",
+    "Get_Total_Tickets_Count": "total_tickets",
+}
+
+
+class EventMetrics:
+    """Any set of metrics for many events in one query, instead of one scalar function call per metric and event"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def for_events(self, event_ids, metrics=None):
+        """Rows of eventID, name, date, status and the metrics, ordered by date; all metrics by default"""
+        if not event_ids:
+            return []
+        return self._compute(f"e.eventID IN ({placeholders(event_ids)})", tuple(event_ids), metrics)
+
+    def for_dates(self, first_date, last_date, metrics=None):
+        """The same for every event between two dates (inclusive), e.g. a season"""
+        return self._compute("e.date BETWEEN %s AND %s", (first_date, last_date), metrics)
+
+    def _compute(self, events_sql, params, metrics):
+        metrics = list(metrics or METRICS)
+        unknown = [name for name in metrics if name not in METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        needed = {source for name in metrics for source in METRICS[name][1]}
+        sources = [source for source in SOURCES if source in needed]
+        columns = "".join(f",\n                   {METRICS[name][0]} AS {name}" for name in metrics)
+        joins = "".join(SOURCES[source].format(events=events_sql) for source in sources)
+        # The event filter is bound once in every grouped source and once in the outer query
+        filters = 1 + sum("{events}" in SOURCES[source] for source in sources)
+
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(f"""
+                    SELECT e.eventID, e.name, e.date, e.status{columns}
+                    FROM Events e
+                    JOIN Venue v ON v.venueID = e.venueID{joins}
+                    WHERE {events_sql}
+                    ORDER BY e.date, e.eventID
+                """, params * filters)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
@@ -14,7 +14,9 @@ CREATE TABLE Venue (
     pincode VARCHAR(20) NOT NULL,
     name VARCHAR(255) NOT NULL,
     type VARCHAR(100) NOT NULL CHECK (type IN ('Indoor', 'Outdoor', 'Stadium', 'Hall', 'Theater')),
-    capacity INT NOT NULL CHECK (capacity > 0)
+    capacity INT NOT NULL CHECK (capacity > 0),
+    -- Admin list pages, sorted by name (keyset on name, venueID)
+    KEY idx_venue_name (name)
 );
 
 -- Create Events table
@@ -28,7 +30,18 @@ CREATE TABLE Events (
     budget DECIMAL(10,2) NOT NULL CHECK (budget > 0),
     venueID INT NOT NULL,
     completion_time TIMESTAMP NULL,
+    -- EAGER: a Ticket row per seat is created with the event
+    -- LAZY: seats live in seat_range; Ticket rows are created only when held or sold
+    inventory_mode VARCHAR(10) NOT NULL DEFAULT 'EAGER' CHECK (inventory_mode IN ('EAGER', 'LAZY')),
+    -- Rows in attends for this event; maintained by the attends triggers
+    attendee_count INT NOT NULL DEFAULT 0 CHECK (attendee_count >= 0),
     FOREIGN KEY (venueID) REFERENCES Venue(venueID) ON DELETE CASCADE ON UPDATE CASCADE,
+    -- Venue clash checks: equality on venue/date, range on start_time
+    KEY idx_event_venue_slot (venueID, date, start_time),
+    -- Upcoming-event lists and the dashboard: range on date, ordered by date
+    KEY idx_event_date_status (date, status),
+    -- Admin list pages, newest first: (date, eventID) in index order for the keyset
+    KEY idx_event_date (date),
     CHECK (end_time > start_time)
 );
 
@@ -36,12 +49,18 @@ CREATE TABLE Events (
 CREATE TABLE Ticket (
     ticketID INT PRIMARY KEY AUTO_INCREMENT,
     price DECIMAL(10,2) NOT NULL CHECK (price > 0),
-    status VARCHAR(50) NOT NULL DEFAULT 'AVAILABLE' CHECK (status IN ('AVAILABLE','SOLD')),
+    status VARCHAR(50) NOT NULL DEFAULT 'AVAILABLE' CHECK (status IN ('AVAILABLE','HELD','SOLD')),
     type VARCHAR(100) NOT NULL CHECK (type IN ('VIP','PREMIUM','GENERAL','STUDENT')),
     seatNo VARCHAR(20) NOT NULL,
     eventID INT NOT NULL,
+    held_by INT NULL,               -- attendeeID holding the seat while status = 'HELD'
+    hold_expires_at DATETIME NULL,  -- hold is released by the sweeper after this time
     FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE,
-    UNIQUE KEY unique_seat_per_event (eventID, seatNo)
+    UNIQUE KEY unique_seat_per_event (eventID, seatNo),
+    -- Lets the hold sweeper find expired holds without scanning the table
+    KEY idx_ticket_hold_expiry (status, hold_expires_at),
+    -- Per-event seat lookups by status (sold/held seats, inventory refresh, waitlist offers)
+    KEY idx_ticket_event_status (eventID, status, type)
 );
 
 -- Create Attendee table
@@ -62,7 +81,9 @@ CREATE TABLE Artist (
     country VARCHAR(100) NOT NULL DEFAULT 'INDIA',
     phone_no VARCHAR(20) NOT NULL UNIQUE,
     email VARCHAR(255) NOT NULL UNIQUE,
-    fee DECIMAL(10,2) NOT NULL CHECK(fee >= 0)
+    fee DECIMAL(10,2) NOT NULL CHECK(fee >= 0),
+    -- Admin list pages, sorted by name (keyset on name, artistID)
+    KEY idx_artist_name (name)
 );
 
 -- Create social_media table
@@ -83,11 +104,26 @@ CREATE TABLE performs (
     FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE
 );
 
+-- Booking requests by client-supplied key, so a resent request is answered
+-- with the original booking instead of buying again
+CREATE TABLE booking_request (
+    request_key VARCHAR(64) PRIMARY KEY,
+    attendeeID INT NOT NULL,
+    eventID INT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (attendeeID) REFERENCES Attendee(attendeeID) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
 -- Create purchases relationship table
 CREATE TABLE purchases (
     attendeeID INT NOT NULL,
     ticketID INT NOT NULL,
+    request_key VARCHAR(64) NULL,   -- booking_request that bought this ticket, if any
     PRIMARY KEY (attendeeID, ticketID),
+    UNIQUE KEY unique_ticket_purchase (ticketID),
+    KEY idx_purchase_request (request_key),
+    FOREIGN KEY (request_key) REFERENCES booking_request(request_key) ON DELETE SET NULL ON UPDATE CASCADE,
     FOREIGN KEY (attendeeID) REFERENCES Attendee(attendeeID) ON DELETE CASCADE ON UPDATE CASCADE,
     FOREIGN KEY (ticketID) REFERENCES Ticket(ticketID) ON DELETE CASCADE ON UPDATE CASCADE
 );
@@ -108,7 +144,9 @@ CREATE TABLE Sponsor (
     industry VARCHAR(100),
     contact_person VARCHAR(255),
     phone_no VARCHAR(20),
-    email VARCHAR(255) UNIQUE
+    email VARCHAR(255) UNIQUE,
+    -- Admin list pages, sorted by name (keyset on name, sponsorID)
+    KEY idx_sponsor_name (name)
 );
 
 -- Sponsor ↔ Event (Many-to-Many)
@@ -128,7 +166,9 @@ CREATE TABLE Staff (
     role VARCHAR(100) NOT NULL CHECK(role IN ('Security','Technician','Manager','Volunteer','Cleaner','Coordinator')),
     phone_no VARCHAR(20) UNIQUE,
     email VARCHAR(255) UNIQUE,
-    salary DECIMAL(10,2) CHECK(salary >= 0)
+    salary DECIMAL(10,2) CHECK(salary >= 0),
+    -- Admin list pages, sorted by role and name (keyset on role, name, staffID)
+    KEY idx_staff_role_name (role, name)
 );
 
 -- Staff ↔ Event (Many-to-Many)
@@ -142,35 +182,176 @@ CREATE TABLE works_at (
 );
 
 
+-- Ticket tiers generated for every new event (share = % of venue capacity)
+CREATE TABLE ticket_tier (
+    type VARCHAR(100) PRIMARY KEY CHECK (type IN ('VIP','PREMIUM','GENERAL','STUDENT')),
+    price DECIMAL(10,2) NOT NULL CHECK (price > 0),
+    capacity_share DECIMAL(5,2) NOT NULL CHECK (capacity_share BETWEEN 0 AND 100),
+    sort_order INT NOT NULL UNIQUE
+);
+
+INSERT INTO ticket_tier (type, price, capacity_share, sort_order)
+VALUES
+('VIP', 1000.00, 10, 1),
+('PREMIUM', 750.00, 20, 2),
+('GENERAL', 500.00, 50, 3),
+('STUDENT', 250.00, 20, 4);
+
+-- Seat layout of every event: numbered ranges per ticket type, one each when
+-- the event is created and another per tier when its venue grows (trigger 21).
+-- Seat numbers are unique across all of an event's ranges.
+-- For LAZY events this is the only record of unsold seats.
+CREATE TABLE seat_range (
+    eventID INT NOT NULL,
+    type VARCHAR(100) NOT NULL CHECK (type IN ('VIP','PREMIUM','GENERAL','STUDENT')),
+    price DECIMAL(10,2) NOT NULL CHECK (price > 0),
+    first_seat INT NOT NULL,
+    last_seat INT NOT NULL,
+    PRIMARY KEY (eventID, type, first_seat),
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE,
+    CHECK (last_seat >= first_seat)
+);
+
+-- Running ticket counts per event and tier, kept exact by the Ticket triggers
+-- below so availability / sales / revenue lookups never scan Ticket.
+-- available = total - held - sold; revenue is the sum of SOLD ticket prices.
+CREATE TABLE event_inventory (
+    eventID INT NOT NULL,
+    type VARCHAR(100) NOT NULL CHECK (type IN ('VIP','PREMIUM','GENERAL','STUDENT')),
+    total INT NOT NULL DEFAULT 0,
+    available INT NOT NULL DEFAULT 0,
+    held INT NOT NULL DEFAULT 0,
+    sold INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (eventID, type),
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Per-event counts of assigned artists, staff and sponsors, kept by the triggers
+-- on performs / works_at / sponsors_event so summaries need no fan-out joins.
+-- Rebuild_Event_Rollup recomputes them from the link tables.
+CREATE TABLE event_rollup (
+    eventID INT PRIMARY KEY,
+    artist_count INT NOT NULL DEFAULT 0,
+    staff_count INT NOT NULL DEFAULT 0,
+    sponsor_count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Frozen financial summary of a completed event (the Get_Event_Financial_Summary
+-- columns), written once by Close_Event_Financials when the event is marked
+-- (or created) Completed. Analytics and reports read closed events from here
+-- instead of recomputing them from the live tables; rows are never updated.
+-- A completed event cannot change status again except through Reopen_Event,
+-- which is the only thing that deletes its settlement.
+CREATE TABLE event_settlement (
+    eventID INT PRIMARY KEY,
+    closed_at DATETIME NOT NULL,
+    budget DECIMAL(10,2) NOT NULL,
+    venue_cost DECIMAL(10,2) NOT NULL,
+    tickets_sold INT NOT NULL,
+    ticket_revenue DECIMAL(12,2) NOT NULL,
+    sponsorship_revenue DECIMAL(12,2) NOT NULL,
+    artist_expenses DECIMAL(12,2) NOT NULL,
+    staff_expenses DECIMAL(12,2) NOT NULL,
+    total_revenue DECIMAL(12,2) NOT NULL,
+    total_expenses DECIMAL(12,2) NOT NULL,
+    net_profit DECIMAL(12,2) NOT NULL,
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- Change counters for cached reports (reportCache.py), bumped by the triggers
+-- on each listed table, so the cache reads every version with one small query.
+-- Sales bump 'event_inventory' (and 'attends' through Events.attendee_count)
+-- from the counter triggers, and Close_Event_Financials 'event_settlement'.
+CREATE TABLE data_version (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO data_version (name)
+VALUES ('Venue'), ('Events'), ('Artist'), ('performs'), ('Sponsor'), ('sponsors_event'), ('Attendee'),
+       ('event_inventory'), ('attends'), ('event_settlement');
+
+-- Latest precomputed result of each heavy report (reportSnapshots.py), so the
+-- Reports tab can show it without running the procedure. columns is a JSON
+-- array of column names; each report_snapshot_row holds one row as a JSON array.
+CREATE TABLE report_snapshot (
+    report VARCHAR(64) PRIMARY KEY,
+    generated_at DATETIME NOT NULL,
+    duration_ms INT NOT NULL,
+    row_count INT NOT NULL,
+    columns JSON NOT NULL
+);
+
+CREATE TABLE report_snapshot_row (
+    report VARCHAR(64) NOT NULL,
+    row_no INT NOT NULL,
+    data JSON NOT NULL,
+    PRIMARY KEY (report, row_no),
+    FOREIGN KEY (report) REFERENCES report_snapshot(report) ON DELETE CASCADE
+);
+
+-- Attendees waiting for sold-out tickets, served in joined_at order per event and tier
+CREATE TABLE waitlist (
+    waitlistID INT PRIMARY KEY AUTO_INCREMENT,
+    eventID INT NOT NULL,
+    type VARCHAR(100) NOT NULL CHECK (type IN ('VIP','PREMIUM','GENERAL','STUDENT')),
+    attendeeID INT NOT NULL,
+    quantity INT NOT NULL DEFAULT 1 CHECK (quantity > 0),
+    status VARCHAR(20) NOT NULL DEFAULT 'WAITING'
+        CHECK (status IN ('WAITING','OFFERED','FULFILLED','EXPIRED','CANCELLED')),
+    joined_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    offer_expires_at DATETIME NULL,   -- seats offered to the attendee are held until then
+    FOREIGN KEY (eventID) REFERENCES Events(eventID) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (attendeeID) REFERENCES Attendee(attendeeID) ON DELETE CASCADE ON UPDATE CASCADE,
+    UNIQUE KEY unique_waitlist_entry (eventID, type, attendeeID),
+    KEY idx_waitlist_queue (eventID, type, status, joined_at),
+    -- The promoter's expiry sweep and its scan for waiting tiers skip finished entries
+    KEY idx_waitlist_status (status, offer_expires_at)
+);
+
+-- Numbers 1..1,000,000 used for set-based seat generation
+CREATE TABLE seq_numbers (
+    n INT PRIMARY KEY
+);
+
+INSERT INTO seq_numbers (n)
+SELECT d0.d + d1.d * 10 + d2.d * 100 + d3.d * 1000 + d4.d * 10000 + d5.d * 100000 + 1
+FROM (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d0
+CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d1
+CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d2
+CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d3
+CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d4
+CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4
+      UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9) d5;
+
 
 -- TRIGGERS - DATA INTEGRITY & BUSINESS LOGIC
 
 -- 1. Prevent venue double booking (time clash prevention)
+-- Two slots overlap exactly when each starts before the other ends. Written this
+-- way the check is a range scan on idx_event_venue_slot, stopping at the first hit.
 DELIMITER //
 CREATE TRIGGER prevent_venue_time_clash
 BEFORE INSERT ON Events
 FOR EACH ROW
 BEGIN
-    DECLARE clash_count INT;
-    
     -- Check if there's any event at the same venue on the same date with overlapping times
-    SELECT COUNT(*) INTO clash_count
-    FROM Events
-    WHERE venueID = NEW.venueID
-    AND date = NEW.date
-    AND status != 'Cancelled'
-    AND (
-        -- New event starts during existing event
-        (NEW.start_time >= start_time AND NEW.start_time < end_time)
-        OR
-        -- New event ends during existing event
-        (NEW.end_time > start_time AND NEW.end_time <= end_time)
-        OR
-        -- New event completely encompasses existing event
-        (NEW.start_time <= start_time AND NEW.end_time >= end_time)
-    );
-    
-    IF clash_count > 0 THEN
+    IF EXISTS (
+        SELECT 1
+        FROM Events
+        WHERE venueID = NEW.venueID
+        AND date = NEW.date
+        AND start_time < NEW.end_time
+        AND end_time > NEW.start_time
+        AND status != 'Cancelled'
+    ) THEN
         SIGNAL SQLSTATE '45000'
         SET MESSAGE_TEXT = 'Venue time clash: This venue is already booked for an overlapping time slot on this date';
     END IF;
@@ -183,27 +364,20 @@ CREATE TRIGGER prevent_venue_time_clash_update
 BEFORE UPDATE ON Events
 FOR EACH ROW
 BEGIN
-    DECLARE clash_count INT;
-    
     -- Only check if venue, date, or times are being changed
     IF (NEW.venueID != OLD.venueID OR NEW.date != OLD.date OR 
         NEW.start_time != OLD.start_time OR NEW.end_time != OLD.end_time) THEN
         
-        SELECT COUNT(*) INTO clash_count
-        FROM Events
-        WHERE venueID = NEW.venueID
-        AND date = NEW.date
-        AND eventID != NEW.eventID  -- Exclude current event
-        AND status != 'Cancelled'
-        AND (
-            (NEW.start_time >= start_time AND NEW.start_time < end_time)
-            OR
-            (NEW.end_time > start_time AND NEW.end_time <= end_time)
-            OR
-            (NEW.start_time <= start_time AND NEW.end_time >= end_time)
-        );
-        
-        IF clash_count > 0 THEN
+        IF EXISTS (
+            SELECT 1
+            FROM Events
+            WHERE venueID = NEW.venueID
+            AND date = NEW.date
+            AND start_time < NEW.end_time
+            AND end_time > NEW.start_time
+            AND eventID != NEW.eventID  -- Exclude current event
+            AND status != 'Cancelled'
+        ) THEN
             SIGNAL SQLSTATE '45000'
             SET MESSAGE_TEXT = 'Venue time clash: This venue is already booked for an overlapping time slot on this date';
         END IF;
@@ -219,51 +393,34 @@ FOR EACH ROW
 BEGIN
     UPDATE Ticket
     SET status = 'SOLD'
-    WHERE ticketID = NEW.ticketID;
+    WHERE ticketID = NEW.ticketID AND status != 'SOLD';
 END //
 DELIMITER ;
 
 -- 4. Prevent selling already sold tickets
-DELIMITER //
-CREATE TRIGGER prevent_duplicate_ticket_sale
-BEFORE INSERT ON purchases
-FOR EACH ROW
-BEGIN
-    DECLARE ticket_status VARCHAR(50);
-    
-    SELECT status INTO ticket_status
-    FROM Ticket
-    WHERE ticketID = NEW.ticketID;
-    
-    IF ticket_status = 'SOLD' THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Cannot purchase ticket: This ticket has already been sold';
-    END IF;
-END //
-DELIMITER ;
+-- Enforced by the unique key purchases(ticketID); the portals show the
+-- duplicate-key error as 'Cannot purchase ticket: This ticket has already been sold'
+-- (see dbErrors.py). Ticket.status may already be SOLD when the purchase is
+-- inserted because the booking engine claims the seat first.
 
 -- 5. Prevent overbooking venue capacity
+-- Takes a seat on the event's attendee counter with one conditional UPDATE.
+-- The row lock on the event makes concurrent inserts queue up instead of all
+-- seeing the same count, and nothing is counted. If the attends insert itself
+-- fails, the increment is rolled back with it.
 DELIMITER //
 CREATE TRIGGER prevent_overbooking
 BEFORE INSERT ON attends
 FOR EACH ROW
 BEGIN
-    DECLARE venue_cap INT;
-    DECLARE current_attendees INT;
-    
-    -- Get venue capacity
-    SELECT v.capacity INTO venue_cap
-    FROM Events e
+    UPDATE Events e
     JOIN Venue v ON e.venueID = v.venueID
-    WHERE e.eventID = NEW.eventID;
-    
-    -- Get current attendee count
-    SELECT COUNT(*) INTO current_attendees
-    FROM attends
-    WHERE eventID = NEW.eventID;
+    SET e.attendee_count = e.attendee_count + 1
+    WHERE e.eventID = NEW.eventID
+    AND e.attendee_count < v.capacity;
     
-    -- Check if adding this attendee would exceed capacity
-    IF current_attendees >= venue_cap THEN
+    -- No row updated: adding this attendee would exceed capacity
+    IF ROW_COUNT() = 0 THEN
         SIGNAL SQLSTATE '45000'
         SET MESSAGE_TEXT = 'Cannot add attendee: Venue capacity exceeded';
     END IF;
@@ -283,120 +440,592 @@ END //
 DELIMITER ;
 
 -- 7. Prevent duplicate artist performance at same event
+-- Enforced by the performs primary key (artistID, eventID)
+
+-- 8. Prevent duplicate staff assignment
+-- Enforced by the works_at primary key (staffID, eventID)
+
+-- 9. Prevent duplicate sponsor for same event
+-- Enforced by the sponsors_event primary key (sponsorID, eventID)
+
+-- 10. Generate the seat layout (and, for EAGER events, the tickets) for a new event
+-- Tier sizes come from ticket_tier; seat numbers continue across tiers in
+-- sort_order (VIP-1.., PREMIUM-n.., ...), as before.
 DELIMITER //
-CREATE TRIGGER prevent_duplicate_artist_performance
-BEFORE INSERT ON performs
+
+CREATE TRIGGER trg_after_event_insert
+AFTER INSERT ON Events
 FOR EACH ROW
 BEGIN
-    DECLARE perf_count INT;
-    
-    SELECT COUNT(*) INTO perf_count
-    FROM performs
-    WHERE artistID = NEW.artistID AND eventID = NEW.eventID;
-    
-    IF perf_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Duplicate entry: This artist is already scheduled to perform at this event';
+    DECLARE total_capacity INT;
+
+    -- Get the venue's capacity for the new event
+    SELECT capacity INTO total_capacity
+    FROM Venue
+    WHERE venueID = NEW.venueID;
+
+    INSERT INTO seat_range (eventID, type, price, first_seat, last_seat)
+    SELECT NEW.eventID, type, price, first_seat, first_seat + seat_count - 1
+    FROM (
+        SELECT type, price, seat_count,
+               SUM(seat_count) OVER (ORDER BY sort_order) - seat_count + 1 AS first_seat
+        FROM (
+            SELECT type, price, sort_order,
+                   CAST(ROUND(total_capacity * capacity_share / 100) AS UNSIGNED) AS seat_count
+            FROM ticket_tier
+        ) shares
+    ) tiers
+    WHERE seat_count > 0;
+
+    -- Every seat starts out available
+    INSERT INTO event_inventory (eventID, type, total, available)
+    SELECT eventID, type, last_seat - first_seat + 1, last_seat - first_seat + 1
+    FROM seat_range
+    WHERE eventID = NEW.eventID;
+
+    INSERT INTO event_rollup (eventID) VALUES (NEW.eventID);
+
+    -- LAZY events create Ticket rows only when a seat is held or sold
+    IF NEW.inventory_mode = 'EAGER' THEN
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        SELECT sr.price, 'AVAILABLE', sr.type, CONCAT(sr.type, '-', seq.n), NEW.eventID
+        FROM seat_range sr
+        JOIN seq_numbers seq ON seq.n BETWEEN sr.first_seat AND sr.last_seat
+        WHERE sr.eventID = NEW.eventID
+        ORDER BY seq.n;
     END IF;
+
 END //
+
 DELIMITER ;
 
--- 8. Prevent duplicate staff assignment
+-- 11. Keep event_inventory in step with ticket status changes
+-- A Ticket row only changes the counters once it leaves AVAILABLE: EAGER rows
+-- are generated as AVAILABLE (already counted from seat_range) and LAZY rows
+-- are created directly as HELD or SOLD. A deleted ticket's seat is still in
+-- seat_range, so it goes back to available.
+-- Bulk operations set @skip_inventory_triggers for their session and call
+-- Refresh_Event_Inventory once instead of paying for a counter update per row.
 DELIMITER //
-CREATE TRIGGER prevent_duplicate_staff_assignment
-BEFORE INSERT ON works_at
+CREATE TRIGGER inventory_after_ticket_insert
+AFTER INSERT ON Ticket
 FOR EACH ROW
 BEGIN
-    DECLARE assignment_count INT;
-    
-    SELECT COUNT(*) INTO assignment_count
-    FROM works_at
-    WHERE staffID = NEW.staffID AND eventID = NEW.eventID;
-    
-    IF assignment_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Duplicate entry: This staff member is already assigned to this event';
+    IF NEW.status != 'AVAILABLE' AND @skip_inventory_triggers IS NULL THEN
+        UPDATE event_inventory
+        SET available = available - 1,
+            held = held + (NEW.status = 'HELD'),
+            sold = sold + (NEW.status = 'SOLD'),
+            revenue = revenue + IF(NEW.status = 'SOLD', NEW.price, 0)
+        WHERE eventID = NEW.eventID AND type = NEW.type;
     END IF;
 END //
 DELIMITER ;
 
--- 9. Prevent duplicate sponsor for same event
 DELIMITER //
-CREATE TRIGGER prevent_duplicate_sponsor
-BEFORE INSERT ON sponsors_event
+CREATE TRIGGER inventory_after_ticket_update
+AFTER UPDATE ON Ticket
 FOR EACH ROW
 BEGIN
-    DECLARE sponsor_count INT;
-    
-    SELECT COUNT(*) INTO sponsor_count
-    FROM sponsors_event
-    WHERE sponsorID = NEW.sponsorID AND eventID = NEW.eventID;
-    
-    IF sponsor_count > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Duplicate entry: This sponsor is already linked to this event';
+    IF (NEW.status != OLD.status OR NEW.price != OLD.price
+        OR NEW.type != OLD.type OR NEW.eventID != OLD.eventID)
+       AND @skip_inventory_triggers IS NULL THEN
+
+        IF OLD.status != 'AVAILABLE' THEN
+            UPDATE event_inventory
+            SET available = available + 1,
+                held = held - (OLD.status = 'HELD'),
+                sold = sold - (OLD.status = 'SOLD'),
+                revenue = revenue - IF(OLD.status = 'SOLD', OLD.price, 0)
+            WHERE eventID = OLD.eventID AND type = OLD.type;
+        END IF;
+
+        IF NEW.status != 'AVAILABLE' THEN
+            UPDATE event_inventory
+            SET available = available - 1,
+                held = held + (NEW.status = 'HELD'),
+                sold = sold + (NEW.status = 'SOLD'),
+                revenue = revenue + IF(NEW.status = 'SOLD', NEW.price, 0)
+            WHERE eventID = NEW.eventID AND type = NEW.type;
+        END IF;
     END IF;
 END //
 DELIMITER ;
 
 DELIMITER //
+CREATE TRIGGER inventory_after_ticket_delete
+AFTER DELETE ON Ticket
+FOR EACH ROW
+BEGIN
+    IF OLD.status != 'AVAILABLE' AND @skip_inventory_triggers IS NULL THEN
+        UPDATE event_inventory
+        SET available = available + 1,
+            held = held - (OLD.status = 'HELD'),
+            sold = sold - (OLD.status = 'SOLD'),
+            revenue = revenue - IF(OLD.status = 'SOLD', OLD.price, 0)
+        WHERE eventID = OLD.eventID AND type = OLD.type;
+    END IF;
+END //
+DELIMITER ;
 
-CREATE TRIGGER trg_after_event_insert
+-- 12. Give the seat on the attendee counter back when an attendee leaves an event
+DELIMITER //
+CREATE TRIGGER release_attendee_count
+AFTER DELETE ON attends
+FOR EACH ROW
+BEGIN
+    IF @skip_inventory_triggers IS NULL THEN
+        UPDATE Events
+        SET attendee_count = attendee_count - 1
+        WHERE eventID = OLD.eventID;
+    END IF;
+END //
+DELIMITER ;
+
+-- 13. Foreign key cascades do not fire triggers, so an attendee's attends rows
+-- are released from the counters here before the cascade removes them
+DELIMITER //
+CREATE TRIGGER release_deleted_attendee
+BEFORE DELETE ON Attendee
+FOR EACH ROW
+BEGIN
+    UPDATE Events e
+    JOIN attends a ON a.eventID = e.eventID
+    SET e.attendee_count = e.attendee_count - 1
+    WHERE a.attendeeID = OLD.attendeeID;
+END //
+DELIMITER ;
+
+-- 14. Keep event_rollup in step with artist, staff and sponsor assignments
+DELIMITER //
+CREATE TRIGGER rollup_after_performs_insert
+AFTER INSERT ON performs
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET artist_count = artist_count + 1 WHERE eventID = NEW.eventID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_after_performs_delete
+AFTER DELETE ON performs
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET artist_count = artist_count - 1 WHERE eventID = OLD.eventID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_after_works_at_insert
+AFTER INSERT ON works_at
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET staff_count = staff_count + 1 WHERE eventID = NEW.eventID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_after_works_at_delete
+AFTER DELETE ON works_at
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET staff_count = staff_count - 1 WHERE eventID = OLD.eventID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_after_sponsors_event_insert
+AFTER INSERT ON sponsors_event
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET sponsor_count = sponsor_count + 1 WHERE eventID = NEW.eventID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_after_sponsors_event_delete
+AFTER DELETE ON sponsors_event
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup SET sponsor_count = sponsor_count - 1 WHERE eventID = OLD.eventID;
+END //
+DELIMITER ;
+
+-- 15. As with attendees (13), deleting an artist, staff member or sponsor
+-- cascades to its assignments without firing the triggers above
+DELIMITER //
+CREATE TRIGGER rollup_release_deleted_artist
+BEFORE DELETE ON Artist
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup r
+    JOIN performs p ON p.eventID = r.eventID
+    SET r.artist_count = r.artist_count - 1
+    WHERE p.artistID = OLD.artistID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_release_deleted_staff
+BEFORE DELETE ON Staff
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup r
+    JOIN works_at wa ON wa.eventID = r.eventID
+    SET r.staff_count = r.staff_count - 1
+    WHERE wa.staffID = OLD.staffID;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER rollup_release_deleted_sponsor
+BEFORE DELETE ON Sponsor
+FOR EACH ROW
+BEGIN
+    UPDATE event_rollup r
+    JOIN sponsors_event se ON se.eventID = r.eventID
+    SET r.sponsor_count = r.sponsor_count - 1
+    WHERE se.sponsorID = OLD.sponsorID;
+END //
+DELIMITER ;
+
+-- 16. Version the sales counters: each change to an event's ticket counts bumps data_version
+DELIMITER //
+CREATE TRIGGER version_after_inventory_update
+AFTER UPDATE ON event_inventory
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'event_inventory';
+END //
+DELIMITER ;
+
+-- 17. Bump data_version for every change to the tables the reports read.
+-- Cascaded deletes fire no triggers, but each one starts from a delete on a
+-- parent table that is versioned itself.
+
+DELIMITER //
+CREATE TRIGGER version_after_venue_insert
+AFTER INSERT ON Venue
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Venue';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_venue_update
+AFTER UPDATE ON Venue
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Venue';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_venue_delete
+AFTER DELETE ON Venue
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Venue';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_events_insert
 AFTER INSERT ON Events
 FOR EACH ROW
 BEGIN
-    DECLARE total_capacity INT;
-    DECLARE vip_capacity INT;
-    DECLARE premium_capacity INT;
-    DECLARE general_capacity INT;
-    DECLARE student_capacity INT;
-    DECLARE seat_no INT DEFAULT 1;
+    UPDATE data_version SET version = version + 1 WHERE name = 'Events';
+END //
+DELIMITER ;
 
-    -- Get the venue's capacity for the new event
-    SELECT capacity INTO total_capacity
-    FROM Venue
-    WHERE venueID = NEW.venueID;
+DELIMITER //
+CREATE TRIGGER version_after_events_update
+AFTER UPDATE ON Events
+FOR EACH ROW
+BEGIN
+    -- The attendee counter is the attends table's version
+    IF NEW.attendee_count = OLD.attendee_count THEN
+        UPDATE data_version SET version = version + 1 WHERE name = 'Events';
+    ELSE
+        UPDATE data_version SET version = version + 1 WHERE name = 'attends';
+    END IF;
+END //
+DELIMITER ;
 
-    -- Define the number of tickets per category
-    SET vip_capacity = total_capacity * 0.1; -- 10% VIP
-    SET premium_capacity = total_capacity * 0.2; -- 20% PREMIUM
-    SET general_capacity = total_capacity * 0.5; -- 50% GENERAL
-    SET student_capacity = total_capacity * 0.2; -- 20% STUDENT
+DELIMITER //
+CREATE TRIGGER version_after_events_delete
+AFTER DELETE ON Events
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Events';
+END //
+DELIMITER ;
 
-    -- Insert VIP tickets
-    WHILE vip_capacity > 0 DO
-        INSERT INTO Ticket (price, status, type, seatNo, eventID)
-        VALUES (1000.00, 'AVAILABLE', 'VIP', CONCAT('VIP-', seat_no), NEW.eventID);
-        SET seat_no = seat_no + 1;
-        SET vip_capacity = vip_capacity - 1;
-    END WHILE;
+DELIMITER //
+CREATE TRIGGER version_after_artist_insert
+AFTER INSERT ON Artist
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Artist';
+END //
+DELIMITER ;
 
-    -- Insert PREMIUM tickets
-    WHILE premium_capacity > 0 DO
-        INSERT INTO Ticket (price, status, type, seatNo, eventID)
-        VALUES (750.00, 'AVAILABLE', 'PREMIUM', CONCAT('PREMIUM-', seat_no), NEW.eventID);
-        SET seat_no = seat_no + 1;
-        SET premium_capacity = premium_capacity - 1;
-    END WHILE;
+DELIMITER //
+CREATE TRIGGER version_after_artist_update
+AFTER UPDATE ON Artist
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Artist';
+END //
+DELIMITER ;
 
-    -- Insert GENERAL tickets
-    WHILE general_capacity > 0 DO
-        INSERT INTO Ticket (price, status, type, seatNo, eventID)
-        VALUES (500.00, 'AVAILABLE', 'GENERAL', CONCAT('GENERAL-', seat_no), NEW.eventID);
-        SET seat_no = seat_no + 1;
-        SET general_capacity = general_capacity - 1;
-    END WHILE;
+DELIMITER //
+CREATE TRIGGER version_after_artist_delete
+AFTER DELETE ON Artist
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Artist';
+END //
+DELIMITER ;
 
-    -- Insert STUDENT tickets
-    WHILE student_capacity > 0 DO
-        INSERT INTO Ticket (price, status, type, seatNo, eventID)
-        VALUES (250.00, 'AVAILABLE', 'STUDENT', CONCAT('STUDENT-', seat_no), NEW.eventID);
-        SET seat_no = seat_no + 1;
-        SET student_capacity = student_capacity - 1;
-    END WHILE;
+DELIMITER //
+CREATE TRIGGER version_after_performs_insert
+AFTER INSERT ON performs
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'performs';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_performs_update
+AFTER UPDATE ON performs
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'performs';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_performs_delete
+AFTER DELETE ON performs
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'performs';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_sponsor_insert
+AFTER INSERT ON Sponsor
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Sponsor';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_sponsor_update
+AFTER UPDATE ON Sponsor
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Sponsor';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_sponsor_delete
+AFTER DELETE ON Sponsor
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Sponsor';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_sponsors_event_insert
+AFTER INSERT ON sponsors_event
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'sponsors_event';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_sponsors_event_update
+AFTER UPDATE ON sponsors_event
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'sponsors_event';
+END //
+DELIMITER ;
 
+DELIMITER //
+CREATE TRIGGER version_after_sponsors_event_delete
+AFTER DELETE ON sponsors_event
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'sponsors_event';
 END //
+DELIMITER ;
 
+DELIMITER //
+CREATE TRIGGER version_after_attendee_insert
+AFTER INSERT ON Attendee
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Attendee';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_attendee_update
+AFTER UPDATE ON Attendee
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Attendee';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_attendee_delete
+AFTER DELETE ON Attendee
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'Attendee';
+END //
+DELIMITER ;
+
+-- Settlements are written by Close_Event_Financials, also when it is called
+-- directly (e.g. with NULL), and deleted by Reopen_Event
+DELIMITER //
+CREATE TRIGGER version_after_settlement_insert
+AFTER INSERT ON event_settlement
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'event_settlement';
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER version_after_settlement_delete
+AFTER DELETE ON event_settlement
+FOR EACH ROW
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'event_settlement';
+END //
+DELIMITER ;
+
+-- 18. Close an event's books when it is marked Completed
+DELIMITER //
+CREATE TRIGGER close_after_event_completion
+AFTER UPDATE ON Events
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Completed' AND OLD.status != 'Completed' THEN
+        CALL Close_Event_Financials(NEW.eventID);
+    END IF;
+END //
+DELIMITER ;
+
+-- 19. Events entered as already Completed are closed straight away
+DELIMITER //
+CREATE TRIGGER close_after_completed_event_insert
+AFTER INSERT ON Events
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'Completed' THEN
+        CALL Close_Event_Financials(NEW.eventID);
+    END IF;
+END //
+DELIMITER ;
+
+-- 20. Settlements are final
+DELIMITER //
+CREATE TRIGGER prevent_settlement_update
+BEFORE UPDATE ON event_settlement
+FOR EACH ROW
+BEGIN
+    SIGNAL SQLSTATE '45000'
+    SET MESSAGE_TEXT = 'Cannot change a settlement: the event\'s books are closed';
+END //
+DELIMITER ;
+
+-- 21. A venue that grows gives its upcoming events the extra seats, so the
+-- waitlist promoter (which watches event_inventory.available) offers them to
+-- waiting attendees. Each tier is topped up to its ticket_tier share of the new
+-- capacity with a new range, numbered after the event's highest seat so no
+-- seat number is used by two types. Shrinking a venue leaves the seats in place.
+DELIMITER //
+CREATE TRIGGER extend_seats_after_capacity_increase
+AFTER UPDATE ON Venue
+FOR EACH ROW
+BEGIN
+    IF NEW.capacity > OLD.capacity THEN
+        INSERT INTO seat_range (eventID, type, price, first_seat, last_seat)
+        SELECT eventID, type, price, first_seat, first_seat + seat_count - 1
+        FROM (
+            SELECT eventID, type, price, seat_count,
+                   highest_seat + SUM(seat_count) OVER (PARTITION BY eventID ORDER BY sort_order)
+                   - seat_count + 1 AS first_seat
+            FROM (
+                SELECT sr.eventID, sr.type, MIN(sr.price) AS price, tt.sort_order,
+                       CAST(ROUND(NEW.capacity * tt.capacity_share / 100) AS SIGNED)
+                       - SUM(sr.last_seat - sr.first_seat + 1) AS seat_count,
+                       (SELECT MAX(other.last_seat) FROM seat_range other
+                        WHERE other.eventID = sr.eventID) AS highest_seat
+                FROM Events e
+                JOIN seat_range sr ON sr.eventID = e.eventID
+                JOIN ticket_tier tt ON tt.type = sr.type
+                WHERE e.venueID = NEW.venueID AND e.status = 'Planned'
+                GROUP BY sr.eventID, sr.type, tt.sort_order, tt.capacity_share
+            ) shares
+            WHERE seat_count > 0
+        ) added;
+
+        -- The new ranges are the ones past the seats the event's tickets were counted for
+        UPDATE event_inventory ei
+        JOIN Events e ON e.eventID = ei.eventID
+        JOIN (
+            SELECT sr.eventID, sr.type, SUM(sr.last_seat - sr.first_seat + 1) AS seats
+            FROM seat_range sr
+            JOIN Events e ON e.eventID = sr.eventID
+            WHERE e.venueID = NEW.venueID AND e.status = 'Planned'
+            GROUP BY sr.eventID, sr.type
+        ) layout ON layout.eventID = ei.eventID AND layout.type = ei.type
+        SET ei.available = ei.available + (layout.seats - ei.total),
+            ei.total = layout.seats
+        WHERE e.venueID = NEW.venueID AND e.status = 'Planned' AND layout.seats > ei.total;
+
+        -- EAGER events get AVAILABLE Ticket rows for the new seats (not counted by
+        -- the Ticket triggers, see 11)
+        INSERT INTO Ticket (price, status, type, seatNo, eventID)
+        SELECT sr.price, 'AVAILABLE', sr.type, CONCAT(sr.type, '-', seq.n), sr.eventID
+        FROM Events e
+        JOIN seat_range sr ON sr.eventID = e.eventID
+        JOIN seq_numbers seq ON seq.n BETWEEN sr.first_seat AND sr.last_seat
+        LEFT JOIN Ticket t ON t.eventID = sr.eventID AND t.seatNo = CONCAT(sr.type, '-', seq.n)
+        WHERE e.venueID = NEW.venueID AND e.status = 'Planned' AND e.inventory_mode = 'EAGER'
+        AND t.ticketID IS NULL
+        ORDER BY sr.eventID, seq.n;
+    END IF;
+END //
+DELIMITER ;
+
+-- 22. A completed event's books stay closed: its status only changes through
+-- Reopen_Event, so toggling the status cannot recompute its settlement
+DELIMITER //
+CREATE TRIGGER prevent_leaving_completed
+BEFORE UPDATE ON Events
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'Completed' AND NEW.status != 'Completed'
+       AND NOT (@reopen_event_id <=> NEW.eventID) THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Cannot change the status of a completed event: its books are closed (use Reopen_Event)';
+    END IF;
+END //
 DELIMITER ;
 
 -- SAMPLE DATA INSERTION
@@ -488,9 +1117,17 @@ READS SQL DATA
 BEGIN
     DECLARE total_rev DECIMAL(10,2);
     
-    SELECT COALESCE(SUM(t.price), 0) INTO total_rev
-    FROM Ticket t
-    WHERE t.eventID = event_id AND t.status = 'SOLD';
+    -- Closed events: the frozen figure
+    SELECT st.ticket_revenue INTO total_rev
+    FROM event_settlement st
+    WHERE st.eventID = event_id;
+    IF total_rev IS NOT NULL THEN
+        RETURN total_rev;
+    END IF;
+    
+    SELECT COALESCE(SUM(revenue), 0) INTO total_rev
+    FROM event_inventory
+    WHERE eventID = event_id;
     
     RETURN total_rev;
 END //
@@ -505,9 +1142,17 @@ READS SQL DATA
 BEGIN
     DECLARE sold_count INT;
     
-    SELECT COUNT(*) INTO sold_count
-    FROM Ticket
-    WHERE eventID = event_id AND status = 'SOLD';
+    -- Closed events: the frozen figure
+    SELECT st.tickets_sold INTO sold_count
+    FROM event_settlement st
+    WHERE st.eventID = event_id;
+    IF sold_count IS NOT NULL THEN
+        RETURN sold_count;
+    END IF;
+    
+    SELECT COALESCE(SUM(sold), 0) INTO sold_count
+    FROM event_inventory
+    WHERE eventID = event_id;
     
     RETURN sold_count;
 END //
@@ -522,9 +1167,10 @@ READS SQL DATA
 BEGIN
     DECLARE avail_count INT;
     
-    SELECT COUNT(*) INTO avail_count
-    FROM Ticket
-    WHERE eventID = event_id AND status = 'AVAILABLE';
+    -- Every seat in the event's ranges that has not been held or sold
+    SELECT COALESCE(SUM(available), 0) INTO avail_count
+    FROM event_inventory
+    WHERE eventID = event_id;
     
     RETURN avail_count;
 END //
@@ -538,20 +1184,16 @@ DETERMINISTIC
 READS SQL DATA
 BEGIN
     DECLARE occupancy DECIMAL(5,2);
-    DECLARE attendee_count INT;
+    DECLARE att_count INT;
     DECLARE venue_cap INT;
     
-    SELECT COUNT(DISTINCT a.attendeeID) INTO attendee_count
-    FROM attends a
-    WHERE a.eventID = event_id;
-    
-    SELECT v.capacity INTO venue_cap
+    SELECT e.attendee_count, v.capacity INTO att_count, venue_cap
     FROM Events e
     JOIN Venue v ON e.venueID = v.venueID
     WHERE e.eventID = event_id;
     
     IF venue_cap > 0 THEN
-        SET occupancy = (attendee_count * 100.0) / venue_cap;
+        SET occupancy = (att_count * 100.0) / venue_cap;
     ELSE
         SET occupancy = 0;
     END IF;
@@ -569,6 +1211,14 @@ READS SQL DATA
 BEGIN
     DECLARE total_sponsor DECIMAL(10,2);
     
+    -- Closed events: the frozen figure
+    SELECT st.sponsorship_revenue INTO total_sponsor
+    FROM event_settlement st
+    WHERE st.eventID = event_id;
+    IF total_sponsor IS NOT NULL THEN
+        RETURN total_sponsor;
+    END IF;
+    
     SELECT COALESCE(SUM(amount), 0) INTO total_sponsor
     FROM sponsors_event
     WHERE eventID = event_id;
@@ -586,6 +1236,14 @@ READS SQL DATA
 BEGIN
     DECLARE total_fees DECIMAL(10,2);
     
+    -- Closed events: the frozen figure
+    SELECT st.artist_expenses INTO total_fees
+    FROM event_settlement st
+    WHERE st.eventID = event_id;
+    IF total_fees IS NOT NULL THEN
+        RETURN total_fees;
+    END IF;
+    
     SELECT COALESCE(SUM(ar.fee), 0) INTO total_fees
     FROM performs p
     JOIN Artist ar ON p.artistID = ar.artistID
@@ -609,10 +1267,16 @@ BEGIN
     DECLARE artist_fees DECIMAL(10,2);
     DECLARE staff_cost DECIMAL(10,2);
     
+    -- Closed events: the frozen figure
+    SELECT st.net_profit INTO net_profit
+    FROM event_settlement st
+    WHERE st.eventID = event_id;
+    IF net_profit IS NOT NULL THEN
+        RETURN net_profit;
+    END IF;
+    
     -- Get revenue
-    SELECT COALESCE(SUM(t.price), 0) INTO total_revenue
-    FROM Ticket t
-    WHERE t.eventID = event_id AND t.status = 'SOLD';
+    SET total_revenue = Get_Event_Revenue(event_id);
     
     -- Add sponsorship
     SELECT total_revenue + COALESCE(SUM(se.amount), 0) INTO total_revenue
@@ -656,22 +1320,15 @@ RETURNS BOOLEAN
 DETERMINISTIC
 READS SQL DATA
 BEGIN
-    DECLARE clash_count INT;
-    
-    SELECT COUNT(*) INTO clash_count
-    FROM Events
-    WHERE venueID = venue_id
-    AND date = event_date
-    AND status != 'Cancelled'
-    AND (
-        (start_time >= Events.start_time AND start_time < Events.end_time)
-        OR
-        (end_time > Events.start_time AND end_time <= Events.end_time)
-        OR
-        (start_time <= Events.start_time AND end_time >= Events.end_time)
+    RETURN NOT EXISTS (
+        SELECT 1
+        FROM Events
+        WHERE venueID = venue_id
+        AND date = event_date
+        AND Events.start_time < end_time
+        AND Events.end_time > start_time
+        AND status != 'Cancelled'
     );
-    
-    RETURN clash_count = 0;
 END //
 DELIMITER ;
 
@@ -684,11 +1341,11 @@ READS SQL DATA
 BEGIN
     DECLARE att_count INT;
     
-    SELECT COUNT(DISTINCT attendeeID) INTO att_count
-    FROM attends
+    SELECT attendee_count INTO att_count
+    FROM Events
     WHERE eventID = event_id;
     
-    RETURN att_count;
+    RETURN COALESCE(att_count, 0);
 END //
 DELIMITER ;
 
@@ -701,11 +1358,28 @@ READS SQL DATA
 BEGIN
     DECLARE art_count INT;
     
-    SELECT COUNT(DISTINCT artistID) INTO art_count
-    FROM performs
+    SELECT artist_count INTO art_count
+    FROM event_rollup
+    WHERE eventID = event_id;
+    
+    RETURN COALESCE(art_count, 0);
+END //
+DELIMITER ;
+
+-- Function 11: Get total number of seats (tickets) for an event
+DELIMITER //
+CREATE FUNCTION Get_Total_Tickets_Count(event_id INT)
+RETURNS INT
+DETERMINISTIC
+READS SQL DATA
+BEGIN
+    DECLARE total_count INT;
+    
+    SELECT COALESCE(SUM(total), 0) INTO total_count
+    FROM event_inventory
     WHERE eventID = event_id;
     
-    RETURN art_count;
+    RETURN total_count;
 END //
 DELIMITER ;
 
@@ -725,7 +1399,7 @@ BEGIN
 END //
 DELIMITER ;
 
--- 2. Get Event Statistics (Using Functions)
+-- 2. Get Event Statistics
 DELIMITER //
 CREATE PROCEDURE Get_Event_Statistics(IN event_id INT)
 BEGIN
@@ -736,23 +1410,36 @@ BEGIN
         e.status,
         v.name AS venue_name,
         v.capacity AS venue_capacity,
-        Get_Attendee_Count(event_id) AS total_attendees,
-        Get_Artist_Count(event_id) AS total_artists,
-        COUNT(DISTINCT s.staffID) AS total_staff,
-        COUNT(DISTINCT sp.sponsorID) AS total_sponsors,
-        Get_Total_Sponsorship(event_id) AS total_sponsorship,
-        Get_Tickets_Sold_Count(event_id) AS tickets_sold,
-        (SELECT COUNT(*) FROM Ticket WHERE eventID = event_id) AS total_tickets,
-        Get_Event_Revenue(event_id) AS total_revenue,
-        Get_Event_Net_Profit(event_id) AS net_profit
+        e.attendee_count AS total_attendees,
+        COALESCE(r.artist_count, 0) AS total_artists,
+        COALESCE(r.staff_count, 0) AS total_staff,
+        COALESCE(r.sponsor_count, 0) AS total_sponsors,
+        COALESCE(st.sponsorship_revenue, m.sponsorship) AS total_sponsorship,
+        COALESCE(st.tickets_sold, inv.sold) AS tickets_sold,
+        inv.total AS total_tickets,
+        COALESCE(st.ticket_revenue, inv.revenue) AS total_revenue,
+        COALESCE(st.net_profit,
+                 inv.revenue + m.sponsorship - COALESCE(v.cost, 0) - m.artist_fees - m.staff_cost) AS net_profit
     FROM Events e
     LEFT JOIN Venue v ON e.venueID = v.venueID
-    LEFT JOIN works_at wa ON e.eventID = wa.eventID
-    LEFT JOIN Staff s ON wa.staffID = s.staffID
-    LEFT JOIN sponsors_event se ON e.eventID = se.eventID
-    LEFT JOIN Sponsor sp ON se.sponsorID = sp.sponsorID
-    WHERE e.eventID = event_id
-    GROUP BY e.eventID, e.name, e.date, e.status, v.name, v.capacity;
+    LEFT JOIN event_rollup r ON r.eventID = e.eventID
+    LEFT JOIN event_settlement st ON st.eventID = e.eventID
+    -- Each source read once (the functions read revenue and sponsorship twice)
+    CROSS JOIN (
+        SELECT COALESCE(SUM(total), 0) AS total, COALESCE(SUM(sold), 0) AS sold,
+               COALESCE(SUM(revenue), 0) AS revenue
+        FROM event_inventory
+        WHERE eventID = event_id
+    ) inv
+    CROSS JOIN (
+        SELECT
+            (SELECT COALESCE(SUM(amount), 0) FROM sponsors_event WHERE eventID = event_id) AS sponsorship,
+            (SELECT COALESCE(SUM(ar.fee), 0) FROM performs p JOIN Artist ar ON p.artistID = ar.artistID
+             WHERE p.eventID = event_id) AS artist_fees,
+            (SELECT COALESCE(SUM(s.salary), 0) FROM works_at wa JOIN Staff s ON wa.staffID = s.staffID
+             WHERE wa.eventID = event_id) AS staff_cost
+    ) m
+    WHERE e.eventID = event_id;
 END //
 DELIMITER ;
 
@@ -783,6 +1470,104 @@ BEGIN
 END //
 DELIMITER ;
 
+-- 4. Recompute an event's inventory and attendee counters from its Ticket and attends rows
+DELIMITER //
+CREATE PROCEDURE Refresh_Event_Inventory(IN event_id INT)
+BEGIN
+    UPDATE Events
+    SET attendee_count = (SELECT COUNT(*) FROM attends WHERE eventID = event_id)
+    WHERE eventID = event_id;
+    
+    UPDATE event_inventory ei
+    LEFT JOIN (
+        SELECT type,
+               SUM(status = 'HELD') AS held,
+               SUM(status = 'SOLD') AS sold,
+               SUM(IF(status = 'SOLD', price, 0)) AS revenue
+        FROM Ticket
+        WHERE eventID = event_id
+        GROUP BY type
+    ) t ON t.type = ei.type
+    SET ei.held = COALESCE(t.held, 0),
+        ei.sold = COALESCE(t.sold, 0),
+        ei.revenue = COALESCE(t.revenue, 0),
+        ei.available = ei.total - COALESCE(t.held, 0) - COALESCE(t.sold, 0)
+    WHERE ei.eventID = event_id;
+END //
+DELIMITER ;
+
+-- 5. Recompute event_rollup from the assignment tables, for one event or (NULL) all of them
+DELIMITER //
+CREATE PROCEDURE Rebuild_Event_Rollup(IN event_id INT)
+BEGIN
+    INSERT INTO event_rollup (eventID, artist_count, staff_count, sponsor_count)
+    SELECT e.eventID,
+           (SELECT COUNT(*) FROM performs p WHERE p.eventID = e.eventID),
+           (SELECT COUNT(*) FROM works_at wa WHERE wa.eventID = e.eventID),
+           (SELECT COUNT(*) FROM sponsors_event se WHERE se.eventID = e.eventID)
+    FROM Events e
+    WHERE event_id IS NULL OR e.eventID = event_id
+    ON DUPLICATE KEY UPDATE
+        artist_count = VALUES(artist_count),
+        staff_count = VALUES(staff_count),
+        sponsor_count = VALUES(sponsor_count);
+END //
+DELIMITER ;
+
+-- 6. Freeze the financial summary of a completed event (or, with NULL, of every
+-- completed event not closed yet) into event_settlement
+DELIMITER //
+CREATE PROCEDURE Close_Event_Financials(IN event_id INT)
+BEGIN
+    INSERT INTO event_settlement (eventID, closed_at, budget, venue_cost, tickets_sold,
+                                  ticket_revenue, sponsorship_revenue, artist_expenses, staff_expenses,
+                                  total_revenue, total_expenses, net_profit)
+    SELECT m.eventID, NOW(), m.budget, m.venue_cost, m.tickets_sold,
+           m.ticket_revenue, m.sponsorship_revenue, m.artist_expenses, m.staff_expenses,
+           m.ticket_revenue + m.sponsorship_revenue,
+           m.venue_cost + m.artist_expenses + m.staff_expenses,
+           m.ticket_revenue + m.sponsorship_revenue - m.venue_cost - m.artist_expenses - m.staff_expenses
+    FROM (
+        SELECT e.eventID, e.budget, v.cost AS venue_cost,
+               (SELECT COALESCE(SUM(ei.sold), 0) FROM event_inventory ei
+                WHERE ei.eventID = e.eventID) AS tickets_sold,
+               (SELECT COALESCE(SUM(ei.revenue), 0) FROM event_inventory ei
+                WHERE ei.eventID = e.eventID) AS ticket_revenue,
+               (SELECT COALESCE(SUM(se.amount), 0) FROM sponsors_event se
+                WHERE se.eventID = e.eventID) AS sponsorship_revenue,
+               (SELECT COALESCE(SUM(ar.fee), 0) FROM performs p JOIN Artist ar ON p.artistID = ar.artistID
+                WHERE p.eventID = e.eventID) AS artist_expenses,
+               (SELECT COALESCE(SUM(s.salary), 0) FROM works_at wa JOIN Staff s ON wa.staffID = s.staffID
+                WHERE wa.eventID = e.eventID) AS staff_expenses
+        FROM Events e
+        JOIN Venue v ON e.venueID = v.venueID
+        WHERE e.status = 'Completed'
+        AND (event_id IS NULL OR e.eventID = event_id)
+        AND NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = e.eventID)
+    ) m;
+END //
+DELIMITER ;
+
+-- 7. Reopen a completed event: back to Planned, its settlement discarded so the
+-- live figures apply again until it is completed (and closed) once more
+DELIMITER //
+CREATE PROCEDURE Reopen_Event(IN event_id INT)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        SET @reopen_event_id = NULL;
+        RESIGNAL;
+    END;
+
+    SET @reopen_event_id = event_id;
+    UPDATE Events SET status = 'Planned' WHERE eventID = event_id AND status = 'Completed';
+    IF ROW_COUNT() > 0 THEN
+        DELETE FROM event_settlement WHERE eventID = event_id;
+    END IF;
+    SET @reopen_event_id = NULL;
+END //
+DELIMITER ;
+
 -- REPORT PROCEDURES (Using Functions Above)
 
 -- Report 1: Events with Venue Capacity & Tickets Sold
@@ -797,12 +1582,21 @@ BEGIN
         v.name AS venue_name,
         v.type AS venue_type,
         v.capacity AS venue_capacity,
-        (SELECT COUNT(*) FROM Ticket WHERE eventID = e.eventID) AS total_tickets,
-        Get_Tickets_Sold_Count(e.eventID) AS tickets_sold,
-        Get_Available_Tickets_Count(e.eventID) AS tickets_available,
-        Get_Event_Revenue(e.eventID) AS revenue
+        COALESCE(inv.total, 0) AS total_tickets,
+        COALESCE(st.tickets_sold, inv.sold, 0) AS tickets_sold,
+        COALESCE(inv.available, 0) AS tickets_available,
+        COALESCE(st.ticket_revenue, inv.revenue, 0) AS revenue
     FROM Events e
     JOIN Venue v ON e.venueID = v.venueID
+    -- Closed events report their frozen figures
+    LEFT JOIN event_settlement st ON st.eventID = e.eventID
+    -- One pass over the per-tier counters instead of four lookups per event
+    LEFT JOIN (
+        SELECT eventID, SUM(total) AS total, SUM(sold) AS sold,
+               SUM(available) AS available, SUM(revenue) AS revenue
+        FROM event_inventory
+        GROUP BY eventID
+    ) inv ON inv.eventID = e.eventID
     ORDER BY e.date;
 END //
 DELIMITER ;
@@ -853,6 +1647,7 @@ BEGIN
         Get_Artist_Count(e.eventID) AS artist_count,
         GROUP_CONCAT(ar.name SEPARATOR ', ') AS artist_names,
         SUM(p.noOfSongs) AS total_songs,
+        -- The settled fees for closed events
         Get_Total_Artist_Fees(e.eventID) AS total_artist_fees
     FROM Events e
     LEFT JOIN performs p ON e.eventID = p.eventID
@@ -895,13 +1690,11 @@ BEGIN
         e.date,
         v.name AS venue_name,
         v.capacity,
-        COUNT(t.ticketID) AS total_tickets,
-        COUNT(CASE WHEN t.status = 'SOLD' THEN 1 END) AS tickets_sold,
-        ROUND((COUNT(CASE WHEN t.status = 'SOLD' THEN 1 END) * 100.0 / v.capacity), 2) AS occupancy_percentage
+        Get_Total_Tickets_Count(e.eventID) AS total_tickets,
+        Get_Tickets_Sold_Count(e.eventID) AS tickets_sold,
+        ROUND((Get_Tickets_Sold_Count(e.eventID) * 100.0 / v.capacity), 2) AS occupancy_percentage
     FROM Events e
     JOIN Venue v ON e.venueID = v.venueID
-    LEFT JOIN Ticket t ON e.eventID = t.eventID
-    GROUP BY e.eventID, e.name, e.date, v.name, v.capacity
     ORDER BY e.date;
 END //
 DELIMITER ;
@@ -913,12 +1706,19 @@ BEGIN
     SELECT 
         v.venueID,
         v.name AS venue_name,
-        COUNT(DISTINCT e.eventID) AS total_events,
-        COALESCE(SUM(CASE WHEN t.status = 'SOLD' THEN t.price ELSE 0 END), 0) AS total_revenue,
-        COALESCE(AVG(CASE WHEN t.status = 'SOLD' THEN t.price END), 0) AS avg_ticket_price
+        COUNT(e.eventID) AS total_events,
+        COALESCE(SUM(COALESCE(st.ticket_revenue, inv.revenue)), 0) AS total_revenue,
+        COALESCE(SUM(COALESCE(st.ticket_revenue, inv.revenue))
+                 / NULLIF(SUM(COALESCE(st.tickets_sold, inv.sold)), 0), 0) AS avg_ticket_price
     FROM Venue v
     LEFT JOIN Events e ON v.venueID = e.venueID
-    LEFT JOIN Ticket t ON e.eventID = t.eventID
+    -- Closed events from their settlement, open ones from the live counters
+    LEFT JOIN event_settlement st ON st.eventID = e.eventID
+    LEFT JOIN (
+        SELECT eventID, SUM(sold) AS sold, SUM(revenue) AS revenue
+        FROM event_inventory
+        GROUP BY eventID
+    ) inv ON inv.eventID = e.eventID
     GROUP BY v.venueID, v.name
     ORDER BY total_revenue DESC;
 END //
@@ -1061,28 +1861,120 @@ BEGIN
 END //
 DELIMITER ;
 
--- Get event financial summary (Using Functions)
+-- Get event financial summary
 DELIMITER //
 CREATE PROCEDURE Get_Event_Financial_Summary(IN event_id INT)
+BEGIN
+    -- Closed events are served from their settlement
+    IF EXISTS (SELECT 1 FROM event_settlement WHERE eventID = event_id) THEN
+        SELECT 
+            e.eventID,
+            e.name AS event_name,
+            st.budget,
+            st.venue_cost,
+            st.ticket_revenue,
+            st.sponsorship_revenue,
+            st.artist_expenses,
+            st.staff_expenses,
+            st.total_revenue,
+            st.total_expenses,
+            st.net_profit
+        FROM event_settlement st
+        JOIN Events e ON e.eventID = st.eventID
+        WHERE st.eventID = event_id;
+    ELSE
+        SELECT 
+            e.eventID,
+            e.name AS event_name,
+            e.budget,
+            v.cost AS venue_cost,
+            m.revenue AS ticket_revenue,
+            m.sponsorship AS sponsorship_revenue,
+            m.artist_fees AS artist_expenses,
+            m.staff_cost AS staff_expenses,
+            (m.revenue + m.sponsorship) AS total_revenue,
+            (v.cost + m.artist_fees + m.staff_cost) AS total_expenses,
+            (m.revenue + m.sponsorship - v.cost - m.artist_fees - m.staff_cost) AS net_profit
+        FROM Events e
+        JOIN Venue v ON e.venueID = v.venueID
+        -- Each source read once, as in Get_Event_Statistics
+        CROSS JOIN (
+            SELECT
+                (SELECT COALESCE(SUM(revenue), 0) FROM event_inventory WHERE eventID = event_id) AS revenue,
+                (SELECT COALESCE(SUM(amount), 0) FROM sponsors_event WHERE eventID = event_id) AS sponsorship,
+                (SELECT COALESCE(SUM(ar.fee), 0) FROM performs p JOIN Artist ar ON p.artistID = ar.artistID
+                 WHERE p.eventID = event_id) AS artist_fees,
+                (SELECT COALESCE(SUM(s.salary), 0) FROM works_at wa JOIN Staff s ON wa.staffID = s.staffID
+                 WHERE wa.eventID = event_id) AS staff_cost
+        ) m
+        WHERE e.eventID = event_id;
+    END IF;
+END //
+DELIMITER ;
+
+-- Get the metrics of many events at once, e.g. CALL Get_Event_Metrics('[1, 2, 3]')
+-- One grouped pass per source table for all listed events (eventMetrics.py
+-- builds the same query for just the metrics it is asked for). IDs listed
+-- twice are read once, so no sum is counted twice.
+DELIMITER //
+CREATE PROCEDURE Get_Event_Metrics(IN event_ids JSON)
 BEGIN
     SELECT 
         e.eventID,
         e.name AS event_name,
-        e.budget,
-        v.cost AS venue_cost,
-        Get_Event_Revenue(event_id) AS ticket_revenue,
-        Get_Total_Sponsorship(event_id) AS sponsorship_revenue,
-        Get_Total_Artist_Fees(event_id) AS artist_expenses,
-        COALESCE(SUM(s.salary), 0) AS staff_expenses,
-        (Get_Event_Revenue(event_id) + Get_Total_Sponsorship(event_id)) AS total_revenue,
-        (v.cost + Get_Total_Artist_Fees(event_id) + COALESCE(SUM(s.salary), 0)) AS total_expenses,
-        Get_Event_Net_Profit(event_id) AS net_profit
-    FROM Events e
-    JOIN Venue v ON e.venueID = v.venueID
-    LEFT JOIN works_at wa ON e.eventID = wa.eventID
-    LEFT JOIN Staff s ON wa.staffID = s.staffID
-    WHERE e.eventID = event_id
-    GROUP BY e.eventID, e.name, e.budget, v.cost;
+        e.date,
+        COALESCE(inv.total_tickets, 0) AS total_tickets,
+        COALESCE(st.tickets_sold, inv.tickets_sold, 0) AS tickets_sold,
+        COALESCE(inv.available_tickets, 0) AS available_tickets,
+        COALESCE(st.ticket_revenue, inv.revenue, 0) AS revenue,
+        e.attendee_count AS attendees,
+        ROUND(e.attendee_count * 100.0 / v.capacity, 2) AS occupancy,
+        COALESCE(r.artist_count, 0) AS artist_count,
+        COALESCE(r.staff_count, 0) AS staff_count,
+        COALESCE(r.sponsor_count, 0) AS sponsor_count,
+        -- Closed events report their settlement figures
+        COALESCE(st.sponsorship_revenue, sp.sponsorship, 0) AS sponsorship,
+        COALESCE(st.artist_expenses, af.artist_fees, 0) AS artist_fees,
+        COALESCE(st.staff_expenses, sc.staff_cost, 0) AS staff_cost,
+        COALESCE(st.venue_cost, v.cost) AS venue_cost,
+        COALESCE(st.net_profit, COALESCE(inv.revenue, 0) + COALESCE(sp.sponsorship, 0)
+            - v.cost - COALESCE(af.artist_fees, 0) - COALESCE(sc.staff_cost, 0)) AS net_profit
+    FROM (SELECT DISTINCT eventID FROM JSON_TABLE(event_ids, '$[*]' COLUMNS (eventID INT PATH '$')) jt) ids
+    JOIN Events e ON e.eventID = ids.eventID
+    JOIN Venue v ON v.venueID = e.venueID
+    LEFT JOIN event_rollup r ON r.eventID = e.eventID
+    LEFT JOIN event_settlement st ON st.eventID = e.eventID
+    LEFT JOIN (
+        SELECT ei.eventID, SUM(ei.total) AS total_tickets, SUM(ei.sold) AS tickets_sold,
+               SUM(ei.available) AS available_tickets, SUM(ei.revenue) AS revenue
+        FROM (SELECT DISTINCT eventID FROM JSON_TABLE(event_ids, '$[*]' COLUMNS (eventID INT PATH '$')) jt) ids
+        JOIN event_inventory ei ON ei.eventID = ids.eventID
+        GROUP BY ei.eventID
+    ) inv ON inv.eventID = e.eventID
+    LEFT JOIN (
+        SELECT se.eventID, SUM(se.amount) AS sponsorship
+        FROM (SELECT DISTINCT eventID FROM JSON_TABLE(event_ids, '$[*]' COLUMNS (eventID INT PATH '$')) jt) ids
+        JOIN sponsors_event se ON se.eventID = ids.eventID
+        WHERE NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = ids.eventID)
+        GROUP BY se.eventID
+    ) sp ON sp.eventID = e.eventID
+    LEFT JOIN (
+        SELECT p.eventID, SUM(ar.fee) AS artist_fees
+        FROM (SELECT DISTINCT eventID FROM JSON_TABLE(event_ids, '$[*]' COLUMNS (eventID INT PATH '$')) jt) ids
+        JOIN performs p ON p.eventID = ids.eventID
+        JOIN Artist ar ON ar.artistID = p.artistID
+        WHERE NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = ids.eventID)
+        GROUP BY p.eventID
+    ) af ON af.eventID = e.eventID
+    LEFT JOIN (
+        SELECT wa.eventID, SUM(s.salary) AS staff_cost
+        FROM (SELECT DISTINCT eventID FROM JSON_TABLE(event_ids, '$[*]' COLUMNS (eventID INT PATH '$')) jt) ids
+        JOIN works_at wa ON wa.eventID = ids.eventID
+        JOIN Staff s ON s.staffID = wa.staffID
+        WHERE NOT EXISTS (SELECT 1 FROM event_settlement st WHERE st.eventID = ids.eventID)
+        GROUP BY wa.eventID
+    ) sc ON sc.eventID = e.eventID
+    ORDER BY e.date, e.eventID;
 END //
 DELIMITER ;
 
@@ -1099,36 +1991,35 @@ SELECT
     e.end_time,
     v.name AS venue_name,
     v.capacity,
-    COUNT(DISTINCT t.ticketID) AS total_tickets,
-    COUNT(DISTINCT CASE WHEN t.status = 'SOLD' THEN t.ticketID END) AS sold_tickets,
-    COUNT(DISTINCT att.attendeeID) AS registered_attendees,
-    COUNT(DISTINCT p.artistID) AS artist_count,
-    COUNT(DISTINCT wa.staffID) AS staff_count,
-    COUNT(DISTINCT se.sponsorID) AS sponsor_count
+    Get_Total_Tickets_Count(e.eventID) AS total_tickets,
+    Get_Tickets_Sold_Count(e.eventID) AS sold_tickets,
+    e.attendee_count AS registered_attendees,
+    COALESCE(r.artist_count, 0) AS artist_count,
+    COALESCE(r.staff_count, 0) AS staff_count,
+    COALESCE(r.sponsor_count, 0) AS sponsor_count
 FROM Events e
 JOIN Venue v ON e.venueID = v.venueID
-LEFT JOIN Ticket t ON e.eventID = t.eventID
-LEFT JOIN attends att ON e.eventID = att.eventID
-LEFT JOIN performs p ON e.eventID = p.eventID
-LEFT JOIN works_at wa ON e.eventID = wa.eventID
-LEFT JOIN sponsors_event se ON e.eventID = se.eventID
-GROUP BY e.eventID, e.name, e.date, e.status, e.start_time, e.end_time, v.name, v.capacity;
+LEFT JOIN event_rollup r ON r.eventID = e.eventID;
 
 -- View: Available Tickets
+-- Built from the seat ranges so LAZY events list their unmaterialized seats
+-- too; ticketID is NULL for a seat that has no Ticket row yet.
 CREATE VIEW view_available_tickets AS
 SELECT 
     t.ticketID,
-    t.type,
-    t.price,
-    t.seatNo,
+    sr.type,
+    sr.price,
+    CONCAT(sr.type, '-', seq.n) AS seatNo,
     e.eventID,
     e.name AS event_name,
     e.date AS event_date,
     v.name AS venue_name
-FROM Ticket t
-JOIN Events e ON t.eventID = e.eventID
+FROM seat_range sr
+JOIN seq_numbers seq ON seq.n BETWEEN sr.first_seat AND sr.last_seat
+JOIN Events e ON sr.eventID = e.eventID
 JOIN Venue v ON e.venueID = v.venueID
-WHERE t.status = 'AVAILABLE'
-ORDER BY e.date, t.type, t.price;
+LEFT JOIN Ticket t ON t.eventID = sr.eventID AND t.seatNo = CONCAT(sr.type, '-', seq.n)
+WHERE t.ticketID IS NULL OR t.status = 'AVAILABLE'
+ORDER BY e.date, sr.type, sr.price;
 
 
@@ -0,0 +1,71 @@
+import threading
+import mysql.connector
+from bookingEngine import placeholders
+
+
+class HoldSweeper(threading.Thread):
+    """Background thread that returns expired seat holds to general sale in small batches
+
+    on_release(event_id, seat_nos) is called, on this thread, with the seats
+    each sweep gave back, so a SeatAllocator can offer them again.
+    """
+
+    def __init__(self, pool, interval=30, batch_size=500, on_release=None):
+        super().__init__(name="HoldSweeper", daemon=True)
+        self.pool = pool
+        self.on_release = on_release
+        self.interval = interval
+        self.batch_size = batch_size
+        self.released_total = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                with self.pool.connection() as conn:
+                    released = self.sweep(conn)
+                if self.on_release:
+                    by_event = {}
+                    for event_id, seat_no in released:
+                        by_event.setdefault(event_id, []).append(seat_no)
+                    for event_id, seat_nos in by_event.items():
+                        self.on_release(event_id, seat_nos)
+            except mysql.connector.Error:
+                # Database unavailable; try again on the next tick
+                pass
+            self._stop_event.wait(self.interval)
+
+    def sweep(self, conn):
+        """Release every expired hold, committing after each batch to keep lock time short
+
+        Returns the (eventID, seatNo) of every released seat.
+        """
+        released = []
+        cursor = conn.cursor()
+        try:
+            while True:
+                # Lock the batch first so the rows released are exactly the rows reported
+                cursor.execute("""
+                    SELECT ticketID, eventID, seatNo FROM Ticket
+                    WHERE status = 'HELD' AND hold_expires_at <= NOW()
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                """, (self.batch_size,))
+                batch = cursor.fetchall()
+                if batch:
+                    cursor.execute(f"""
+                        UPDATE Ticket
+                        SET status = 'AVAILABLE', held_by = NULL, hold_expires_at = NULL
+                        WHERE ticketID IN ({placeholders(batch)})
+                    """, tuple(ticket_id for ticket_id, _, _ in batch))
+                conn.commit()
+                released += [(event_id, seat_no) for _, event_id, seat_no in batch]
+                if len(batch) < self.batch_size:
+                    break
+        finally:
+            cursor.close()
+        self.released_total += len(released)
+        return released
@@ -0,0 +1,89 @@
+# Fetch the next page once the end of the loaded rows is this close (fraction of the list)
+LOAD_AT = 0.9
+
+
+class PagedTree:
+    """Fills a ttk.Treeview one keyset page at a time, sorted on the server
+
+    fetch(sort, descending, after) returns (rows, after) like the repository
+    page methods and runs on the TaskRunner. reload() shows the first page;
+    the next one is fetched when the list is scrolled near its end, so first
+    paint and memory follow the page size and how far the user scrolls, not
+    the table size. Clicking a heading in `sorts` (heading -> sort name)
+    sorts on the server and starts from the first page again; a second
+    click reverses the order. Pages are fetched under key (default name),
+    which must tell apart lists whose fetch reads different rows.
+    """
+
+    def __init__(self, tree, scrollbar, tasks, name, fetch, row_values, sorts, sort, descending=False, key=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.tasks = tasks
+        self.name = name
+        self.key = key or name
+        self.fetch = fetch
+        self.row_values = row_values
+        self.sorts = sorts
+        self.sort = sort
+        self.descending = descending
+        self.after = None
+        self.exhausted = True
+        self.pending = None
+        self.generation = 0
+        self.headings = {column: tree.heading(column, "text") for column in tree["columns"]}
+        for heading in sorts:
+            tree.heading(heading, command=lambda h=heading: self.sort_by(h))
+        tree.configure(yscrollcommand=self.on_scroll)
+        self.show_sort()
+
+    def reload(self):
+        """Start again from the first page, e.g. after a change"""
+        self.generation += 1
+        self.tree.delete(*self.tree.get_children())
+        self.after = None
+        self.exhausted = False
+        self.pending = None
+        self.load_more()
+
+    def load_more(self):
+        # A page cancelled from the busy bar is no longer in flight and may be asked for again
+        if self.exhausted or self.pending in self.tasks.in_flight:
+            return
+        generation, sort, descending, after = self.generation, self.sort, self.descending, self.after
+
+        def show(page):
+            if generation != self.generation or not self.tree.winfo_exists():
+                # Reloaded, sorted differently or closed meanwhile
+                return
+            rows, self.after = page
+            self.exhausted = self.after is None
+            for row in rows:
+                self.tree.insert("", "end", values=self.row_values(row))
+
+        def failed(e):
+            if generation == self.generation:
+                # Stop fetching on scroll; the next reload tries again
+                self.exhausted = True
+
+        # Two pagers asking for the same page share one fetch, so the key spells out the query
+        self.pending = (self.key, generation, sort, descending, after)
+        self.tasks.submit(self.pending, lambda: self.fetch(sort, descending, after), show,
+                          f"Failed to load {self.name}", f"Loading {self.name}", failed)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= LOAD_AT:
+            self.load_more()
+
+    def sort_by(self, heading):
+        sort = self.sorts[heading]
+        self.descending = not self.descending if sort == self.sort else False
+        self.sort = sort
+        self.show_sort()
+        self.reload()
+
+    def show_sort(self):
+        for heading, text in self.headings.items():
+            if self.sorts.get(heading) == self.sort:
+                text += " ▼" if self.descending else " ▲"
+            self.tree.heading(heading, text=text)
@@ -0,0 +1,74 @@
+import threading
+
+
+# Tables each report reads. Events pulls in Venue as well: deleting a venue
+# cascades to its events without firing the Events triggers.
+REPORT_TABLES = {
+    "Report_Events_Venue_Tickets": ("Events", "Venue", "event_inventory", "event_settlement"),
+    "Report_Top_Attended_Events": ("Events", "Venue", "attends"),
+    "Report_Sponsor_Contributions": ("Events", "Venue", "sponsors_event", "Sponsor"),
+    "Report_Artist_Performances": ("Events", "Venue", "performs", "Artist", "event_settlement"),
+    "Report_Attendee_Demographics": ("Attendee",),
+    "Query_Revenue_Per_Venue": ("Events", "Venue", "event_inventory", "event_settlement"),
+}
+
+# One round trip for all versions: a single data_version row per table
+VERSIONS_QUERY = "SELECT name, version FROM data_version"
+
+
+class ReportCache:
+    """Stored procedure results kept until a table they read changes"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+        # call() runs on the TaskRunner's worker threads
+        self.lock = threading.Lock()
+
+    def versions(self):
+        with self.pool.reading() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(VERSIONS_QUERY)
+                return {name: version for name, version in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def call(self, procedure_name, params=()):
+        """List of (column_names, rows) per result set, from the cache while its tables are unchanged"""
+        if procedure_name not in REPORT_TABLES:
+            raise ValueError(f"No table list for {procedure_name}; it cannot be cached")
+        versions = self.versions()
+        current = tuple(versions.get(table) for table in REPORT_TABLES[procedure_name])
+        key = (procedure_name, tuple(params))
+        cached = self.results.get(key)
+        if cached and cached[0] == current:
+            with self.lock:
+                self.hits += 1
+            return cached[1]
+
+        # Versions are read before the report runs, so a write landing in
+        # between only makes the next call miss, never serves stale rows
+        with self.lock:
+            self.misses += 1
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.callproc(procedure_name, list(params))
+                results = [(result.column_names, result.fetchall()) for result in cursor.stored_results()]
+            finally:
+                cursor.close()
+        self.results[key] = (current, results)
+        return results
+
+    def clear(self):
+        self.results.clear()
+
+    def stats(self):
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        rate = hits * 100.0 / total if total else 0
+        return f"cache hits {hits} / misses {misses} ({rate:.0f}% hit rate)"
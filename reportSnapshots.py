@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+import mysql.connector
+from reportStream import CHUNK_ROWS
+
+
+# Reports worth precomputing: full scans that managers refresh all day
+SNAPSHOT_REPORTS = (
+    "Report_Events_Venue_Tickets",
+    "Query_Revenue_Per_Venue",
+    "Report_Top_Attended_Events",
+    "Report_Attendee_Demographics",
+)
+
+
+class ReportSnapshots:
+    """Stores and reads the latest precomputed result of each snapshot report"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def refresh(self, report):
+        """Run the report and replace its snapshot; returns the number of rows"""
+        if report not in SNAPSHOT_REPORTS:
+            raise ValueError(f"{report} is not a snapshot report")
+        started = time.perf_counter()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.callproc(report)
+                results = list(cursor.stored_results())
+                result = results[0] if results else None
+                columns = list(result.column_names) if result else []
+                # callproc buffers its result sets, so the count is known before reading
+                row_count = result.rowcount if result else 0
+                conn.rollback()
+                duration_ms = int((time.perf_counter() - started) * 1000)
+
+                # The header row is written first so concurrent refreshes of one
+                # report queue up on its lock; readers keep seeing the old
+                # snapshot until the commit
+                cursor.execute("""
+                    INSERT INTO report_snapshot (report, generated_at, duration_ms, row_count, columns)
+                    VALUES (%s, NOW(), %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE generated_at = VALUES(generated_at), duration_ms = VALUES(duration_ms),
+                                            row_count = VALUES(row_count), columns = VALUES(columns)
+                """, (report, duration_ms, row_count, json.dumps(columns)))
+                cursor.execute("DELETE FROM report_snapshot_row WHERE report = %s", (report,))
+                # Encoded and inserted a chunk at a time, in the same transaction
+                row_no = 0
+                while result is not None:
+                    rows = result.fetchmany(CHUNK_ROWS)
+                    if not rows:
+                        break
+                    cursor.executemany("INSERT INTO report_snapshot_row (report, row_no, data) VALUES (%s, %s, %s)",
+                                       [(report, row_no + i, json.dumps(list(row), default=str))
+                                        for i, row in enumerate(rows)])
+                    row_no += len(rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        return row_no
+
+    @contextmanager
+    def open(self, report, chunk_rows=CHUNK_ROWS):
+        """(generated_at, duration_ms, columns, chunks) of the stored snapshot, computed first if there is none yet
+
+        chunks yields lists of up to chunk_rows rows read from an unbuffered
+        cursor, so only one chunk is in memory however large the snapshot.
+        The connection stays checked out until the with block ends; consume
+        chunks inside it, on the same thread.
+        """
+        with self.pool.connection() as conn:
+            header = self.header(conn, report)
+            if header is None:
+                self.refresh(report)
+                header = self.header(conn, report)
+            columns = json.loads(header['columns'])
+            cursor = conn.cursor(buffered=False)
+            done = True
+
+            def chunks():
+                nonlocal done
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        done = True
+                        return
+                    yield [dict(zip(columns, json.loads(data))) for (data,) in rows]
+
+            try:
+                cursor.execute("SELECT data FROM report_snapshot_row WHERE report = %s ORDER BY row_no", (report,))
+                done = False
+                yield header['generated_at'], header['duration_ms'], columns, chunks()
+            finally:
+                if not done:
+                    # Left early: skip the unread rows so the connection can be reused
+                    conn.consume_results()
+                cursor.close()
+
+    def header(self, conn, report):
+        cursor = conn.cursor(dictionary=True, buffered=True)
+        try:
+            cursor.execute("""SELECT generated_at, duration_ms, columns FROM report_snapshot
+                              WHERE report = %s""", (report,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+class ReportSnapshotter(threading.Thread):
+    """Background thread that recomputes the snapshot reports every `interval` seconds"""
+
+    def __init__(self, pool, interval=300, reports=SNAPSHOT_REPORTS):
+        super().__init__(name="ReportSnapshotter", daemon=True)
+        self.pool = pool
+        self.interval = interval
+        self.reports = reports
+        self.refreshed_total = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        snapshots = ReportSnapshots(self.pool)
+        while not self._stop_event.is_set():
+            try:
+                for report in self.reports:
+                    if self._stop_event.is_set():
+                        break
+                    # One checkout per report, so a long tick never holds a connection between reports
+                    snapshots.refresh(report)
+                    self.refreshed_total += 1
+            except mysql.connector.Error:
+                # Database unavailable; try again on the next tick
+                pass
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+
+# Rows read from the server and formatted at a time
+CHUNK_ROWS = 500
+# Chunks the reader may get ahead of the window before it waits
+MAX_CHUNKS = 4
+# Column widths come from the first chunk; longer values just push the line out
+MIN_WIDTH = 15
+MAX_WIDTH = 40
+# A reader the window has not listened to for this long (closed, crashed) gives up
+STALL_TIMEOUT = 60
+
+
+class StreamCancelled(Exception):
+    pass
+
+
+class ReportStream:
+    """Bounded hand-off of formatted report text from a worker thread to the Tk thread
+
+    write() blocks while the window is MAX_CHUNKS behind, so only a few
+    chunks are held in memory however long the report is. read() returns
+    everything written so far as one string, so the window inserts it with
+    a single call instead of one per row.
+    """
+
+    def __init__(self, max_chunks=MAX_CHUNKS):
+        self.chunks = queue.Queue(max_chunks)
+        self.cancelled = threading.Event()
+
+    def write(self, text):
+        stalled_at = time.monotonic() + STALL_TIMEOUT
+        while not self.cancelled.is_set() and time.monotonic() < stalled_at:
+            try:
+                self.chunks.put(text, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise StreamCancelled("Report stream cancelled")
+
+    def read(self):
+        texts = []
+        while True:
+            try:
+                texts.append(self.chunks.get_nowait())
+            except queue.Empty:
+                return "".join(texts)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def chunked(rows, size=CHUNK_ROWS):
+    """Rows already in memory as chunks, for write_report"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def column_widths(columns, sample):
+    """Width of each column for a sample of its rows"""
+    widths = {}
+    for col in columns:
+        longest = max((len(str(row[col])) for row in sample if row[col] is not None), default=0)
+        widths[col] = max(len(str(col)), MIN_WIDTH, min(longest, MAX_WIDTH))
+    return widths
+
+
+def format_rows(columns, widths, rows):
+    lines = []
+    for row in rows:
+        lines.append(" | ".join(str(row[col] if row[col] is not None else '').ljust(widths[col]) for col in columns))
+    return "\n".join(lines) + "\n"
+
+
+def write_report(write, title, source, result_sets, max_rows=None):
+    """Format a report into write(text) a chunk at a time; returns the number of rows
+
+    result_sets yields (columns, chunks) per result set, where chunks yields
+    lists of row dicts. Rows past max_rows are counted but not written.
+    """
+    write(f"{'='*100}\n{title}\n{source}\n{'='*100}\n\n")
+    total = 0
+    for columns, chunks in result_sets:
+        widths = None
+        count = shown = 0
+        for rows in chunks:
+            if widths is None:
+                widths = column_widths(columns, rows)
+                header = " | ".join(str(col).ljust(widths[col]) for col in columns)
+                write(header + "\n" + "-" * len(header) + "\n")
+            count += len(rows)
+            if max_rows is not None:
+                rows = rows[:max(max_rows - shown, 0)]
+            if rows:
+                write(format_rows(columns, widths, rows))
+                shown += len(rows)
+        if not count:
+            write("No data found.\n\n")
+        elif shown < count:
+            write(f"\n{count} rows returned; the first {shown} are shown, save to a file for all of them.\n\n")
+        else:
+            write(f"\n{count} rows returned.\n\n")
+        total += count
+    return total
@@ -0,0 +1,478 @@
+import threading
+import weakref
+import mysql.connector
+
+
+# Rows per page of the entity lists
+PAGE_SIZE = 200
+
+
+def page_sql(sql, order, descending=False, keyset=False):
+    """The statement fetch_page runs for sql: sorted by the order columns, LIMIT %s
+
+    With keyset, it only reads past a previous page's last row; its
+    parameters follow sql's own as after[0], then after[:1], after[:2], ...
+    """
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    where = ""
+    if keyset:
+        # (c1, c2, ...) > (v1, v2, ...) spelled out, plus c1 >= v1 as a range MySQL can read from an index
+        terms = [" AND ".join([f"{c} = %s" for c in order[:i]] + [f"{column} {op} %s"])
+                 for i, column in enumerate(order)]
+        where = f" WHERE {order[0]} {op}= %s AND (({') OR ('.join(terms)}))"
+    order_by = ", ".join(f"{column} {direction}" for column in order)
+    return f"SELECT * FROM ({sql}) page{where} ORDER BY {order_by} LIMIT %s"
+
+
+class StatementCache:
+    """Server-side prepared statements of the pool's connections, each SQL text prepared once per connection
+
+    Every call checks out a connection for just that statement (or reuses the
+    one the thread already holds, e.g. inside a booking transaction). A
+    prepared cursor keeps one statement, so there is a cursor per connection
+    and SQL text. Prepared statements do not survive a reconnect; a
+    connection's cursors start over when its connection ID changes.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connections = weakref.WeakKeyDictionary()  # connection -> (connection ID, {sql: cursor})
+        self.lock = threading.Lock()
+
+    def _cursor(self, conn, sql):
+        with self.lock:
+            connection_id, cursors = self.connections.get(conn, (None, None))
+            if connection_id != conn.connection_id:
+                connection_id, cursors = conn.connection_id, {}
+                self.connections[conn] = (connection_id, cursors)
+        # A connection is only used by the thread that checked it out
+        cursor = cursors.get(sql)
+        if cursor is None:
+            cursor = cursors[sql] = conn.cursor(prepared=True, dictionary=True)
+        return cursor
+
+    def fetch_all(self, sql, params=()):
+        with self.pool.reading() as conn:
+            cursor = self._cursor(conn, sql)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def fetch_one(self, sql, params=()):
+        # Always drain the result: an unread row would block the next statement
+        rows = self.fetch_all(sql, params)
+        return rows[0] if rows else None
+
+    def fetch_page(self, sql, params=(), order=(), descending=False, after=None, limit=PAGE_SIZE):
+        """One page of the rows of sql sorted by the order columns; returns (rows, after for the next page)
+
+        Keyset pagination: the last order column must make the order unique
+        (the ID), and `after` holds those columns' values in the previous
+        page's last row. Every page then reads only its own rows, where an
+        OFFSET would re-read all the rows before it. sql is wrapped as a
+        derived table, which MySQL merges into the outer query, so the order
+        columns are the names sql gives its columns. The next `after` is None
+        on the last page.
+        """
+        if after is not None:
+            params = (*params, after[0], *[value for i in range(len(order)) for value in after[:i + 1]])
+        rows = self.fetch_all(page_sql(sql, order, descending, after is not None), (*params, limit))
+        if len(rows) < limit:
+            return rows, None
+        return rows, tuple(rows[-1][column] for column in order)
+
+    def execute(self, sql, params=()):
+        """Run a write inside the caller's transaction; returns the cursor for rowcount / lastrowid"""
+        with self.pool.connection() as conn:
+            cursor = self._cursor(conn, sql)
+            cursor.execute(sql, params)
+            return cursor
+
+    def write(self, sql, params=()):
+        """Run a write in its own transaction; returns the new row ID (for inserts)"""
+        with self.pool.connection() as conn:
+            try:
+                cursor = self._cursor(conn, sql)
+                cursor.execute(sql, params)
+                conn.commit()
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
+            return cursor.lastrowid
+
+    def close(self):
+        with self.lock:
+            connections, self.connections = list(self.connections.values()), weakref.WeakKeyDictionary()
+        for _, cursors in connections:
+            for cursor in cursors.values():
+                try:
+                    cursor.close()
+                except mysql.connector.Error:
+                    pass
+
+
+class Events:
+    # Sort name -> order columns, ending in the ID so the order is unique
+    ORDERS = {
+        "eventID": ("eventID",),
+        "name": ("name", "eventID"),
+        "date": ("date", "eventID"),
+        "status": ("status", "eventID"),
+        "budget": ("budget", "eventID"),
+        "venue": ("venue", "eventID"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def page(self, sort="date", descending=True, after=None, limit=PAGE_SIZE):
+        """One page of the events list with their venue; see StatementCache.fetch_page"""
+        return self.statements.fetch_page("""
+            SELECT e.eventID, e.name, e.date, e.status,
+                   CONCAT(e.start_time, '-', e.end_time) as time,
+                   e.budget, v.name as venue
+            FROM Events e
+            JOIN Venue v ON e.venueID = v.venueID
+        """, (), self.ORDERS[sort], descending, after, limit)
+
+    def get(self, event_id):
+        return self.statements.fetch_one("SELECT * FROM Events WHERE eventID = %s", (event_id,))
+
+    def status(self, event_id):
+        row = self.statements.fetch_one("SELECT status FROM Events WHERE eventID = %s", (event_id,))
+        return row['status'] if row else None
+
+    def create(self, values):
+        """values: name, date, status, start_time, end_time, budget, venueID, inventory_mode"""
+        return self.statements.write("""INSERT INTO Events (name, date, status, start_time, end_time, budget, venueID, inventory_mode)
+                                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""", values)
+
+    def update(self, event_id, values):
+        """values: name, date, status, start_time, end_time, budget, venueID"""
+        self.statements.write("""UPDATE Events SET name=%s, date=%s, status=%s, start_time=%s,
+                                 end_time=%s, budget=%s, venueID=%s WHERE eventID=%s""", (*values, event_id))
+
+    def delete(self, event_id):
+        self.statements.write("DELETE FROM Events WHERE eventID = %s", (event_id,))
+
+    def upcoming(self, limit=20):
+        """Events from today on, with their venue, for the dashboard"""
+        return self.statements.fetch_all("""
+            SELECT e.eventID, e.name, e.date, v.name as venue, e.status
+            FROM Events e
+            JOIN Venue v ON e.venueID = v.venueID
+            WHERE e.date >= CURDATE()
+            ORDER BY e.date
+            LIMIT %s
+        """, (limit,))
+
+    def on_sale(self):
+        """Planned events from today on, for the customer event browser"""
+        return self.statements.fetch_all("""
+            SELECT e.eventID, e.name, e.date, e.start_time, v.name as venue_name, e.status
+            FROM Events e
+            JOIN Venue v ON e.venueID = v.venueID
+            WHERE e.status = 'Planned' AND e.date >= CURDATE()
+            ORDER BY e.date
+        """)
+
+    def details(self, event_id):
+        return self.statements.fetch_one("""
+            SELECT e.*, v.name as venue_name, v.address, v.capacity, v.type as venue_type
+            FROM Events e
+            JOIN Venue v ON e.venueID = v.venueID
+            WHERE e.eventID = %s
+        """, (event_id,))
+
+    def artists(self, event_id):
+        return self.statements.fetch_all("""
+            SELECT a.name, a.genre, p.noOfSongs
+            FROM Artist a
+            JOIN performs p ON a.artistID = p.artistID
+            WHERE p.eventID = %s
+        """, (event_id,))
+
+    def tiers(self, event_id):
+        """Per-tier totals, availability and price from the inventory counters"""
+        return self.statements.fetch_all("""
+            SELECT ei.type, ei.total, ei.available, sr.price
+            FROM event_inventory ei
+            JOIN (
+                SELECT type, MIN(price) AS price, MIN(first_seat) AS first_seat
+                FROM seat_range
+                WHERE eventID = %s
+                GROUP BY type
+            ) sr ON sr.type = ei.type
+            WHERE ei.eventID = %s
+            ORDER BY sr.first_seat
+        """, (event_id, event_id))
+
+
+class Venues:
+    ORDERS = {
+        "venueID": ("venueID",),
+        "name": ("name", "venueID"),
+        "type": ("type", "venueID"),
+        "capacity": ("capacity", "venueID"),
+        "cost": ("cost", "venueID"),
+        "address": ("address", "venueID"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def page(self, sort="name", descending=False, after=None, limit=PAGE_SIZE):
+        return self.statements.fetch_page("SELECT * FROM Venue", (), self.ORDERS[sort], descending, after, limit)
+
+    def get(self, venue_id):
+        return self.statements.fetch_one("SELECT * FROM Venue WHERE venueID = %s", (venue_id,))
+
+    def create(self, values):
+        """values: name, type, address, country, pincode, capacity, cost"""
+        return self.statements.write("""INSERT INTO Venue (name, type, address, country, pincode, capacity, cost)
+                                        VALUES (%s, %s, %s, %s, %s, %s, %s)""", values)
+
+    def update(self, venue_id, values):
+        self.statements.write("""UPDATE Venue SET name=%s, type=%s, address=%s, country=%s,
+                                 pincode=%s, capacity=%s, cost=%s WHERE venueID=%s""", (*values, venue_id))
+
+    def delete(self, venue_id):
+        self.statements.write("DELETE FROM Venue WHERE venueID = %s", (venue_id,))
+
+
+class Tickets:
+    # Sort name -> seat_range columns the event's ranges are listed by; seats follow in number order
+    ORDERS = {
+        "type": ("type",),
+        "price": ("price", "type"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def available(self, event_id, sort="type", descending=False, after=None, limit=PAGE_SIZE):
+        """One page of the unsold seats of an event, (rows, after) like StatementCache.fetch_page
+
+        Seats come from the event's seat ranges; LAZY events have no Ticket
+        row (and so no ticket ID) until a seat is held or sold. The event's
+        few ranges are sorted here and each is read in seat number order from
+        where the previous page stopped, so a page reads about its own rows
+        through the seq_numbers key instead of sorting the whole venue.
+        """
+        ranges = self.statements.fetch_all("""
+            SELECT type, price, first_seat, last_seat FROM seat_range WHERE eventID = %s ORDER BY type, first_seat
+        """, (event_id,))
+        ranges.sort(key=lambda r: (*(r[column] for column in self.ORDERS[sort]), r["first_seat"]),
+                    reverse=descending)
+        if after is not None:
+            after_type, after_first_seat, after_seat = after
+            ranges = ranges[[(r["type"], r["first_seat"]) for r in ranges].index((after_type, after_first_seat)):]
+        if descending:
+            seek = "seq.n < %s ORDER BY seq.n DESC"
+        else:
+            seek = "seq.n > %s ORDER BY seq.n"
+        rows = []
+        for i, seat_range in enumerate(ranges):
+            if after is not None and i == 0:
+                start = after_seat
+            else:
+                start = seat_range["last_seat"] + 1 if descending else seat_range["first_seat"] - 1
+            rows += self.statements.fetch_all(f"""
+                SELECT t.ticketID, sr.type, seq.n as seat_number, CONCAT(sr.type, '-', seq.n) as seatNo,
+                       COALESCE(t.price, sr.price) as price, 'AVAILABLE' as status
+                FROM seat_range sr
+                JOIN seq_numbers seq ON seq.n BETWEEN sr.first_seat AND sr.last_seat
+                LEFT JOIN Ticket t ON t.eventID = sr.eventID AND t.seatNo = CONCAT(sr.type, '-', seq.n)
+                WHERE sr.eventID = %s AND sr.type = %s AND sr.first_seat = %s
+                  AND (t.ticketID IS NULL OR t.status = 'AVAILABLE') AND {seek} LIMIT %s
+            """, (event_id, seat_range["type"], seat_range["first_seat"], start, limit - len(rows)))
+            if len(rows) == limit:
+                return rows, (seat_range["type"], seat_range["first_seat"], rows[-1]["seat_number"])
+        return rows, None
+
+    def purchased_by(self, attendee_id):
+        return self.statements.fetch_all("""
+            SELECT t.ticketID, e.eventID, e.name, e.date, t.seatNo, t.price, e.status
+            FROM purchases p
+            JOIN Ticket t ON t.ticketID = p.ticketID
+            JOIN Events e ON e.eventID = t.eventID
+            WHERE p.attendeeID = %s
+            ORDER BY e.date DESC, t.seatNo
+        """, (attendee_id,))
+
+
+class Artists:
+    ORDERS = {
+        "artistID": ("artistID",),
+        "name": ("name", "artistID"),
+        "genre": ("genre", "artistID"),
+        "country": ("country", "artistID"),
+        "phone_no": ("phone_no",),
+        "fee": ("fee", "artistID"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def page(self, sort="name", descending=False, after=None, limit=PAGE_SIZE):
+        return self.statements.fetch_page("SELECT * FROM Artist", (), self.ORDERS[sort], descending, after, limit)
+
+    def get(self, artist_id):
+        return self.statements.fetch_one("SELECT * FROM Artist WHERE artistID = %s", (artist_id,))
+
+    def create(self, values):
+        """values: name, genre, country, phone_no, email, fee"""
+        return self.statements.write("""INSERT INTO Artist (name, genre, country, phone_no, email, fee)
+                                        VALUES (%s, %s, %s, %s, %s, %s)""", values)
+
+    def update(self, artist_id, values):
+        self.statements.write("""UPDATE Artist SET name=%s, genre=%s, country=%s, phone_no=%s,
+                                 email=%s, fee=%s WHERE artistID=%s""", (*values, artist_id))
+
+    def delete(self, artist_id):
+        self.statements.write("DELETE FROM Artist WHERE artistID = %s", (artist_id,))
+
+
+class Sponsors:
+    # Only NOT NULL columns can be keyset-sorted
+    ORDERS = {
+        "sponsorID": ("sponsorID",),
+        "name": ("name", "sponsorID"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def page(self, sort="name", descending=False, after=None, limit=PAGE_SIZE):
+        return self.statements.fetch_page("SELECT * FROM Sponsor", (), self.ORDERS[sort], descending, after, limit)
+
+    def get(self, sponsor_id):
+        return self.statements.fetch_one("SELECT * FROM Sponsor WHERE sponsorID = %s", (sponsor_id,))
+
+    def create(self, values):
+        """values: name, industry, contact_person, phone_no, email"""
+        return self.statements.write("""INSERT INTO Sponsor (name, industry, contact_person, phone_no, email)
+                                        VALUES (%s, %s, %s, %s, %s)""", values)
+
+    def update(self, sponsor_id, values):
+        self.statements.write("""UPDATE Sponsor SET name=%s, industry=%s, contact_person=%s,
+                                 phone_no=%s, email=%s WHERE sponsorID=%s""", (*values, sponsor_id))
+
+    def delete(self, sponsor_id):
+        self.statements.write("DELETE FROM Sponsor WHERE sponsorID = %s", (sponsor_id,))
+
+
+class Staff:
+    ORDERS = {
+        "staffID": ("staffID",),
+        "name": ("name", "staffID"),
+        "role": ("role", "name", "staffID"),
+    }
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def page(self, sort="role", descending=False, after=None, limit=PAGE_SIZE):
+        return self.statements.fetch_page("SELECT * FROM Staff", (), self.ORDERS[sort], descending, after, limit)
+
+    def get(self, staff_id):
+        return self.statements.fetch_one("SELECT * FROM Staff WHERE staffID = %s", (staff_id,))
+
+    def create(self, values):
+        """values: name, role, phone_no, email, salary"""
+        return self.statements.write("""INSERT INTO Staff (name, role, phone_no, email, salary)
+                                        VALUES (%s, %s, %s, %s, %s)""", values)
+
+    def update(self, staff_id, values):
+        self.statements.write("UPDATE Staff SET name=%s, role=%s, phone_no=%s, email=%s, salary=%s WHERE staffID=%s",
+                              (*values, staff_id))
+
+    def delete(self, staff_id):
+        self.statements.write("DELETE FROM Staff WHERE staffID = %s", (staff_id,))
+
+
+class Attendees:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def register(self, values):
+        """values: name, phone_no, email, gender, age; returns the new attendee ID"""
+        return self.statements.write("""INSERT INTO Attendee (name, phone_no, email, gender, age)
+                                        VALUES (%s, %s, %s, %s, %s)""", values)
+
+
+class Assignments:
+    """Artists, sponsors and staff linked to events"""
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def add_artist(self, artist_id, event_id, songs):
+        self.statements.write("INSERT INTO performs (artistID, eventID, noOfSongs) VALUES (%s, %s, %s)",
+                              (artist_id, event_id, songs))
+
+    def remove_artist(self, artist_id, event_id):
+        self.statements.write("DELETE FROM performs WHERE artistID = %s AND eventID = %s", (artist_id, event_id))
+
+    def add_sponsor(self, sponsor_id, event_id, amount):
+        self.statements.write("INSERT INTO sponsors_event (sponsorID, eventID, amount) VALUES (%s, %s, %s)",
+                              (sponsor_id, event_id, amount))
+
+    def remove_sponsor(self, sponsor_id, event_id):
+        self.statements.write("DELETE FROM sponsors_event WHERE sponsorID = %s AND eventID = %s",
+                              (sponsor_id, event_id))
+
+    def add_staff(self, staff_id, event_id, shift):
+        self.statements.write("INSERT INTO works_at (staffID, eventID, shift) VALUES (%s, %s, %s)",
+                              (staff_id, event_id, shift))
+
+    def remove_staff(self, staff_id, event_id):
+        self.statements.write("DELETE FROM works_at WHERE staffID = %s AND eventID = %s", (staff_id, event_id))
+
+
+class Reports:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def dashboard_counts(self):
+        """Dashboard totals in one round trip"""
+        return self.statements.fetch_one("""
+            SELECT (SELECT COUNT(*) FROM Events) AS events,
+                   (SELECT COUNT(*) FROM Events WHERE status = 'Planned') AS active_events,
+                   (SELECT COUNT(*) FROM Venue) AS venues,
+                   (SELECT COUNT(*) FROM Artist) AS artists,
+                   (SELECT COUNT(*) FROM Sponsor) AS sponsors,
+                   (SELECT COUNT(*) FROM Staff) AS staff
+        """)
+
+    def call(self, procedure_name, params=()):
+        """List of (column_names, rows) per result set of a stored procedure
+
+        Prepared cursors cannot CALL, so this goes through a plain cursor.
+        """
+        with self.statements.pool.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.callproc(procedure_name, list(params))
+                return [(result.column_names, result.fetchall()) for result in cursor.stored_results()]
+            finally:
+                cursor.close()
+
+
+class Repository:
+    """All portal data access through a connection pool, independent of the GUI"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.statements = StatementCache(pool)
+        self.events = Events(self.statements)
+        self.venues = Venues(self.statements)
+        self.tickets = Tickets(self.statements)
+        self.artists = Artists(self.statements)
+        self.sponsors = Sponsors(self.statements)
+        self.staff = Staff(self.statements)
+        self.attendees = Attendees(self.statements)
+        self.assignments = Assignments(self.statements)
+        self.reports = Reports(self.statements)
+
+    def close(self):
+        self.statements.close()
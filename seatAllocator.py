@@ -0,0 +1,234 @@
+import threading
+from bisect import bisect_left, insort
+from functools import partial
+from bookingEngine import BookingResult, HOLD_SECONDS, placeholders
+
+
+TICKET_TYPES = ("VIP", "PREMIUM", "GENERAL", "STUDENT")
+
+
+def seat_number(seat_no):
+    """Numeric part of a seat label such as 'VIP-12'"""
+    return int(seat_no.rsplit("-", 1)[1])
+
+
+def seat_type(seat_no):
+    """Ticket type part of a seat label such as 'VIP-12'"""
+    return seat_no.rsplit("-", 1)[0]
+
+
+class FreeSeats:
+    """Sorted free seat numbers for one event/ticket type"""
+
+    def __init__(self, numbers=()):
+        self.numbers = sorted(numbers)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, number):
+        i = bisect_left(self.numbers, number)
+        return i < len(self.numbers) and self.numbers[i] == number
+
+    def add(self, number):
+        if number not in self:
+            insort(self.numbers, number)
+
+    def remove(self, number):
+        if number in self:
+            del self.numbers[bisect_left(self.numbers, number)]
+
+    def best(self, quantity, prefer_contiguous=True):
+        """Lowest-numbered seats, as a consecutive block when one exists"""
+        numbers = self.numbers
+        if len(numbers) < quantity:
+            return None
+        if prefer_contiguous:
+            for i in range(len(numbers) - quantity + 1):
+                if numbers[i + quantity - 1] - numbers[i] == quantity - 1:
+                    return numbers[i:i + quantity]
+        return numbers[:quantity]
+
+
+class SeatAllocator:
+    """Picks and books the best available seats without listing every ticket to the client
+
+    The free-seat map is built from seat_range minus the seats that have been
+    held or sold, so it only ever reads the taken seats from Ticket and works
+    the same way for EAGER and LAZY events.
+    """
+
+    def __init__(self, pool, booking_engine, max_attempts=5):
+        self.pool = pool
+        self.booking_engine = booking_engine
+        self.max_attempts = max_attempts
+        self.free_seats = {}
+        self.lock = threading.Lock()
+
+    def rebuild(self, event_id=None):
+        """Reload the free-seat map for one event, or for every upcoming event"""
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                if event_id is None:
+                    event_filter = "IN (SELECT eventID FROM Events WHERE status = 'Planned' AND date >= CURDATE())"
+                    params = ()
+                else:
+                    event_filter = "= %s"
+                    params = (event_id,)
+                cursor.execute(f"""
+                    SELECT eventID, type, first_seat, last_seat
+                    FROM seat_range
+                    WHERE eventID {event_filter}
+                """, params)
+                ranges = cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT eventID, type, seatNo
+                    FROM Ticket
+                    WHERE eventID {event_filter} AND status != 'AVAILABLE'
+                """, params)
+                taken = cursor.fetchall()
+            finally:
+                cursor.close()
+
+        taken_numbers = {}
+        for row in taken:
+            taken_numbers.setdefault((row['eventID'], row['type']), set()).add(seat_number(row['seatNo']))
+
+        with self.lock:
+            if event_id is None:
+                self.free_seats.clear()
+            else:
+                for ticket_type in TICKET_TYPES:
+                    self.free_seats[(event_id, ticket_type)] = FreeSeats()
+            # A tier has more than one range once its venue has grown
+            free_numbers = {}
+            for row in ranges:
+                key = (row['eventID'], row['type'])
+                skip = taken_numbers.get(key, ())
+                free_numbers.setdefault(key, []).extend(n for n in range(row['first_seat'], row['last_seat'] + 1)
+                                                        if n not in skip)
+            for key, numbers in free_numbers.items():
+                self.free_seats[key] = FreeSeats(numbers)
+
+    def available(self, event_id, ticket_type):
+        """Number of free seats of a type, as currently known in memory"""
+        with self.lock:
+            loaded = (event_id, ticket_type) in self.free_seats
+        if not loaded:
+            self.rebuild(event_id)
+        with self.lock:
+            return len(self.free_seats.get((event_id, ticket_type), ()))
+
+    def release(self, event_id, seat_nos):
+        """Put seats whose hold was given up back into the free-seat map"""
+        with self.lock:
+            for seat_no in seat_nos:
+                seats = self.free_seats.get((event_id, seat_type(seat_no)))
+                if seats is not None:
+                    seats.add(seat_number(seat_no))
+
+    def mark_taken(self, event_id, seat_nos):
+        """Drop seats booked through another path from the free-seat map"""
+        with self.lock:
+            for seat_no in seat_nos:
+                seats = self.free_seats.get((event_id, seat_type(seat_no)))
+                if seats is not None:
+                    seats.remove(seat_number(seat_no))
+
+    def allocate(self, attendee_id, event_id, ticket_type, quantity, prefer_contiguous=True, hold=False,
+                 hold_seconds=HOLD_SECONDS):
+        """Choose and book (or hold, for checkout later) the best `quantity` seats of a type"""
+        return self.allocate_group(attendee_id, event_id, {ticket_type: quantity}, prefer_contiguous, hold,
+                                   hold_seconds)
+
+    def allocate_group(self, attendee_id, event_id, quantities, prefer_contiguous=True, hold=False,
+                       hold_seconds=HOLD_SECONDS):
+        """Book (or hold) the best seats for a {ticket_type: quantity} order, all-or-nothing
+
+        Every seat of the group is claimed in one BookingEngine transaction, so the
+        group either gets all its seats and one attends row or nothing at all.
+        """
+        quantities = {t: q for t, q in quantities.items() if q > 0}
+        if not quantities:
+            return BookingResult(False, message="Please choose at least one ticket")
+        if hold:
+            claim = partial(self.booking_engine.hold_seats, hold_seconds=hold_seconds)
+        else:
+            claim = self.booking_engine.book_seats
+        short = self._short(event_id, quantities)
+        if short and self._stale(event_id, quantities):
+            # Seats were freed where this portal could not see it (expired holds,
+            # cancellations, other portals): reload before sending buyers away
+            self.rebuild(event_id)
+            short = self._short(event_id, quantities)
+        if short:
+            return self._sold_out(*short)
+
+        result = None
+        for _ in range(self.max_attempts):
+            seat_nos = []
+            with self.lock:
+                for ticket_type, quantity in quantities.items():
+                    numbers = self.free_seats[(event_id, ticket_type)].best(quantity, prefer_contiguous)
+                    if numbers is None:
+                        self._put_back(event_id, seat_nos)
+                        return self._sold_out(ticket_type, quantity)
+                    # Take the seats out of the map while the claim is in flight
+                    for n in numbers:
+                        self.free_seats[(event_id, ticket_type)].remove(n)
+                    seat_nos += [f"{ticket_type}-{n}" for n in numbers]
+
+            try:
+                result = claim(attendee_id, event_id, seat_nos)
+            except Exception:
+                self.release(event_id, seat_nos)
+                raise
+            if result.won:
+                return result
+
+            # Someone else (another portal) took some of them: put back the ones still free
+            self.release(event_id, self._still_available(event_id, seat_nos))
+        return result
+
+    def _short(self, event_id, quantities):
+        """(ticket_type, quantity) of the first type the map has too few seats for, or None"""
+        for ticket_type, quantity in quantities.items():
+            if self.available(event_id, ticket_type) < quantity:
+                return ticket_type, quantity
+        return None
+
+    def _stale(self, event_id, quantities):
+        """True if event_inventory has more free seats of a wanted type than the map"""
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(f"""
+                    SELECT type, available FROM event_inventory
+                    WHERE eventID = %s AND type IN ({placeholders(quantities)})
+                """, (event_id, *quantities))
+                counted = {row['type']: row['available'] for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+        return any(counted.get(t, 0) > self.available(event_id, t) for t in quantities)
+
+    def _put_back(self, event_id, seat_nos):
+        """release() for callers already holding the lock"""
+        for seat_no in seat_nos:
+            self.free_seats[(event_id, seat_type(seat_no))].add(seat_number(seat_no))
+
+    def _still_available(self, event_id, seat_nos):
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(f"""
+                    SELECT seatNo FROM Ticket
+                    WHERE eventID = %s AND seatNo IN ({placeholders(seat_nos)}) AND status != 'AVAILABLE'
+                """, (event_id, *seat_nos))
+                taken = {row['seatNo'] for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+        return [seat_no for seat_no in seat_nos if seat_no not in taken]
+
+    def _sold_out(self, ticket_type, quantity):
+        return BookingResult(False, message=f"Not enough {ticket_type} seats left for {quantity} tickets")
@@ -0,0 +1,105 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+
+class Task:
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.callbacks = []  # (on_done, error_message, on_error) of every caller waiting for it
+        self.future = None
+        self.started = time.monotonic()
+        self.cancelled = False
+
+
+class TaskRunner:
+    """Runs database calls on worker threads and hands the results back to the Tk thread
+
+    Tk may only be used from the thread running mainloop, so workers put
+    finished tasks on a queue that the Tk thread drains every POLL_MS with
+    root.after. A task submitted under a key that is still in flight is not
+    run again: the caller just waits for the running one (double clicks,
+    repeated refreshes). Tasks running longer than `slow_after` seconds are
+    passed to on_busy so the window can show progress and a Cancel button.
+    """
+
+    POLL_MS = 30
+
+    def __init__(self, root, workers=4, slow_after=0.4, on_busy=None):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TaskRunner")
+        self.slow_after = slow_after
+        self.on_busy = on_busy
+        self.finished = queue.Queue()
+        self.in_flight = {}
+        self.busy_labels = []
+        self.closed = False
+        self.root.after(self.POLL_MS, self.poll)
+
+    def submit(self, key, work, on_done, error_message, label=None, on_error=None):
+        """Run work() on a worker; on_done(result) or an error box "error_message: ..." follow on the Tk thread"""
+        task = self.in_flight.get(key)
+        if task is None:
+            task = self.in_flight[key] = Task(key, label or error_message)
+            task.future = self.executor.submit(work)
+            task.future.add_done_callback(lambda future: self.finished.put(task))
+        task.callbacks.append((on_done, error_message, on_error))
+        return task
+
+    def cancel(self, key=None):
+        """Forget one task (every task if key is None) and drop its result
+
+        A statement already running on the server still finishes; only its
+        result is thrown away.
+        """
+        tasks = list(self.in_flight.values()) if key is None else [self.in_flight.get(key)]
+        for task in tasks:
+            if task is not None:
+                task.cancelled = True
+                task.future.cancel()
+                del self.in_flight[task.key]
+        self.update_busy()
+
+    def poll(self):
+        if self.closed:
+            return
+        # Scheduled first so a failing callback cannot stop the polling
+        self.root.after(self.POLL_MS, self.poll)
+        while True:
+            try:
+                task = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            self.deliver(task)
+        self.update_busy()
+
+    def deliver(self, task):
+        if task.cancelled:
+            return
+        if self.in_flight.get(task.key) is task:
+            del self.in_flight[task.key]
+        error = task.future.exception()
+        for on_done, error_message, on_error in task.callbacks:
+            if error is None:
+                on_done(task.future.result())
+            else:
+                messagebox.showerror("Error", f"{error_message}:\n{str(error)}")
+                if on_error:
+                    on_error(error)
+
+    def update_busy(self):
+        if self.closed:
+            return
+        now = time.monotonic()
+        labels = [task.label for task in self.in_flight.values() if now - task.started >= self.slow_after]
+        if labels != self.busy_labels:
+            self.busy_labels = labels
+            if self.on_busy:
+                self.on_busy(labels)
+
+    def close(self):
+        self.closed = True
+        self.cancel()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,199 @@
+import threading
+import mysql.connector
+from bookingEngine import BookingEngine, BookingResult
+from seatAllocator import SeatAllocator
+
+
+# How long a promoted attendee has to complete the booking of the offered seats
+OFFER_SECONDS = 1800
+
+
+class Waitlist:
+    """Per event/tier queue of attendees waiting for sold-out tickets"""
+
+    def __init__(self, pool, booking_engine):
+        self.pool = pool
+        self.booking_engine = booking_engine
+
+    def join(self, attendee_id, event_id, quantities):
+        """Queue the attendee for a {ticket_type: quantity} order; keeps their place if already waiting"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for ticket_type, quantity in quantities.items():
+                    if quantity <= 0:
+                        continue
+                    cursor.execute("""
+                        INSERT INTO waitlist (eventID, type, attendeeID, quantity)
+                        VALUES (%s, %s, %s, %s)
+                        ON DUPLICATE KEY UPDATE
+                            joined_at = IF(status = 'WAITING', joined_at, CURRENT_TIMESTAMP),
+                            quantity = IF(status = 'OFFERED', quantity, VALUES(quantity)),
+                            status = IF(status = 'OFFERED', status, 'WAITING')
+                    """, (event_id, ticket_type, attendee_id, quantity))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def entries(self, attendee_id):
+        """The attendee's open waitlist entries, with the event name"""
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT w.waitlistID, w.eventID, e.name AS event_name, w.type, w.quantity,
+                           w.status, w.offer_expires_at
+                    FROM waitlist w
+                    JOIN Events e ON e.eventID = w.eventID
+                    WHERE w.attendeeID = %s AND w.status IN ('WAITING', 'OFFERED')
+                    ORDER BY e.date, w.type
+                """, (attendee_id,))
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def offer(self, waitlist_id, attendee_id):
+        """The seats currently held for an OFFERED entry, as a BookingResult ready for checkout"""
+        with self.pool.reading() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT t.ticketID, t.seatNo
+                    FROM waitlist w
+                    JOIN Ticket t ON t.eventID = w.eventID AND t.type = w.type
+                    WHERE w.waitlistID = %s AND w.attendeeID = %s AND w.status = 'OFFERED'
+                      AND t.status = 'HELD' AND t.held_by = w.attendeeID AND t.hold_expires_at > NOW()
+                    ORDER BY t.ticketID
+                """, (waitlist_id, attendee_id))
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        if not rows:
+            return BookingResult(False, message="This offer has expired")
+        return BookingResult(True, ticket_ids=[row['ticketID'] for row in rows],
+                             seats=[row['seatNo'] for row in rows],
+                             message=f"{len(rows)} tickets held for you from the waitlist")
+
+    def mark_fulfilled(self, waitlist_id):
+        self._set_status(waitlist_id, 'FULFILLED')
+
+    def leave(self, waitlist_id, attendee_id):
+        """Drop out of the queue, giving back any seats already offered"""
+        offer = self.offer(waitlist_id, attendee_id)
+        if offer.won:
+            self.booking_engine.release_holds(attendee_id, offer.ticket_ids)
+        self._set_status(waitlist_id, 'CANCELLED', attendee_id)
+
+    def _set_status(self, waitlist_id, status, attendee_id=None):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                if attendee_id is None:
+                    cursor.execute("UPDATE waitlist SET status = %s WHERE waitlistID = %s", (status, waitlist_id))
+                else:
+                    cursor.execute("UPDATE waitlist SET status = %s WHERE waitlistID = %s AND attendeeID = %s",
+                                   (status, waitlist_id, attendee_id))
+                conn.commit()
+            finally:
+                cursor.close()
+
+
+class WaitlistPromoter(threading.Thread):
+    """Background thread that offers freed-up seats to the next attendees on each waitlist
+
+    Candidates are found from the event_inventory counters, so an idle tick costs
+    one small query. Each offer is a normal seat hold (held_by = the attendee)
+    that the hold sweeper releases again if the offer is not taken up.
+    """
+
+    def __init__(self, pool, interval=15, offer_seconds=OFFER_SECONDS):
+        super().__init__(name="WaitlistPromoter", daemon=True)
+        self.pool = pool
+        self.interval = interval
+        self.offer_seconds = offer_seconds
+        self.offered_total = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        # The allocator checks out this thread's connection again, so the whole tick runs on one session
+        allocator = SeatAllocator(self.pool, BookingEngine(self.pool))
+        while not self._stop_event.is_set():
+            try:
+                with self.pool.connection() as conn:
+                    self.promote(conn, allocator)
+            except mysql.connector.Error:
+                # Database unavailable; try again on the next tick
+                pass
+            self._stop_event.wait(self.interval)
+
+    def promote(self, conn, allocator):
+        """Expire stale offers, then offer available seats to waiting attendees in join order"""
+        cursor = conn.cursor(dictionary=True)
+        offered = 0
+        try:
+            cursor.execute("""
+                UPDATE waitlist SET status = 'EXPIRED'
+                WHERE status = 'OFFERED' AND offer_expires_at <= NOW()
+            """)
+            cursor.execute("""
+                SELECT ei.eventID, ei.type, ei.available
+                FROM (SELECT DISTINCT eventID, type FROM waitlist WHERE status = 'WAITING') w
+                JOIN event_inventory ei ON ei.eventID = w.eventID AND ei.type = w.type
+                WHERE ei.available > 0
+            """)
+            tiers = cursor.fetchall()
+            conn.commit()
+
+            for tier in tiers:
+                allocator.rebuild(tier['eventID'])
+                available = tier['available']
+                cursor.execute("""
+                    SELECT waitlistID, attendeeID, quantity
+                    FROM waitlist
+                    WHERE eventID = %s AND type = %s AND status = 'WAITING'
+                    ORDER BY joined_at, waitlistID
+                """, (tier['eventID'], tier['type']))
+                queue = cursor.fetchall()
+                conn.commit()
+                for entry in queue:
+                    # Strict first-come order: later entries do not skip a larger group
+                    if entry['quantity'] > available:
+                        break
+                    promoted = self._offer(conn, cursor, allocator, tier, entry)
+                    if promoted is None:
+                        continue
+                    if not promoted:
+                        break
+                    available -= entry['quantity']
+                    offered += 1
+        finally:
+            cursor.close()
+        self.offered_total += offered
+        return offered
+
+    def _offer(self, conn, cursor, allocator, tier, entry):
+        """Hold seats for one entry; None if the entry changed meanwhile, else whether it got its seats"""
+        # Mark the entry first: if we stop before the hold, the offer just expires
+        cursor.execute("""
+            UPDATE waitlist
+            SET status = 'OFFERED', offer_expires_at = NOW() + INTERVAL %s SECOND
+            WHERE waitlistID = %s AND status = 'WAITING'
+        """, (self.offer_seconds, entry['waitlistID']))
+        claimed = cursor.rowcount == 1
+        conn.commit()
+        if not claimed:
+            return None
+
+        hold = allocator.allocate(entry['attendeeID'], tier['eventID'], tier['type'], entry['quantity'],
+                                  hold=True, hold_seconds=self.offer_seconds)
+        if not hold.won:
+            cursor.execute("UPDATE waitlist SET status = 'WAITING', offer_expires_at = NULL WHERE waitlistID = %s",
+                           (entry['waitlistID'],))
+            conn.commit()
+        return hold.won